@@ -0,0 +1,298 @@
+"""
+의존성 설치 파일(압축 파일) 다운로드와 내용 주소 기반 캐시 (PyQt6 비의존)
+
+- 이어받기: 끊긴 다운로드는 .part 파일 크기부터 Range 요청으로 이어받음
+- 검증: 고정 SHA-256 또는 배포처가 공개한 체크섬(.sha256/.md5 파일, GitHub 릴리스 자산 digest)과
+  비교하고, 다르면 버리고 실패. 체크섬을 구할 수 없으면 받지 않고 실패
+  (YTDL_ALLOW_UNVERIFIED=1이면 on_unverified로 알리고 검증 없이 받음)
+- 캐시: 받은 파일은 SHA-256 이름으로 보관(sha256/<해시>)하고 URL -> 해시 색인을 남겨
+  다시 설치할 때는 네트워크 없이 캐시에서 가져옴
+- 미러: 같은 구조의 폴더(공유 폴더 등)를 미러로 지정하면 받기 전에 먼저 찾아봄
+  (YTDL_ARTIFACT_MIRROR 환경 변수, 여러 개는 os.pathsep으로 구분)
+"""
+
+import os
+import re
+import json
+import time
+import shutil
+import hashlib
+import http.client
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+from typing import Callable, List, Optional
+
+from metadata_cache import default_cache_dir
+
+# 미러 폴더 환경 변수
+MIRROR_ENV = 'YTDL_ARTIFACT_MIRROR'
+
+# 체크섬 없이 받는 것을 허용하는 환경 변수 ('1'이면 허용)
+UNVERIFIED_ENV = 'YTDL_ALLOW_UNVERIFIED'
+
+# 연결/읽기 시간 제한 (초)
+_TIMEOUT = 30
+
+# 다운로드 실패 시 이어받기 시도 횟수
+_MAX_ATTEMPTS = 4
+
+_CHUNK_SIZE = 256 * 1024
+
+# 체크섬 알고리즘별 16진수 길이
+_DIGEST_LENGTHS = {'sha256': 64, 'md5': 32}
+
+
+class ChecksumError(Exception):
+    """받은 파일의 체크섬이 기대값과 다르거나 검증할 체크섬을 구할 수 없음"""
+
+
+def file_digest(path: str, algorithm: str = 'sha256') -> str:
+    """파일의 해시 (16진수)"""
+    digest = hashlib.new(algorithm)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def file_sha256(path: str) -> str:
+    """파일의 SHA-256 (16진수)"""
+    return file_digest(path, 'sha256')
+
+
+def parse_checksum(text: str, file_name: str, algorithm: str = 'sha256') -> Optional[str]:
+    """
+    체크섬 문서에서 file_name의 해시 찾기 (없으면 None)
+
+    - GitHub 릴리스 API JSON: 이름이 같은 자산의 digest ('sha256:<해시>')
+    - sha256sum/md5sum 형식 목록: 파일 이름이 있는 줄의 해시 (이름이 없는 한 줄짜리 파일은 그 해시)
+    """
+    try:
+        data = json.loads(text)
+    except ValueError:
+        data = None
+    if isinstance(data, dict):
+        for asset in data.get('assets') or []:
+            digest = asset.get('digest') or ''
+            if asset.get('name') == file_name and digest.startswith(algorithm + ':'):
+                return digest.split(':', 1)[1].lower()
+        return None
+
+    pattern = re.compile(r'\b([0-9a-fA-F]{%d})\b' % _DIGEST_LENGTHS[algorithm])
+    candidates = [(line, pattern.search(line)) for line in text.splitlines()]
+    candidates = [(line, match) for line, match in candidates if match]
+    for line, match in candidates:
+        if file_name in line:
+            return match.group(1).lower()
+    if len(candidates) == 1:
+        return candidates[0][1].group(1).lower()
+    return None
+
+
+class ArtifactCache:
+    """SHA-256 이름으로 파일을 보관하는 다운로드 캐시 (스레드 안전)"""
+
+    def __init__(self, root: Optional[str] = None, mirrors: Optional[List[str]] = None):
+        """
+        Args:
+            root: 캐시 폴더 (None이면 기본 캐시 디렉토리의 artifacts)
+            mirrors: 먼저 찾아볼 같은 구조의 폴더 목록 (None이면 YTDL_ARTIFACT_MIRROR)
+        """
+        self.root = root or os.path.join(default_cache_dir(), 'artifacts')
+        if mirrors is None:
+            mirrors = [m for m in os.environ.get(MIRROR_ENV, '').split(os.pathsep) if m]
+        self.mirrors = mirrors
+        self._lock = threading.Lock()
+
+    def fetch(self, url: str, sha256: Optional[str] = None, checksum_url: Optional[str] = None,
+              algorithm: str = 'sha256',
+              on_progress: Optional[Callable[[int, Optional[int]], None]] = None,
+              allow_unverified: Optional[bool] = None,
+              on_unverified: Optional[Callable[[str], None]] = None) -> str:
+        """
+        URL의 파일을 캐시에서 찾거나 받아서 캐시 경로 반환
+
+        Args:
+            url: 다운로드 URL
+            sha256: 고정된 SHA-256 (있으면 캐시/미러에서 바로 찾고 받은 파일도 검증)
+            checksum_url: 배포처가 공개한 체크섬 문서 URL (새로 받을 때 검증에 사용,
+                parse_checksum()이 읽을 수 있는 형식)
+            algorithm: checksum_url의 해시 알고리즘 ('sha256' 또는 'md5')
+            on_progress: (받은 바이트, 전체 바이트 또는 None) 콜백
+            allow_unverified: 체크섬이 없어도 받을지 (None이면 YTDL_ALLOW_UNVERIFIED 환경 변수)
+            on_unverified: 체크섬 없이 받도록 허용된 경우 받기 전에 이유와 함께 호출
+
+        Raises:
+            ChecksumError: 받은 파일이 기대한 체크섬과 다르거나, 체크섬 문서를 읽을 수 없거나,
+                검증할 체크섬이 없는데 허용되지 않은 경우 (이때는 받지 않음)
+            OSError, http.client.HTTPException: 다운로드 실패 (urllib.error.URLError 포함)
+        """
+        if allow_unverified is None:
+            allow_unverified = os.environ.get(UNVERIFIED_ENV) == '1'
+        cached = self._lookup(url, sha256, allow_unverified)
+        if cached:
+            return cached
+
+        expected = sha256.lower() if sha256 else None
+        if sha256:
+            algorithm = 'sha256'
+        elif checksum_url:
+            expected = self._fetch_checksum(checksum_url, url, algorithm)
+        if not expected:
+            reason = ("배포처가 공개한 체크섬이 없습니다" if not checksum_url
+                      else f"체크섬 문서에 해당 파일이 없습니다 ({checksum_url})")
+            if not allow_unverified:
+                raise ChecksumError(f"{reason}: {url} (검증 없이 받으려면 {UNVERIFIED_ENV}=1)")
+            if on_unverified:
+                on_unverified(reason)
+        part_path = os.path.join(self.root, 'partial', hashlib.sha1(url.encode()).hexdigest() + '.part')
+        os.makedirs(os.path.dirname(part_path), exist_ok=True)
+        self._download(url, part_path, on_progress)
+
+        if expected:
+            actual = file_digest(part_path, algorithm)
+            if actual != expected:
+                os.remove(part_path)
+                self._forget_validator(part_path)
+                raise ChecksumError(f"{algorithm.upper()} 불일치: {url} (기대값 {expected}, 실제 {actual})")
+
+        digest = file_sha256(part_path)
+
+        target = self._path_for(digest)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        os.replace(part_path, target)
+        self._forget_validator(part_path)
+        self._remember(url, digest, verified=bool(expected))
+        return target
+
+    # ── 내부 ──
+    def _path_for(self, digest: str, root: Optional[str] = None) -> str:
+        return os.path.join(root or self.root, 'sha256', digest.lower())
+
+    def _lookup(self, url: str, sha256: Optional[str], allow_unverified: bool = False) -> Optional[str]:
+        """
+        캐시 또는 미러에 있는 검증된 파일 (미러에서 찾으면 캐시로 복사)
+
+        색인에서 찾은 항목 중 체크섬 없이 받은 것(검증 여부가 기록되지 않은 예전 항목 포함)은
+        allow_unverified일 때만 사용합니다.
+        """
+        for root in [self.root] + self.mirrors:
+            entry = {} if sha256 else self._load_index(root).get(url, {})
+            digest = sha256 or entry.get('sha256')
+            if not digest or not (sha256 or entry.get('verified', False) or allow_unverified):
+                continue
+            path = self._path_for(digest, root)
+            if not os.path.isfile(path) or file_sha256(path) != digest.lower():
+                continue
+            if root != self.root:
+                target = self._path_for(digest)
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                shutil.copyfile(path, target + '.tmp')
+                os.replace(target + '.tmp', target)
+                path = target
+            self._remember(url, digest, verified=bool(sha256) or entry.get('verified', False))
+            return path
+        return None
+
+    def _download(self, url: str, part_path: str, on_progress):
+        """
+        part_path에 이어받기 (실패하면 받은 데까지 남기고 다시 시도)
+
+        이어받을 때는 처음 받을 때 기록한 ETag/Last-Modified를 If-Range로 보내므로, 그사이
+        서버 파일이 바뀌었으면(같은 URL의 새 버전) 서버가 전체를 다시 보내고 처음부터 받습니다.
+        """
+        for attempt in range(_MAX_ATTEMPTS):
+            validator = self._load_validator(part_path)
+            offset = os.path.getsize(part_path) if validator and os.path.exists(part_path) else 0
+            headers = {'Range': f'bytes={offset}-', 'If-Range': validator} if offset else {}
+            request = urllib.request.Request(url, headers=headers)
+            try:
+                with urllib.request.urlopen(request, timeout=_TIMEOUT) as response:
+                    if offset and response.status != 206:
+                        offset = 0  # 서버가 Range를 무시하거나 파일이 바뀌었으면 처음부터
+                    if not offset:
+                        self._save_validator(part_path, response.headers.get('ETag')
+                                             or response.headers.get('Last-Modified'))
+                    length = response.headers.get('Content-Length')
+                    total = offset + int(length) if length and length.isdigit() else None
+                    with open(part_path, 'ab' if offset else 'wb') as f:
+                        received = offset
+                        for chunk in iter(lambda: response.read(_CHUNK_SIZE), b''):
+                            f.write(chunk)
+                            received += len(chunk)
+                            if on_progress:
+                                on_progress(received, total)
+                    if total is not None and received < total:
+                        raise urllib.error.URLError(f"전송이 끊김 ({received}/{total} bytes)")
+                return
+            except urllib.error.HTTPError as e:
+                if e.code == 416 and offset:
+                    return  # 이미 끝까지 받음
+                if e.code < 500 or attempt == _MAX_ATTEMPTS - 1:
+                    raise
+            except (urllib.error.URLError, http.client.HTTPException, OSError):
+                if attempt == _MAX_ATTEMPTS - 1:
+                    raise
+            time.sleep(2 ** attempt)
+
+    @staticmethod
+    def _load_validator(part_path: str) -> Optional[str]:
+        try:
+            with open(part_path + '.validator', 'r', encoding='utf-8') as f:
+                return f.read().strip() or None
+        except OSError:
+            return None
+
+    @staticmethod
+    def _save_validator(part_path: str, validator: Optional[str]):
+        """이어받기 기준값 기록 (없으면 다음 실행에서는 이어받지 않고 처음부터)"""
+        if validator:
+            with open(part_path + '.validator', 'w', encoding='utf-8') as f:
+                f.write(validator)
+        else:
+            ArtifactCache._forget_validator(part_path)
+
+    @staticmethod
+    def _forget_validator(part_path: str):
+        try:
+            os.remove(part_path + '.validator')
+        except OSError:
+            pass
+
+    @staticmethod
+    def _fetch_checksum(checksum_url: str, url: str, algorithm: str) -> Optional[str]:
+        """
+        체크섬 문서에서 url 파일의 해시 (GitHub 릴리스 자산에 digest가 없으면 None)
+
+        Raises:
+            ChecksumError: 체크섬 파일 형식을 알 수 없는 경우
+        """
+        request = urllib.request.Request(checksum_url, headers={'Accept': 'application/json, text/plain, */*'})
+        with urllib.request.urlopen(request, timeout=_TIMEOUT) as response:
+            text = response.read(1024 * 1024).decode('utf-8', 'replace')
+        file_name = urllib.parse.unquote(os.path.basename(urllib.parse.urlparse(url).path))
+        digest = parse_checksum(text, file_name, algorithm)
+        if digest is None and not text.lstrip().startswith('{'):
+            raise ChecksumError(f"체크섬 파일 형식을 알 수 없습니다: {checksum_url}")
+        return digest
+
+    def _load_index(self, root: str) -> dict:
+        try:
+            with open(os.path.join(root, 'index.json'), 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            return index if isinstance(index, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _remember(self, url: str, digest: str, verified: bool = True):
+        """URL -> SHA-256 색인 기록 (고정 해시가 없는 '최신 버전' URL도 캐시에서 찾도록)"""
+        with self._lock:
+            index = self._load_index(self.root)
+            index[url] = {'sha256': digest.lower(), 'verified': verified, 'fetched': time.time()}
+            path = os.path.join(self.root, 'index.json')
+            os.makedirs(self.root, exist_ok=True)
+            with open(path + '.tmp', 'w', encoding='utf-8') as f:
+                json.dump(index, f, indent=2)
+            os.replace(path + '.tmp', path)
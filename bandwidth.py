@@ -0,0 +1,239 @@
+"""
+전체 다운로드 대역폭 제한 (토큰 버킷, PyQt6 비의존)
+
+실행 중인 모든 다운로드가 하나의 토큰 버킷을 나눠 씁니다. 받은 바이트만큼 토큰을 먼저
+차감하고, 모자란 만큼(빚)을 현재 속도로 갚을 때까지 대기하므로 동시 작업 수와 관계없이
+전체 평균 속도가 제한값을 넘지 않습니다.
+
+- 전체 제한: 모든 작업의 합계 속도 (실행 중에 변경 가능)
+- 작업당 제한: 작업마다 따로 적용되는 속도 (실행 중에 변경 가능)
+- 시간대 일정: 지정한 시간대에는 전체 제한 대신 일정의 제한값 사용
+
+프로세스 모드에서는 share()로 버킷 상태를 공유 메모리로 옮기고, 자식 프로세스는
+attach_bandwidth_shaper()로 같은 버킷에 연결합니다. 제한값과 일정은 부모 프로세스에서만 바꿉니다.
+"""
+
+import re
+import time
+import threading
+from datetime import datetime
+from typing import Callable, List, Optional, Tuple
+
+# 버킷에 모아 둘 수 있는 최대 토큰 (제한 속도의 몇 초 분량인지)
+_BURST_SECONDS = 0.5
+
+# 대기 중에 취소 여부를 확인하는 주기 (초)
+_CANCEL_POLL_INTERVAL = 0.25
+
+# 시간대 일정을 다시 확인하는 주기 (초)
+_SCHEDULE_REFRESH_INTERVAL = 5.0
+
+# 공유 상태 배열의 항목 위치
+_RATE, _TOKENS, _STAMP, _JOB_LIMIT = range(4)
+
+_UNITS = {'': 1, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}
+
+
+def parse_rate(text: str) -> int:
+    """
+    '500K', '2M', '1.5MiB' 같은 속도 문자열을 초당 바이트로 변환 (0이면 제한 없음)
+
+    Raises:
+        ValueError: 형식이 잘못된 경우
+    """
+    match = re.fullmatch(r'\s*(\d+(?:\.\d+)?)\s*([KMG]?)(?:i?B)?(?:/s)?\s*', str(text), re.IGNORECASE)
+    if not match:
+        raise ValueError(f"잘못된 속도 형식: {text}")
+    return int(float(match.group(1)) * _UNITS[match.group(2).upper()])
+
+
+class TokenBucket:
+    """여러 스레드(또는 프로세스)가 나눠 쓰는 토큰 버킷"""
+
+    def __init__(self, rate: float = 0, state=None, lock=None):
+        """
+        Args:
+            rate: 초당 바이트 (0이면 제한 없음)
+            state: [속도, 토큰, 마지막 갱신 시각, ...] 상태 배열 (공유 메모리 배열도 가능)
+            lock: state를 보호하는 잠금
+        """
+        self._state = state if state is not None else [0.0, 0.0, time.monotonic(), 0.0]
+        self._lock = lock or threading.Lock()
+        if state is None:
+            self.rate = rate
+
+    @property
+    def rate(self) -> float:
+        return self._state[_RATE]
+
+    @rate.setter
+    def rate(self, value: float):
+        value = max(0.0, float(value))
+        with self._lock:
+            if self._state[_RATE] == value:
+                return
+            self._refill(time.monotonic())
+            self._state[_RATE] = value
+            self._state[_TOKENS] = min(self._state[_TOKENS], value * _BURST_SECONDS)
+
+    def reserve(self, nbytes: int) -> float:
+        """nbytes만큼 토큰을 차감하고 기다려야 할 시간(초) 반환"""
+        with self._lock:
+            rate = self._state[_RATE]
+            if rate <= 0:
+                return 0.0
+            self._refill(time.monotonic())
+            self._state[_TOKENS] -= nbytes
+            return max(0.0, -self._state[_TOKENS] / rate)
+
+    def _refill(self, now: float):
+        rate = self._state[_RATE]
+        if rate > 0:
+            elapsed = max(0.0, now - self._state[_STAMP])
+            self._state[_TOKENS] = min(rate * _BURST_SECONDS, self._state[_TOKENS] + elapsed * rate)
+        self._state[_STAMP] = now
+
+
+class BandwidthSchedule:
+    """시간대별 전체 속도 제한 (예: 업무 시간에는 1MiB/s)"""
+
+    def __init__(self, entries: Optional[List[dict]] = None):
+        """
+        Args:
+            entries: [{'start': 'HH:MM', 'end': 'HH:MM', 'limit': 초당 바이트 또는 '1M' 형식}, ...]
+                (start > end이면 자정을 넘기는 시간대, 겹치면 앞의 항목 우선)
+        """
+        self.entries: List[Tuple[int, int, int]] = []
+        for entry in entries or []:
+            limit = entry.get('limit', 0)
+            self.entries.append((self._minutes(entry['start']), self._minutes(entry['end']),
+                                 parse_rate(limit) if isinstance(limit, str) else int(limit)))
+
+    @staticmethod
+    def _minutes(text: str) -> int:
+        hour, minute = str(text).split(':')
+        return int(hour) % 24 * 60 + int(minute)
+
+    def limit_at(self, when: Optional[datetime] = None) -> Optional[int]:
+        """해당 시각에 적용할 제한값 (일정에 없으면 None)"""
+        when = when or datetime.now()
+        minutes = when.hour * 60 + when.minute
+        for start, end, limit in self.entries:
+            if start <= end:
+                if start <= minutes < end:
+                    return limit
+            elif minutes >= start or minutes < end:
+                return limit
+        return None
+
+
+class BandwidthShaper:
+    """전체/작업당 속도 제한을 적용하는 공용 대역폭 제한기"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.bucket = TokenBucket()
+        self._manual_limit = 0
+        self._schedule = BandwidthSchedule()
+        self._owner = True  # 제한값을 정하는 프로세스인지 (자식 프로세스는 False)
+        self._next_refresh = 0.0
+
+    @property
+    def global_limit(self) -> int:
+        """일정이 없을 때 적용되는 전체 제한 (초당 바이트, 0이면 제한 없음)"""
+        return self._manual_limit
+
+    @global_limit.setter
+    def global_limit(self, value: int):
+        self._manual_limit = max(0, int(value))
+        self.refresh()
+
+    @property
+    def job_limit(self) -> int:
+        """작업당 제한 (초당 바이트, 0이면 제한 없음)"""
+        return int(self.bucket._state[_JOB_LIMIT])
+
+    @job_limit.setter
+    def job_limit(self, value: int):
+        with self.bucket._lock:
+            self.bucket._state[_JOB_LIMIT] = max(0, int(value))
+
+    @property
+    def current_limit(self) -> int:
+        """지금 적용 중인 전체 제한 (일정 반영)"""
+        return int(self.bucket.rate)
+
+    def set_schedule(self, entries: Optional[List[dict]]):
+        """시간대 일정 설정 (잘못된 항목이 있으면 ValueError)"""
+        self._schedule = BandwidthSchedule(entries)
+        self.refresh()
+
+    def refresh(self):
+        """일정과 전체 제한을 반영하여 현재 속도 갱신"""
+        if not self._owner:
+            return
+        limit = self._schedule.limit_at()
+        self.bucket.rate = self._manual_limit if limit is None else limit
+        self._next_refresh = time.monotonic() + _SCHEDULE_REFRESH_INTERVAL
+
+    def throttle(self, nbytes: int, job_bucket: Optional[TokenBucket] = None,
+                 cancelled: Optional[Callable[[], bool]] = None):
+        """
+        nbytes를 받은 뒤 호출, 제한을 넘었으면 넘은 만큼 대기
+
+        Args:
+            nbytes: 방금 받은 바이트 수
+            job_bucket: 작업별 버킷 (작업당 제한 적용, TokenBucket()으로 만들어 작업 동안 유지)
+            cancelled: True를 반환하면 대기를 멈춤
+        """
+        if nbytes <= 0:
+            return
+        if self._owner and time.monotonic() >= self._next_refresh:
+            self.refresh()
+
+        wait = self.bucket.reserve(nbytes)
+        if job_bucket is not None:
+            job_bucket.rate = self.job_limit
+            wait = max(wait, job_bucket.reserve(nbytes))
+
+        deadline = time.monotonic() + wait
+        while wait > 0:
+            if cancelled and cancelled():
+                return
+            time.sleep(min(wait, _CANCEL_POLL_INTERVAL))
+            wait = deadline - time.monotonic()
+
+    def share(self, ctx) -> tuple:
+        """
+        버킷 상태를 공유 메모리로 옮기고 (상태 배열, 잠금) 반환 (자식 프로세스에 전달)
+
+        Args:
+            ctx: multiprocessing 컨텍스트
+        """
+        with self._lock:
+            if not isinstance(self.bucket._state, list):
+                return self.bucket._state, self.bucket._lock
+            lock = ctx.Lock()
+            state = ctx.Array('d', list(self.bucket._state), lock=False)
+            self.bucket = TokenBucket(state=state, lock=lock)
+            return state, lock
+
+
+_shared_shaper: Optional[BandwidthShaper] = None
+_shared_lock = threading.Lock()
+
+
+def get_bandwidth_shaper() -> BandwidthShaper:
+    """프로세스 공용 대역폭 제한기 인스턴스"""
+    global _shared_shaper
+    with _shared_lock:
+        if _shared_shaper is None:
+            _shared_shaper = BandwidthShaper()
+        return _shared_shaper
+
+
+def attach_bandwidth_shaper(state, lock):
+    """자식 프로세스에서 부모의 공유 버킷에 연결 (프로세스 풀 initializer)"""
+    shaper = get_bandwidth_shaper()
+    shaper.bucket = TokenBucket(state=state, lock=lock)
+    shaper._owner = False
@@ -0,0 +1,738 @@
+"""
+다운로드 파이프라인 오프라인 벤치마크 (PyQt6 비의존)
+
+유튜브 대신 로컬 HTTP 서버가 합성 미디어(DASH처럼 비디오/오디오가 분리된 파일과 썸네일)를
+제공하고, 스텁 yt-dlp 추출기가 그 서버의 포맷 목록을 돌려줍니다. 다운로드는 GUI 워커
+(YoutubeDownloadWorker)와 CLI 배치 모드가 함께 쓰는 DownloadEngine과 프리셋 그대로 실행하므로
+구간 다운로드, 포맷 동시 다운로드, 병합/후처리 풀, 디스크 예약까지 모두 측정에 포함됩니다.
+
+- 서버: Range 요청 지원, 요청마다 지연(--latency-ms), 연결당 대역폭 제한(--bandwidth)
+- 측정: 동시 작업 수별 작업/초, MB/s, 첫 바이트까지 시간(TTFB), 전송/병합/후처리 시간, 최대 RSS
+  (동시 작업 수마다 새 프로세스에서 실행하므로 풀/캐시/메모리 사용량이 서로 섞이지 않음)
+- 결과: 커밋 해시와 설정을 함께 JSONL에 추가하고, compare로 두 기록(커밋)을 비교
+
+합성 미디어는 FFmpeg(lavfi)로 한 번 만들어 캐시 디렉토리에 보관합니다.
+
+    python benchmark.py run --type video_best --jobs 8 --concurrency 1,2,4 --latency-ms 20 --bandwidth 4M
+    python benchmark.py compare                 # 같은 설정의 마지막 두 기록 비교
+    python benchmark.py compare abc1234 HEAD --max-regression 10
+"""
+
+import os
+import re
+import sys
+import json
+import math
+import time
+import shutil
+import argparse
+import contextlib
+import platform
+import tempfile
+import threading
+import subprocess
+import multiprocessing
+import urllib.parse
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+from bandwidth import parse_rate
+from download_presets import DOWNLOAD_TYPES, find_ffmpeg_path, get_extension
+from metadata_cache import default_cache_dir
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# 기본 결과 파일 (기록마다 한 줄)
+DEFAULT_RESULTS = os.path.join(default_cache_dir(), 'benchmark', 'results.jsonl')
+
+# 서버가 한 번에 보내는 크기 (대역폭 제한 단위)
+_SEND_CHUNK = 64 * 1024
+
+# 합성 비디오 인코더 (앞에서부터 시도, 코덱 문자열은 포맷 정보에 기록)
+_VIDEO_ENCODERS = (('libx264', 'avc1.64001f'), ('mpeg4', 'mp4v.20.9'))
+
+_RANGE_RE = re.compile(r'bytes=(\d*)-(\d*)$')
+
+# compare에서 비교할 항목 (키, 표시 이름, 클수록 좋은지)
+_COMPARED_METRICS = (
+    ('jobs_per_sec', '작업/초', True),
+    ('mb_per_sec', 'MB/s', True),
+    ('ttfb_ms_p50', 'TTFB p50 (ms)', False),
+    ('ttfb_ms_p95', 'TTFB p95 (ms)', False),
+    ('network_ms_p50', '전송 p50 (ms)', False),
+    ('merge_ms_p50', '병합 p50 (ms)', False),
+    ('postprocess_ms_p50', '후처리 p50 (ms)', False),
+    ('peak_rss_mb', '최대 RSS (MB)', False),
+    ('peak_child_rss_mb', '하위 프로세스 최대 RSS (MB)', False),
+)
+
+# 같은 조건인지 판단하는 설정 항목 (라벨 등은 제외)
+_CONFIG_KEYS = ('type', 'jobs', 'duration', 'video_kbps', 'audio_kbps', 'latency_ms', 'bandwidth',
+                'connections', 'parallel_formats')
+
+
+# ── 합성 미디어 ──
+def generate_media(ffmpeg: str, duration: int, video_kbps: int, audio_kbps: int,
+                   root: Optional[str] = None) -> dict:
+    """
+    FFmpeg로 합성 비디오(영상만)/오디오(음성만)/썸네일 생성 (같은 설정이면 캐시된 파일 사용)
+
+    Returns:
+        {'video', 'audio', 'thumbnail': 경로, 'vcodec', 'acodec', 'width', 'height', 'fps', 'duration'}
+    """
+    root = root or os.path.join(default_cache_dir(), 'benchmark')
+    directory = os.path.join(root, f'media-{duration}s-v{video_kbps}k-a{audio_kbps}k')
+    meta_path = os.path.join(directory, 'media.json')
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        pass
+
+    work = directory + f'.{os.getpid()}.tmp'
+    shutil.rmtree(work, ignore_errors=True)
+    os.makedirs(work)
+    lavfi_video = 'testsrc2=size=1280x720:rate=30'
+
+    def ffmpeg_run(*args):
+        subprocess.run([ffmpeg, '-y', '-v', 'error', *args], check=True, capture_output=True)
+
+    for encoder, vcodec in _VIDEO_ENCODERS:
+        try:
+            ffmpeg_run('-f', 'lavfi', '-i', lavfi_video, '-t', str(duration), '-an', '-c:v', encoder,
+                       '-b:v', f'{video_kbps}k', '-pix_fmt', 'yuv420p', '-movflags', '+faststart',
+                       os.path.join(work, 'video.mp4'))
+            break
+        except subprocess.CalledProcessError:
+            continue
+    else:
+        raise RuntimeError("합성 비디오를 만들 수 없습니다 (사용 가능한 인코더 없음)")
+    ffmpeg_run('-f', 'lavfi', '-i', 'sine=frequency=440:sample_rate=48000', '-t', str(duration), '-vn',
+               '-c:a', 'aac', '-b:a', f'{audio_kbps}k', '-movflags', '+faststart', os.path.join(work, 'audio.m4a'))
+    ffmpeg_run('-f', 'lavfi', '-i', 'testsrc2=size=640x360', '-frames:v', '1', os.path.join(work, 'thumbnail.jpg'))
+
+    shutil.rmtree(directory, ignore_errors=True)
+    os.replace(work, directory)
+    media = {
+        'video': os.path.join(directory, 'video.mp4'),
+        'audio': os.path.join(directory, 'audio.m4a'),
+        'thumbnail': os.path.join(directory, 'thumbnail.jpg'),
+        'vcodec': vcodec, 'acodec': 'mp4a.40.2',
+        'width': 1280, 'height': 720, 'fps': 30, 'duration': duration,
+        'video_kbps': video_kbps, 'audio_kbps': audio_kbps,
+    }
+    with open(meta_path, 'w', encoding='utf-8') as f:
+        json.dump(media, f, indent=2)
+    return media
+
+
+# ── 로컬 미디어 서버 ──
+class _MediaHandler(BaseHTTPRequestHandler):
+    """/api/<id>.json (스텁 추출기용 영상 정보), /media/<이름> (Range 지원)"""
+
+    protocol_version = 'HTTP/1.1'
+    server: 'MediaServer'
+
+    def do_GET(self):
+        self._handle(send_body=True)
+
+    def do_HEAD(self):
+        self._handle(send_body=False)
+
+    def log_message(self, format, *args):
+        pass
+
+    def _handle(self, send_body: bool):
+        server = self.server
+        server.count_request()
+        if server.latency:
+            time.sleep(server.latency)
+
+        path = urllib.parse.urlparse(self.path).path
+        match = re.fullmatch(r'/api/([\w-]+)\.json', path)
+        if match:
+            body = json.dumps(server.info_for(match.group(1))).encode()
+            self._send_headers(200, len(body), 'application/json')
+            if send_body:
+                self._send(body)
+            return
+
+        match = re.fullmatch(r'/media/(\w+)', path)
+        asset = server.assets.get(match.group(1)) if match else None
+        if asset is None:
+            self._send_headers(404, 0, 'text/plain')
+            return
+
+        size = os.path.getsize(asset)
+        start, end, status = 0, size - 1, 200
+        range_match = _RANGE_RE.match(self.headers.get('Range', '').strip())
+        if range_match:
+            first, last = range_match.groups()
+            if first:
+                start, end = int(first), min(int(last), size - 1) if last else size - 1
+            elif last:
+                start = max(0, size - int(last))
+            if start >= size or start > end:
+                self._send_headers(416, 0, 'text/plain', {'Content-Range': f'bytes */{size}'})
+                return
+            status = 206
+        length = end - start + 1
+        extra = {'Accept-Ranges': 'bytes', 'ETag': f'"{int(os.path.getmtime(asset))}-{size}"'}
+        if status == 206:
+            extra['Content-Range'] = f'bytes {start}-{end}/{size}'
+        self._send_headers(status, length, 'application/octet-stream', extra)
+        if not send_body:
+            return
+        with open(asset, 'rb') as f:
+            f.seek(start)
+            remaining = length
+            while remaining > 0:
+                chunk = f.read(min(_SEND_CHUNK, remaining))
+                if not chunk:
+                    break
+                self._send(chunk)
+                remaining -= len(chunk)
+
+    def _send_headers(self, status: int, length: int, content_type: str, extra: Optional[dict] = None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(length))
+        for name, value in (extra or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+
+    def _send(self, data: bytes):
+        """연결당 대역폭 제한을 지키며 전송 (클라이언트가 끊으면 조용히 중단)"""
+        bandwidth = self.server.bandwidth
+        started = time.monotonic()
+        try:
+            for offset in range(0, len(data), _SEND_CHUNK):
+                chunk = data[offset:offset + _SEND_CHUNK]
+                self.wfile.write(chunk)
+                self.server.count_bytes(len(chunk))
+                if bandwidth:
+                    delay = (offset + len(chunk)) / bandwidth - (time.monotonic() - started)
+                    if delay > 0:
+                        time.sleep(delay)
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+
+
+class MediaServer(ThreadingHTTPServer):
+    """합성 미디어를 제공하는 로컬 HTTP 서버 (127.0.0.1, 임의 포트)"""
+
+    daemon_threads = True
+
+    def __init__(self, media: dict, latency: float = 0.0, bandwidth: int = 0):
+        """
+        Args:
+            media: generate_media() 결과
+            latency: 요청마다 응답 전 지연 (초, API/미디어 요청 모두)
+            bandwidth: 연결당 전송 속도 제한 (바이트/초, 0이면 제한 없음)
+        """
+        super().__init__(('127.0.0.1', 0), _MediaHandler)
+        self.media = media
+        self.assets = {name: media[name] for name in ('video', 'audio', 'thumbnail')}
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.bytes_sent = 0
+
+    @property
+    def base_url(self) -> str:
+        return f'http://127.0.0.1:{self.server_address[1]}'
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, name='benchmark-server', daemon=True).start()
+
+    def count_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def count_bytes(self, nbytes: int):
+        with self._lock:
+            self.bytes_sent += nbytes
+
+    def reset_counters(self):
+        with self._lock:
+            self.requests = self.bytes_sent = 0
+
+    def info_for(self, video_id: str) -> dict:
+        """스텁 추출기가 돌려줄 영상 정보 (유튜브처럼 비디오/오디오 포맷이 분리됨)"""
+        media = self.media
+        video_size = os.path.getsize(media['video'])
+        audio_size = os.path.getsize(media['audio'])
+        duration = media['duration']
+        return {
+            'id': video_id,
+            'title': f'Benchmark {video_id}',
+            'duration': duration,
+            'thumbnail': f'{self.base_url}/media/thumbnail',
+            'formats': [
+                {
+                    'format_id': 'audio', 'url': f'{self.base_url}/media/audio', 'ext': 'm4a',
+                    'vcodec': 'none', 'acodec': media['acodec'], 'asr': 48000,
+                    'abr': media['audio_kbps'], 'tbr': audio_size * 8 / 1000 / duration, 'filesize': audio_size,
+                },
+                {
+                    'format_id': 'video', 'url': f'{self.base_url}/media/video', 'ext': 'mp4',
+                    'vcodec': media['vcodec'], 'acodec': 'none',
+                    'width': media['width'], 'height': media['height'], 'fps': media['fps'],
+                    'vbr': media['video_kbps'], 'tbr': video_size * 8 / 1000 / duration, 'filesize': video_size,
+                },
+            ],
+        }
+
+
+# ── 스텁 추출기 ──
+_stub_ie_class = None
+
+
+def _stub_extractor_class():
+    """로컬 서버의 /watch/<id> URL을 처리하는 yt-dlp 추출기 (한 번만 생성)"""
+    global _stub_ie_class
+    if _stub_ie_class is None:
+        from yt_dlp.extractor.common import InfoExtractor
+
+        class BenchmarkIE(InfoExtractor):
+            IE_NAME = 'benchmark'
+            _VALID_URL = r'https?://127\.0\.0\.1:\d+/watch/(?P<id>[\w-]+)'
+
+            def _real_extract(self, url):
+                video_id = self._match_id(url)
+                base_url = url.split('/watch/', 1)[0]
+                return self._download_json(f'{base_url}/api/{video_id}.json', video_id)
+
+        _stub_ie_class = BenchmarkIE
+    return _stub_ie_class
+
+
+def extract_stub_info(url: str) -> dict:
+    """스텁 추출기로 영상 정보 추출 (process=False, 대기열이 엔진에 넘기는 것과 같은 형태)"""
+    import yt_dlp
+
+    with yt_dlp.YoutubeDL({'quiet': True, 'no_warnings': True}, auto_init=False) as ydl:
+        ydl.add_info_extractor(_stub_extractor_class()())
+        return ydl.sanitize_info(ydl.extract_info(url, download=False, process=False))
+
+
+# ── 측정 (자식 프로세스) ──
+class _PostprocessTimer:
+    """yt-dlp 후처리기 후크로 영상 ID별 후처리기 실행 시간 합계 (YoutubeDL은 풀에서 공유되므로 공용)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._started: Dict[Tuple[str, str], float] = {}
+        self._totals: Dict[str, Dict[str, float]] = {}
+
+    def hook(self, d: dict):
+        video_id = (d.get('info_dict') or {}).get('id')
+        key = (video_id, d.get('postprocessor'))
+        now = time.perf_counter()
+        with self._lock:
+            if d.get('status') == 'started':
+                self._started[key] = now
+            elif d.get('status') == 'finished' and key in self._started:
+                totals = self._totals.setdefault(video_id, {})
+                totals[key[1]] = totals.get(key[1], 0.0) + now - self._started.pop(key)
+
+    def pop(self, video_id: str) -> Dict[str, float]:
+        with self._lock:
+            return self._totals.pop(video_id, {})
+
+
+_pp_timer = _PostprocessTimer()
+
+
+def _timed_engine_class():
+    from download_engine import DownloadEngine
+
+    class TimedEngine(DownloadEngine):
+        """새로 만드는 YoutubeDL에 후처리기 시간 측정 후크를 등록하는 엔진"""
+
+        def _create_youtube_dl(self, ydl_opts: dict):
+            ydl = super()._create_youtube_dl(ydl_opts)
+            ydl.add_postprocessor_hook(_pp_timer.hook)
+            return ydl
+
+    return TimedEngine
+
+
+def _run_job(engine_class, url: str, output_dir: str, config: dict, ffmpeg: str) -> dict:
+    """작업 하나 실행 후 구간별 시각 반환 (초, 작업 시작 기준)"""
+    from retry_policy import RetryPolicy
+
+    started = time.perf_counter()
+    marks = {'first_byte': None, 'network_done': None}
+    downloaded = [0]
+
+    def on_progress_event(event):
+        downloaded[0] = max(downloaded[0], event.get('downloaded') or 0)
+        if marks['first_byte'] is None and downloaded[0] > 0:
+            marks['first_byte'] = time.perf_counter() - started
+
+    def on_network_done():
+        if marks['network_done'] is None:
+            marks['network_done'] = time.perf_counter() - started
+
+    record = {'url': url, 'ok': False, 'error': None}
+    try:
+        info = extract_stub_info(url)
+    except Exception as e:
+        record['error'] = f"추출 실패: {e}"
+        return record
+    extracted = time.perf_counter() - started
+
+    video_id = info['id']
+    engine = engine_class(url, os.path.join(output_dir, video_id + get_extension(config['type'])),
+                          config['type'], info=info, ffmpeg_location=ffmpeg,
+                          connections=config['connections'], parallel_formats=config['parallel_formats'],
+                          on_progress_event=on_progress_event, on_network_done=on_network_done,
+                          retry_policy=RetryPolicy(max_retries=0, unknown_retries=0))
+    success, message = engine.run()
+    finished = time.perf_counter() - started
+    postprocessors = _pp_timer.pop(video_id)
+
+    record.update({
+        'ok': success,
+        'error': None if success else message,
+        'bytes': downloaded[0],
+        'extract': extracted,
+        'first_byte': marks['first_byte'],
+        'network': (marks['network_done'] or finished) - extracted,
+        'postprocess': finished - marks['network_done'] if marks['network_done'] is not None else None,
+        'postprocessors': postprocessors,
+        'total': finished,
+    })
+    return record
+
+
+def _percentile(values: List[float], q: float) -> Optional[float]:
+    """가장 가까운 순위 백분위수 (값이 없으면 None)"""
+    values = sorted(v for v in values if v is not None)
+    if not values:
+        return None
+    index = max(0, math.ceil(q / 100 * len(values)) - 1)
+    return values[min(index, len(values) - 1)]
+
+
+def _ms(value: Optional[float]) -> Optional[float]:
+    return round(value * 1000, 1) if value is not None else None
+
+
+def _rss_mb(maxrss: int) -> float:
+    """getrusage의 ru_maxrss를 MB로 (macOS는 바이트, Linux는 KiB 단위)"""
+    return round(maxrss / (1 << 20) if sys.platform == 'darwin' else maxrss / 1024, 1)
+
+
+def _run_level(base_url: str, config: dict, concurrency: int, ffmpeg: str) -> dict:
+    """
+    동시 작업 수 하나 측정 (새 프로세스에서 실행)
+
+    다운로드 결과 색인과 메타데이터 캐시는 임시 폴더의 빈 파일로 바꿔, 이전에 받은 결과를
+    재사용하거나 사용자의 캐시에 벤치마크 항목이 남지 않게 합니다.
+    """
+    import metadata_cache
+    import output_index
+
+    work = tempfile.mkdtemp(prefix='ytdl-bench-')
+    try:
+        output_index._shared_index = output_index.OutputIndex(os.path.join(work, 'outputs.sqlite3'))
+        metadata_cache._shared_cache = metadata_cache.MetadataCache(os.path.join(work, 'metadata.sqlite3'))
+        engine_class = _timed_engine_class()
+        output_dir = os.path.join(work, 'out')
+
+        def run_jobs(prefix: str, count: int) -> List[dict]:
+            urls = [f'{base_url}/watch/{prefix}-{i:04d}' for i in range(count)]
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                return list(executor.map(lambda url: _run_job(engine_class, url, output_dir, config, ffmpeg),
+                                         urls))
+
+        # yt-dlp 진행 표시는 버림 (결과 출력과 섞이지 않게)
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            # 워밍업 (yt-dlp import, YoutubeDL 생성 등 첫 작업에만 드는 비용 제외)
+            if config['warmup']:
+                run_jobs(f'warmup-c{concurrency}', config['warmup'])
+                shutil.rmtree(output_dir, ignore_errors=True)
+
+            started = time.perf_counter()
+            records = run_jobs(f'job-c{concurrency}', config['jobs'])
+            wall = time.perf_counter() - started
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+    done = [r for r in records if r['ok']]
+    total_bytes = sum(r['bytes'] for r in done)
+    pp_names = sorted({name for r in done for name in r['postprocessors']})
+    level = {
+        'concurrency': concurrency,
+        'jobs': len(records),
+        'ok': len(done),
+        'failed': len(records) - len(done),
+        'errors': sorted({r['error'] for r in records if r['error']})[:5],
+        'wall_s': round(wall, 3),
+        'jobs_per_sec': round(len(done) / wall, 3) if wall else None,
+        'mb_per_sec': round(total_bytes / wall / 1e6, 2) if wall else None,
+        'bytes': total_bytes,
+    }
+    for name, key in (('ttfb', 'first_byte'), ('extract', 'extract'), ('network', 'network'),
+                      ('postprocess', 'postprocess'), ('total', 'total')):
+        values = [r[key] for r in done]
+        level[f'{name}_ms_p50'] = _ms(_percentile(values, 50))
+        level[f'{name}_ms_p95'] = _ms(_percentile(values, 95))
+    level['merge_ms_p50'] = _ms(_percentile([r['postprocessors'].get('Merger') for r in done], 50))
+    level['merge_ms_p95'] = _ms(_percentile([r['postprocessors'].get('Merger') for r in done], 95))
+    level['postprocessors_ms_p50'] = {
+        name: _ms(_percentile([r['postprocessors'].get(name) for r in done], 50)) for name in pp_names
+    }
+    if resource is not None:
+        level['peak_rss_mb'] = _rss_mb(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+        level['peak_child_rss_mb'] = _rss_mb(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    return level
+
+
+# ── 실행/기록 ──
+def _git_revision() -> Tuple[Optional[str], bool]:
+    """(현재 커밋 해시, 커밋되지 않은 변경 여부), git이 없으면 (None, False)"""
+    cwd = os.path.dirname(os.path.abspath(__file__))
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=cwd, capture_output=True,
+                                text=True, timeout=10, check=True).stdout.strip()
+        status = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=cwd,
+                                capture_output=True, text=True, timeout=10).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None, False
+    return commit or None, bool(status.strip())
+
+
+def _format_level(level: dict) -> str:
+    def fmt(value, unit=''):
+        return f"{value}{unit}" if value is not None else '-'
+
+    line = (f"동시 {level['concurrency']}: {level['ok']}/{level['jobs']}개 성공, "
+            f"{fmt(level['jobs_per_sec'])}작업/초, {fmt(level['mb_per_sec'])}MB/s, "
+            f"TTFB p50 {fmt(level['ttfb_ms_p50'], 'ms')}, 전송 p50 {fmt(level['network_ms_p50'], 'ms')}, "
+            f"병합 p50 {fmt(level['merge_ms_p50'], 'ms')}, 후처리 p50 {fmt(level['postprocess_ms_p50'], 'ms')}")
+    if 'peak_rss_mb' in level:
+        line += f", 최대 RSS {level['peak_rss_mb']}MB (하위 프로세스 {level['peak_child_rss_mb']}MB)"
+    return line
+
+
+def run_benchmark(config: dict, concurrency_levels: List[int], results_path: str,
+                  label: Optional[str] = None) -> dict:
+    """
+    동시 작업 수별로 측정하고 결과 기록을 results_path에 추가
+
+    Raises:
+        RuntimeError: FFmpeg를 찾을 수 없거나 합성 미디어를 만들 수 없는 경우
+    """
+    ffmpeg = find_ffmpeg_path()
+    if not ffmpeg:
+        raise RuntimeError("FFmpeg를 찾을 수 없습니다. 합성 미디어 생성과 병합에 FFmpeg가 필요합니다.")
+    media = generate_media(ffmpeg, config['duration'], config['video_kbps'], config['audio_kbps'])
+
+    server = MediaServer(media, latency=config['latency_ms'] / 1000, bandwidth=config['bandwidth'])
+    server.start()
+    levels = []
+    try:
+        for concurrency in concurrency_levels:
+            server.reset_counters()
+            # 동시 작업 수마다 새 프로세스 (최대 RSS, 풀, 캐시를 분리)
+            with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as executor:
+                level = executor.submit(_run_level, server.base_url, config, concurrency, ffmpeg).result()
+            level['server_requests'] = server.requests
+            levels.append(level)
+            print(_format_level(level), flush=True)
+            for error in level['errors']:
+                print(f"  ✗ {error}", file=sys.stderr)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    import yt_dlp.version
+
+    commit, dirty = _git_revision()
+    record = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'commit': commit,
+        'dirty': dirty,
+        'label': label,
+        'host': platform.node(),
+        'platform': platform.platform(),
+        'python': platform.python_version(),
+        'yt_dlp': yt_dlp.version.__version__,
+        'media': {'vcodec': media['vcodec'], 'video_bytes': os.path.getsize(media['video']),
+                  'audio_bytes': os.path.getsize(media['audio'])},
+        'config': config,
+        'levels': levels,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(results_path)), exist_ok=True)
+    with open(results_path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record, ensure_ascii=False) + '\n')
+    return record
+
+
+def load_results(path: str) -> List[dict]:
+    """결과 파일의 기록 목록 (오래된 순, 읽을 수 없는 줄은 건너뜀)"""
+    records = []
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+    except OSError:
+        pass
+    return records
+
+
+def _same_config(a: dict, b: dict) -> bool:
+    return all(a.get('config', {}).get(k) == b.get('config', {}).get(k) for k in _CONFIG_KEYS)
+
+
+def _find_record(records: List[dict], ref: Optional[str]) -> Optional[dict]:
+    """커밋 해시 앞부분 또는 라벨이 일치하는 마지막 기록 (ref가 없으면 마지막 기록)"""
+    for record in reversed(records):
+        if ref is None or (record.get('commit') or '').startswith(ref) or record.get('label') == ref:
+            return record
+    return None
+
+
+def _resolve_ref(ref: Optional[str]) -> Optional[str]:
+    """git 리비전 이름(HEAD, 브랜치 등)을 커밋 해시로 (실패하면 그대로)"""
+    if ref is None:
+        return None
+    try:
+        return subprocess.run(['git', 'rev-parse', '--verify', '--quiet', ref + '^{commit}'],
+                              cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True,
+                              text=True, timeout=10, check=True).stdout.strip() or ref
+    except (OSError, subprocess.SubprocessError):
+        return ref
+
+
+def compare_records(base: dict, new: dict, max_regression: Optional[float] = None) -> List[str]:
+    """
+    두 기록을 동시 작업 수별로 비교해 출력하고, max_regression(%)보다 나빠진 항목 목록 반환
+    """
+    regressions = []
+    base_levels = {level['concurrency']: level for level in base['levels']}
+    for level in new['levels']:
+        old = base_levels.get(level['concurrency'])
+        if old is None:
+            continue
+        print(f"\n동시 {level['concurrency']}")
+        for key, name, higher_is_better in _COMPARED_METRICS:
+            before, after = old.get(key), level.get(key)
+            if before is None or after is None:
+                continue
+            change = (after - before) / before * 100 if before else 0.0
+            worse = -change if higher_is_better else change
+            mark = ''
+            if max_regression is not None and worse > max_regression:
+                mark = '  ✗'
+                regressions.append(f"동시 {level['concurrency']} {name}: {before} → {after} ({change:+.1f}%)")
+            print(f"  {name:<20} {before:>10} → {after:<10} ({change:+.1f}%){mark}")
+    return regressions
+
+
+def _describe(record: dict) -> str:
+    commit = (record.get('commit') or 'unknown')[:10] + (' (수정됨)' if record.get('dirty') else '')
+    label = f" [{record['label']}]" if record.get('label') else ''
+    return f"{commit}{label} {record.get('timestamp', '')}"
+
+
+def _concurrency_list(text: str) -> List[int]:
+    try:
+        levels = [int(part) for part in text.split(',') if part.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"잘못된 동시 작업 수 목록: {text}")
+    if not levels or min(levels) < 1:
+        raise argparse.ArgumentTypeError(f"잘못된 동시 작업 수 목록: {text}")
+    return levels
+
+
+def _rate(text: str) -> int:
+    try:
+        return parse_rate(text)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="다운로드 파이프라인 오프라인 벤치마크")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help="로컬 서버로 측정하고 결과 기록")
+    run.add_argument('-t', '--type', default='video_best', choices=DOWNLOAD_TYPES,
+                     help="다운로드 프리셋 (기본값: video_best)")
+    run.add_argument('--jobs', type=int, default=8, help="동시 작업 수마다 실행할 작업 수 (기본값: 8)")
+    run.add_argument('--concurrency', type=_concurrency_list, default=[1, 2, 4],
+                     help="측정할 동시 작업 수 목록 (기본값: 1,2,4)")
+    run.add_argument('--warmup', type=int, default=1, help="측정 전 워밍업 작업 수 (기본값: 1)")
+    run.add_argument('--duration', type=int, default=20, help="합성 미디어 길이, 초 (기본값: 20)")
+    run.add_argument('--video-bitrate', type=int, default=2000, help="합성 비디오 비트레이트, kbps (기본값: 2000)")
+    run.add_argument('--audio-bitrate', type=int, default=128, help="합성 오디오 비트레이트, kbps (기본값: 128)")
+    run.add_argument('--latency-ms', type=float, default=20.0, help="요청마다 서버 지연, ms (기본값: 20)")
+    run.add_argument('--bandwidth', type=_rate, default=0, metavar='RATE',
+                     help="연결당 서버 전송 속도, 예: 4M (기본값: 제한 없음)")
+    run.add_argument('--connections', type=int, default=1,
+                     help="포맷당 동시 연결 수, 2 이상이면 구간 다운로드 (기본값: 1)")
+    run.add_argument('--no-parallel-formats', action='store_true', help="비디오/오디오 포맷을 차례로 받음")
+    run.add_argument('--label', help="기록에 붙일 이름 (compare에서 커밋 대신 사용 가능)")
+    run.add_argument('--results', default=DEFAULT_RESULTS, help="결과 파일 (JSONL)")
+
+    compare = commands.add_parser('compare', help="두 기록 비교 (기본값: 같은 설정의 마지막 두 기록)")
+    compare.add_argument('base', nargs='?', help="기준 커밋/라벨")
+    compare.add_argument('new', nargs='?', help="비교할 커밋/라벨 (기본값: 마지막 기록)")
+    compare.add_argument('--results', default=DEFAULT_RESULTS, help="결과 파일 (JSONL)")
+    compare.add_argument('--max-regression', type=float, metavar='PCT',
+                         help="이 비율(%%)보다 나빠진 항목이 있으면 실패 (종료 코드 1)")
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        config = {
+            'type': args.type, 'jobs': args.jobs, 'warmup': args.warmup, 'duration': args.duration,
+            'video_kbps': args.video_bitrate, 'audio_kbps': args.audio_bitrate, 'latency_ms': args.latency_ms,
+            'bandwidth': args.bandwidth, 'connections': args.connections,
+            'parallel_formats': not args.no_parallel_formats,
+        }
+        try:
+            record = run_benchmark(config, args.concurrency, args.results, args.label)
+        except (RuntimeError, OSError, subprocess.CalledProcessError) as e:
+            print(f"✗ {e}", file=sys.stderr)
+            return 2
+        print(f"\n결과 기록: {args.results} ({_describe(record)})")
+        return 1 if any(level['failed'] for level in record['levels']) else 0
+
+    records = load_results(args.results)
+    new = _find_record(records, _resolve_ref(args.new))
+    if new is None:
+        print(f"✗ 비교할 기록이 없습니다: {args.results}", file=sys.stderr)
+        return 2
+    earlier = records[:records.index(new)]
+    if args.base is None:
+        earlier = [r for r in earlier if _same_config(r, new)]
+    base = _find_record(earlier, _resolve_ref(args.base))
+    if base is None:
+        print("✗ 기준 기록이 없습니다 (같은 설정으로 두 번 이상 실행하거나 기준 커밋/라벨을 지정하세요)",
+              file=sys.stderr)
+        return 2
+    if not _same_config(base, new):
+        print("! 두 기록의 설정이 다릅니다 (결과를 직접 비교하기 어려울 수 있음)", file=sys.stderr)
+
+    print(f"기준: {_describe(base)}\n비교: {_describe(new)}")
+    regressions = compare_records(base, new, args.max_regression)
+    if regressions:
+        print(f"\n✗ {len(regressions)}개 항목이 {args.max_regression}% 넘게 나빠졌습니다", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,181 @@
+"""
+외부 실행 파일(FFmpeg, AtomicParsley) 탐색 결과 캐시 (PyQt6 비의존)
+
+실행 파일의 경로, 수정 시각, 크기가 그대로이면 이전 실행에서 확인한 버전과 macOS quarantine
+속성 제거 여부를 디스크 캐시(JSON)에서 그대로 사용하므로, 바뀐 것이 없으면 시작할 때나
+작업마다 경로를 찾을 때 하위 프로세스(which, xattr, -version)를 실행하지 않습니다.
+경로 탐색 결과는 프로세스 안에서도 기억하며, 파일이 사라지면 다시 찾습니다.
+"""
+
+import os
+import re
+import sys
+import json
+import shutil
+import platform
+import threading
+import subprocess
+from typing import Dict, List, Optional
+
+from metadata_cache import default_cache_dir
+
+# 버전 확인 인자 (실행 파일 이름별, 없으면 -version)
+_VERSION_ARGS = {'AtomicParsley': ['--version']}
+
+# PATH 밖에서 추가로 확인할 위치 (macOS Homebrew: Apple Silicon, Intel)
+_EXTRA_DIRS = ('/opt/homebrew/bin', '/usr/local/bin')
+
+_VERSION_RE = re.compile(r'version:?\s+(\S+)', re.IGNORECASE)
+
+
+def app_bin_dir() -> str:
+    """앱과 함께 배포되거나 자동 설치된 실행 파일 폴더"""
+    if getattr(sys, 'frozen', False):
+        return os.path.join(os.path.dirname(sys.executable), 'bin')
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bin')
+
+
+def _executable(path: str) -> bool:
+    return os.path.isfile(path) and os.access(path, os.X_OK)
+
+
+def _fingerprint(path: str) -> Optional[List[int]]:
+    """파일이 바뀌었는지 판단하는 (수정 시각 ns, 크기)"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+class BinaryProbe:
+    """실행 파일 경로/버전/quarantine 처리 결과를 기억하는 스레드 안전 탐색기"""
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path: 캐시 파일 경로 (None이면 기본 캐시 디렉토리의 binaries.json)
+        """
+        self.path = path or os.path.join(default_cache_dir(), 'binaries.json')
+        self._lock = threading.Lock()
+        self._resolved: Dict[str, str] = {}
+        self._entries: Dict[str, dict] = self._load()
+
+    def find(self, name: str) -> Optional[str]:
+        """
+        실행 파일 경로 (앱 번들 bin 폴더, PATH, Homebrew 순, 없으면 None)
+
+        찾은 경로는 기억했다가 파일이 남아 있는 동안 그대로 반환합니다.
+        찾지 못한 결과는 기억하지 않으므로 나중에 설치되면 다음 호출에서 찾습니다.
+        """
+        with self._lock:
+            path = self._resolved.get(name)
+        if path and _executable(path):
+            return path
+
+        path = self._search(name)
+        with self._lock:
+            if path:
+                self._resolved[name] = path
+            else:
+                self._resolved.pop(name, None)
+        return path
+
+    def version(self, path: str) -> Optional[str]:
+        """실행 파일 버전 문자열 (파일이 바뀌지 않았으면 캐시된 값, 확인할 수 없으면 None)"""
+        entry = self._entry(path)
+        if entry is None:
+            return None
+        if 'version' not in entry:
+            name = os.path.splitext(os.path.basename(path))[0]
+            try:
+                output = subprocess.run([path] + _VERSION_ARGS.get(name, ['-version']),
+                                        capture_output=True, text=True, timeout=10).stdout
+            except (OSError, subprocess.SubprocessError):
+                output = ''
+            match = _VERSION_RE.search(output)
+            entry['version'] = match.group(1) if match else None
+            self._save()
+        return entry['version']
+
+    def clear_quarantine(self, path: str):
+        """macOS에서 quarantine/provenance 속성 제거 (같은 파일에는 한 번만 실행)"""
+        if platform.system() != 'Darwin':
+            return
+        entry = self._entry(path)
+        if entry is None or entry.get('quarantine_cleared'):
+            return
+        for attribute in ('com.apple.quarantine', 'com.apple.provenance'):
+            try:
+                subprocess.run(['xattr', '-d', attribute, path], stderr=subprocess.DEVNULL, timeout=2)
+            except Exception:
+                pass  # 속성이 없으면 무시
+        entry['quarantine_cleared'] = True
+        self._save()
+
+    def reset(self):
+        """기억한 경로 초기화 (실행 파일을 설치하거나 PATH를 바꾼 뒤 호출)"""
+        with self._lock:
+            self._resolved.clear()
+
+    # ── 내부 ──
+    def _search(self, name: str) -> Optional[str]:
+        exe = name + '.exe' if sys.platform == 'win32' else name
+        if getattr(sys, 'frozen', False):
+            local = os.path.join(app_bin_dir(), exe)
+            if _executable(local):
+                return local
+        found = shutil.which(name)
+        if found:
+            return found
+        for directory in _EXTRA_DIRS:
+            candidate = os.path.join(directory, exe)
+            if _executable(candidate):
+                return candidate
+        return None
+
+    def _entry(self, path: str) -> Optional[dict]:
+        """경로의 캐시 항목 (파일이 바뀌었으면 새 항목, 파일이 없으면 None)"""
+        fingerprint = _fingerprint(path)
+        if fingerprint is None:
+            return None
+        key = os.path.abspath(path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.get('fingerprint') != fingerprint:
+                entry = self._entries[key] = {'fingerprint': fingerprint}
+            return entry
+
+    def _load(self) -> Dict[str, dict]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+            return entries if isinstance(entries, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self):
+        """캐시 파일 기록 (임시 파일에 쓴 뒤 교체, 실패해도 무시)"""
+        with self._lock:
+            data = json.dumps(self._entries, ensure_ascii=False, indent=2)
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            temp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(temp_path, self.path)
+        except OSError:
+            pass
+
+
+_shared_probe: Optional[BinaryProbe] = None
+_shared_lock = threading.Lock()
+
+
+def get_binary_probe() -> BinaryProbe:
+    """프로세스 공용 탐색기 인스턴스"""
+    global _shared_probe
+    with _shared_lock:
+        if _shared_probe is None:
+            _shared_probe = BinaryProbe()
+        return _shared_probe
@@ -1,23 +1,66 @@
 """
 FFmpeg와 AtomicParsley 의존성 확인 및 자동 설치
+
+실행 파일 탐색과 quarantine 속성 제거는 binary_probe 캐시를 거치므로, 바뀐 것이 없으면
+시작할 때 하위 프로세스를 실행하지 않습니다. 없는 실행 파일은 동시에 받으며, 설치 파일은
+artifact_cache를 거쳐 이어받기/체크섬 검증/캐시(미러)를 적용합니다.
 """
 
 import os
 import sys
-import subprocess
 import platform
-import urllib.request
 import tarfile
 import zipfile
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from artifact_cache import UNVERIFIED_ENV, ArtifactCache, ChecksumError
+from binary_probe import get_binary_probe
+
+# 출력용 이름
+_LABELS = {'ffmpeg': 'FFmpeg', 'AtomicParsley': 'AtomicParsley'}
+
+# 설치 파일 출처 ((이름, 운영체제) -> url, 검증용 sha256 또는 checksum_url/algorithm, 안내 문구 hint)
+# '최신 버전' URL은 고정 해시가 없으므로 배포처가 공개한 체크섬 파일로 검증하고,
+# 고정 릴리스인 AtomicParsley는 GitHub가 릴리스 자산마다 공개하는 SHA-256 digest로 검증.
+# 체크섬을 구할 수 없으면 설치하지 않음 (evermeet.cx는 GPG 서명만 제공하므로 macOS용 FFmpeg는
+# YTDL_ALLOW_UNVERIFIED=1일 때만 자동 설치)
+_ATOMICPARSLEY_TAG = "20240608.083822.1ed9031"
+_ATOMICPARSLEY_RELEASE = f"https://github.com/wez/atomicparsley/releases/download/{_ATOMICPARSLEY_TAG}"
+_ATOMICPARSLEY_DIGESTS = f"https://api.github.com/repos/wez/atomicparsley/releases/tags/{_ATOMICPARSLEY_TAG}"
+_SOURCES = {
+    ('ffmpeg', 'Darwin'): {
+        'url': "https://evermeet.cx/ffmpeg/getrelease/ffmpeg/zip",
+        'hint': "Homebrew로 설치하세요: brew install ffmpeg",
+    },
+    ('ffmpeg', 'Windows'): {
+        'url': "https://www.gyan.dev/ffmpeg/builds/ffmpeg-release-essentials.zip",
+        'checksum_url': "https://www.gyan.dev/ffmpeg/builds/ffmpeg-release-essentials.zip.sha256",
+    },
+    # 예외: johnvansickle.com은 MD5만 공개함. MD5는 충돌 저항성이 없어 전송 오류나 미러 교체는
+    # 잡아내지만 의도적으로 만든 파일까지 막지는 못함 (체크섬 문서가 없거나 맞지 않으면 설치하지 않음)
+    ('ffmpeg', 'Linux'): {
+        'url': "https://johnvansickle.com/ffmpeg/releases/ffmpeg-release-amd64-static.tar.xz",
+        'checksum_url': "https://johnvansickle.com/ffmpeg/releases/ffmpeg-release-amd64-static.tar.xz.md5",
+        'algorithm': 'md5',
+    },
+    ('AtomicParsley', 'Darwin'): {'url': f"{_ATOMICPARSLEY_RELEASE}/AtomicParsleyMacOS.zip",
+                                  'checksum_url': _ATOMICPARSLEY_DIGESTS},
+    ('AtomicParsley', 'Windows'): {'url': f"{_ATOMICPARSLEY_RELEASE}/AtomicParsleyWindows.zip",
+                                   'checksum_url': _ATOMICPARSLEY_DIGESTS},
+    ('AtomicParsley', 'Linux'): {'url': f"{_ATOMICPARSLEY_RELEASE}/AtomicParsleyLinux.zip",
+                                 'checksum_url': _ATOMICPARSLEY_DIGESTS},
+}
+
 
 class DependencyChecker:
     def __init__(self):
         self.system = platform.system()
         self.base_dir = self._get_base_dir()
         self.bin_dir = os.path.join(self.base_dir, 'bin')
+        self.probe = get_binary_probe()
+        self.artifacts = ArtifactCache()
 
         # bin 디렉토리 생성
         os.makedirs(self.bin_dir, exist_ok=True)
@@ -36,21 +79,17 @@ class DependencyChecker:
             return os.path.dirname(os.path.abspath(__file__))
 
     def _check_command(self, command):
-        """명령어가 시스템에 설치되어 있는지 확인"""
-        try:
-            if self.system == 'Windows':
-                subprocess.run(['where', command],
-                             stdout=subprocess.PIPE,
-                             stderr=subprocess.PIPE,
-                             check=True)
-            else:
-                subprocess.run(['which', command],
-                             stdout=subprocess.PIPE,
-                             stderr=subprocess.PIPE,
-                             check=True)
-            return True
-        except subprocess.CalledProcessError:
-            return False
+        """명령어가 시스템에 설치되어 있는지 확인 (로컬 bin 디렉토리 제외)"""
+        path = self.probe.find(command)
+        return bool(path) and os.path.dirname(os.path.abspath(path)) != os.path.abspath(self.bin_dir)
+
+    def _version_suffix(self, command):
+        """출력용 버전 표기 (캐시된 버전, 확인할 수 없으면 빈 문자열)"""
+        path = self.probe.find(command)
+        if path is None and self._check_local_binary(command):
+            path = os.path.join(self.bin_dir, f'{command}.exe' if self.system == 'Windows' else command)
+        version = self.probe.version(path) if path else None
+        return f" ({version})" if version else ""
 
     def _check_local_binary(self, name):
         """로컬 bin 디렉토리에 바이너리가 있는지 확인"""
@@ -61,229 +100,91 @@ class DependencyChecker:
 
         return os.path.exists(binary_path) and os.access(binary_path, os.X_OK)
 
-    def _download_file(self, url, dest_path):
-        """파일 다운로드"""
-        print(f"다운로드 중: {url}")
-        urllib.request.urlretrieve(url, dest_path)
-        print(f"다운로드 완료: {dest_path}")
-
-    def _install_ffmpeg_macos(self):
-        """macOS용 FFmpeg 다운로드 및 설치"""
-        print("FFmpeg를 다운로드하고 있습니다...")
-
-        # FFmpeg static build 다운로드
-        url = "https://evermeet.cx/ffmpeg/getrelease/ffmpeg/zip"
-        zip_path = os.path.join(self.bin_dir, 'ffmpeg.zip')
-
-        try:
-            self._download_file(url, zip_path)
-
-            # 압축 해제
-            with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                zip_ref.extractall(self.bin_dir)
-
-            # 실행 권한 부여
-            ffmpeg_path = os.path.join(self.bin_dir, 'ffmpeg')
-            os.chmod(ffmpeg_path, 0o755)
-
-            # macOS Gatekeeper quarantine 속성 제거
-            try:
-                subprocess.run(['xattr', '-d', 'com.apple.quarantine', ffmpeg_path],
-                             stderr=subprocess.DEVNULL)
-                subprocess.run(['xattr', '-d', 'com.apple.provenance', ffmpeg_path],
-                             stderr=subprocess.DEVNULL)
-            except Exception:
-                pass  # 속성이 없으면 무시
-
-            # zip 파일 삭제
-            os.remove(zip_path)
-
-            print("FFmpeg 설치 완료!")
-            return True
-        except Exception as e:
-            print(f"FFmpeg 설치 실패: {e}")
-            return False
-
-    def _install_atomicparsley_macos(self):
-        """macOS용 AtomicParsley 다운로드 및 설치"""
-        print("AtomicParsley를 다운로드하고 있습니다...")
-
-        # GitHub에서 최신 릴리스 다운로드
-        url = "https://github.com/wez/atomicparsley/releases/download/20240608.083822.1ed9031/AtomicParsleyMacOS.zip"
-        zip_path = os.path.join(self.bin_dir, 'atomicparsley.zip')
-
-        try:
-            self._download_file(url, zip_path)
-
-            # 압축 해제
-            with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                zip_ref.extractall(self.bin_dir)
-
-            # AtomicParsley 파일명 변경 (대소문자 통일)
-            extracted_files = os.listdir(self.bin_dir)
-            for file in extracted_files:
-                if 'atomicparsley' in file.lower() and file != 'AtomicParsley':
-                    old_path = os.path.join(self.bin_dir, file)
-                    new_path = os.path.join(self.bin_dir, 'AtomicParsley')
-                    if os.path.isfile(old_path):
-                        shutil.move(old_path, new_path)
-                        break
-
-            # 실행 권한 부여
-            atomicparsley_path = os.path.join(self.bin_dir, 'AtomicParsley')
-            if os.path.exists(atomicparsley_path):
-                os.chmod(atomicparsley_path, 0o755)
+    def _download_file(self, name, source):
+        """설치 파일을 캐시에서 가져오거나 받기 (진행률은 10% 단위로 출력)"""
+        label = _LABELS[name]
+        reported = [-1]
 
-                # macOS Gatekeeper quarantine 속성 제거
-                try:
-                    subprocess.run(['xattr', '-d', 'com.apple.quarantine', atomicparsley_path],
-                                 stderr=subprocess.DEVNULL)
-                    subprocess.run(['xattr', '-d', 'com.apple.provenance', atomicparsley_path],
-                                 stderr=subprocess.DEVNULL)
-                except Exception:
-                    pass  # 속성이 없으면 무시
+        def on_progress(received, total):
+            if total:
+                step = received * 10 // total
+                if step != reported[0]:
+                    reported[0] = step
+                    print(f"{label} 다운로드 중... {step * 10}% ({received / 2 ** 20:.1f}/{total / 2 ** 20:.1f}MiB)")
 
-            # zip 파일 삭제
-            os.remove(zip_path)
-
-            print("AtomicParsley 설치 완료!")
-            return True
-        except Exception as e:
-            print(f"AtomicParsley 설치 실패: {e}")
-            return False
-
-    def _install_ffmpeg_windows(self):
-        """Windows용 FFmpeg 다운로드 및 설치"""
-        print("FFmpeg를 다운로드하고 있습니다...")
-
-        # FFmpeg Windows build
-        url = "https://www.gyan.dev/ffmpeg/builds/ffmpeg-release-essentials.zip"
-        zip_path = os.path.join(self.bin_dir, 'ffmpeg.zip')
+        def on_unverified(reason):
+            print(f"⚠ {label} 설치 파일을 검증하지 않고 받습니다 ({UNVERIFIED_ENV}=1): {reason}")
 
+        print(f"다운로드 중: {source['url']}")
         try:
-            self._download_file(url, zip_path)
-
-            # 압축 해제
-            with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                # ffmpeg.exe만 추출
-                for file in zip_ref.namelist():
-                    if file.endswith('bin/ffmpeg.exe'):
-                        source = zip_ref.open(file)
-                        target = open(os.path.join(self.bin_dir, 'ffmpeg.exe'), 'wb')
-                        with source, target:
+            path = self.artifacts.fetch(source['url'], sha256=source.get('sha256'),
+                                        checksum_url=source.get('checksum_url'),
+                                        algorithm=source.get('algorithm', 'sha256'),
+                                        on_progress=on_progress, on_unverified=on_unverified)
+        except ChecksumError:
+            if source.get('hint'):
+                print(f"{label}: {source['hint']}")
+            raise
+        print(f"다운로드 완료: {path}")
+        return path
+
+    def _extract_member(self, archive_path, exe_name, dest_path):
+        """
+        압축 파일에서 exe_name 파일 하나만 꺼내 dest_path에 저장
+
+        tar.xz는 스트림으로 읽어 해당 파일을 찾는 즉시 멈추므로 뒤쪽 항목은 풀지 않습니다.
+        """
+        temp_path = dest_path + '.tmp'
+        if zipfile.is_zipfile(archive_path):
+            with zipfile.ZipFile(archive_path, 'r') as zip_ref:
+                for info in zip_ref.infolist():
+                    if not info.is_dir() and os.path.basename(info.filename).lower() == exe_name.lower():
+                        with zip_ref.open(info) as source, open(temp_path, 'wb') as target:
                             shutil.copyfileobj(source, target)
                         break
-
-            os.remove(zip_path)
-            print("FFmpeg 설치 완료!")
-            return True
-        except Exception as e:
-            print(f"FFmpeg 설치 실패: {e}")
-            return False
-
-    def _install_atomicparsley_windows(self):
-        """Windows용 AtomicParsley 다운로드 및 설치"""
-        print("AtomicParsley를 다운로드하고 있습니다...")
-
-        url = "https://github.com/wez/atomicparsley/releases/download/20240608.083822.1ed9031/AtomicParsleyWindows.zip"
-        zip_path = os.path.join(self.bin_dir, 'atomicparsley.zip')
-
-        try:
-            self._download_file(url, zip_path)
-
-            with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                zip_ref.extractall(self.bin_dir)
-
-            # 파일명 변경
-            extracted_files = os.listdir(self.bin_dir)
-            for file in extracted_files:
-                if 'atomicparsley' in file.lower() and file.endswith('.exe'):
-                    old_path = os.path.join(self.bin_dir, file)
-                    new_path = os.path.join(self.bin_dir, 'AtomicParsley.exe')
-                    if old_path != new_path:
-                        shutil.move(old_path, new_path)
-                    break
-
-            os.remove(zip_path)
-            print("AtomicParsley 설치 완료!")
-            return True
-        except Exception as e:
-            print(f"AtomicParsley 설치 실패: {e}")
-            return False
-
-    def _install_ffmpeg_linux(self):
-        """Linux용 FFmpeg 다운로드 및 설치"""
-        print("FFmpeg를 다운로드하고 있습니다...")
-
-        # FFmpeg static build
-        url = "https://johnvansickle.com/ffmpeg/releases/ffmpeg-release-amd64-static.tar.xz"
-        tar_path = os.path.join(self.bin_dir, 'ffmpeg.tar.xz')
-
-        try:
-            self._download_file(url, tar_path)
-
-            # 압축 해제
-            with tarfile.open(tar_path, 'r:xz') as tar_ref:
-                for member in tar_ref.getmembers():
-                    if member.name.endswith('/ffmpeg'):
-                        member.name = 'ffmpeg'
-                        tar_ref.extract(member, self.bin_dir)
+                else:
+                    raise FileNotFoundError(f"압축 파일에 {exe_name}이(가) 없습니다")
+        else:
+            with tarfile.open(archive_path, 'r|*') as tar_ref:
+                for member in tar_ref:
+                    if member.isfile() and os.path.basename(member.name).lower() == exe_name.lower():
+                        with tar_ref.extractfile(member) as source, open(temp_path, 'wb') as target:
+                            shutil.copyfileobj(source, target)
                         break
-
-            ffmpeg_path = os.path.join(self.bin_dir, 'ffmpeg')
-            os.chmod(ffmpeg_path, 0o755)
-
-            os.remove(tar_path)
-            print("FFmpeg 설치 완료!")
-            return True
-        except Exception as e:
-            print(f"FFmpeg 설치 실패: {e}")
+                else:
+                    raise FileNotFoundError(f"압축 파일에 {exe_name}이(가) 없습니다")
+        os.replace(temp_path, dest_path)
+
+    def _install(self, name):
+        """FFmpeg/AtomicParsley 다운로드(캐시 우선) 후 로컬 bin 디렉토리에 설치"""
+        label = _LABELS[name]
+        source = _SOURCES.get((name, self.system))
+        if source is None:
+            print(f"{label} 설치 실패: 지원하지 않는 운영체제 ({self.system})")
             return False
 
-    def _install_atomicparsley_linux(self):
-        """Linux용 AtomicParsley 다운로드 및 설치"""
-        print("AtomicParsley를 다운로드하고 있습니다...")
-
-        url = "https://github.com/wez/atomicparsley/releases/download/20240608.083822.1ed9031/AtomicParsleyLinux.zip"
-        zip_path = os.path.join(self.bin_dir, 'atomicparsley.zip')
-
+        print(f"{label}를 다운로드하고 있습니다...")
+        exe_name = f'{name}.exe' if self.system == 'Windows' else name
+        dest_path = os.path.join(self.bin_dir, exe_name)
         try:
-            self._download_file(url, zip_path)
-
-            with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                zip_ref.extractall(self.bin_dir)
-
-            # 파일명 변경
-            extracted_files = os.listdir(self.bin_dir)
-            for file in extracted_files:
-                if 'atomicparsley' in file.lower() and file != 'AtomicParsley':
-                    old_path = os.path.join(self.bin_dir, file)
-                    new_path = os.path.join(self.bin_dir, 'AtomicParsley')
-                    if os.path.isfile(old_path):
-                        shutil.move(old_path, new_path)
-                        break
+            archive_path = self._download_file(name, source)
+            self._extract_member(archive_path, exe_name, dest_path)
 
-            atomicparsley_path = os.path.join(self.bin_dir, 'AtomicParsley')
-            if os.path.exists(atomicparsley_path):
-                os.chmod(atomicparsley_path, 0o755)
+            if self.system != 'Windows':
+                # 실행 권한 부여
+                os.chmod(dest_path, 0o755)
+            # macOS Gatekeeper quarantine 속성 제거
+            self._remove_quarantine_macos(dest_path)
 
-            os.remove(zip_path)
-            print("AtomicParsley 설치 완료!")
+            print(f"{label} 설치 완료!")
             return True
         except Exception as e:
-            print(f"AtomicParsley 설치 실패: {e}")
+            print(f"{label} 설치 실패: {e}")
             return False
 
     def _remove_quarantine_macos(self, binary_path):
-        """macOS에서 quarantine 속성 제거"""
-        if self.system == 'Darwin' and os.path.exists(binary_path):
-            try:
-                subprocess.run(['xattr', '-d', 'com.apple.quarantine', binary_path],
-                             stderr=subprocess.DEVNULL)
-                subprocess.run(['xattr', '-d', 'com.apple.provenance', binary_path],
-                             stderr=subprocess.DEVNULL)
-            except Exception:
-                pass  # 속성이 없으면 무시
+        """macOS에서 quarantine 속성 제거 (같은 파일에는 한 번만 실행)"""
+        self.probe.clear_quarantine(binary_path)
 
     def check_and_install(self):
         """FFmpeg와 AtomicParsley 확인 및 설치"""
@@ -294,52 +195,34 @@ class DependencyChecker:
         atomicparsley_system = self._check_command('AtomicParsley')
 
         if ffmpeg_system and atomicparsley_system:
-            print("✓ FFmpeg (시스템): 설치됨")
-            print("✓ AtomicParsley (시스템): 설치됨")
+            print(f"✓ FFmpeg (시스템): 설치됨{self._version_suffix('ffmpeg')}")
+            print(f"✓ AtomicParsley (시스템): 설치됨{self._version_suffix('AtomicParsley')}")
             print("\n의존성 확인 완료!\n")
             return True
 
-        # FFmpeg 확인
-        ffmpeg_ok = False
-        if ffmpeg_system:
-            print("✓ FFmpeg (시스템): 설치됨")
-            ffmpeg_ok = True
-        elif self._check_local_binary('ffmpeg'):
-            print("✓ FFmpeg (로컬): 설치됨")
-            ffmpeg_ok = True
-            # 로컬 바이너리의 quarantine 속성 제거
-            self._remove_quarantine_macos(os.path.join(self.bin_dir, 'ffmpeg'))
-        else:
-            print("✗ FFmpeg: 설치되지 않음")
-            print("FFmpeg 자동 설치를 시작합니다...")
-
-            if self.system == 'Darwin':
-                ffmpeg_ok = self._install_ffmpeg_macos()
-            elif self.system == 'Windows':
-                ffmpeg_ok = self._install_ffmpeg_windows()
-            elif self.system == 'Linux':
-                ffmpeg_ok = self._install_ffmpeg_linux()
-
-        # AtomicParsley 확인
-        atomicparsley_ok = False
-        if atomicparsley_system:
-            print("✓ AtomicParsley (시스템): 설치됨")
-            atomicparsley_ok = True
-        elif self._check_local_binary('AtomicParsley'):
-            print("✓ AtomicParsley (로컬): 설치됨")
-            atomicparsley_ok = True
-            # 로컬 바이너리의 quarantine 속성 제거
-            self._remove_quarantine_macos(os.path.join(self.bin_dir, 'AtomicParsley'))
-        else:
-            print("✗ AtomicParsley: 설치되지 않음")
-            print("AtomicParsley 자동 설치를 시작합니다...")
+        # 시스템/로컬 설치 여부 확인, 없는 것은 동시에 받아 설치
+        installed = {}
+        missing = []
+        for name, system_installed in (('ffmpeg', ffmpeg_system), ('AtomicParsley', atomicparsley_system)):
+            label = _LABELS[name]
+            if system_installed:
+                print(f"✓ {label} (시스템): 설치됨{self._version_suffix(name)}")
+                installed[name] = True
+            elif self._check_local_binary(name):
+                print(f"✓ {label} (로컬): 설치됨{self._version_suffix(name)}")
+                installed[name] = True
+                # 로컬 바이너리의 quarantine 속성 제거
+                self._remove_quarantine_macos(os.path.join(self.bin_dir, name))
+            else:
+                print(f"✗ {label}: 설치되지 않음")
+                missing.append(name)
 
-            if self.system == 'Darwin':
-                atomicparsley_ok = self._install_atomicparsley_macos()
-            elif self.system == 'Windows':
-                atomicparsley_ok = self._install_atomicparsley_windows()
-            elif self.system == 'Linux':
-                atomicparsley_ok = self._install_atomicparsley_linux()
+        if missing:
+            print(f"{', '.join(_LABELS[name] for name in missing)} 자동 설치를 시작합니다...")
+            with ThreadPoolExecutor(max_workers=len(missing)) as executor:
+                installed.update(zip(missing, executor.map(self._install, missing)))
+        ffmpeg_ok = installed['ffmpeg']
+        atomicparsley_ok = installed['AtomicParsley']
 
         # PATH 환경변수에 bin 디렉토리 추가
         if ffmpeg_ok or atomicparsley_ok:
@@ -347,6 +230,8 @@ class DependencyChecker:
             if self.bin_dir not in current_path:
                 os.environ['PATH'] = f"{self.bin_dir}{os.pathsep}{current_path}"
                 print(f"\nPATH에 {self.bin_dir} 추가됨")
+            # 새로 설치했거나 PATH가 바뀌었으므로 기억한 경로를 다시 찾도록 함
+            self.probe.reset()
 
         print("\n의존성 확인 완료!\n")
 
@@ -0,0 +1,147 @@
+"""
+다운로드 디스크 공간 예약 (PyQt6 비의존)
+
+동시에 여러 다운로드/병합이 같은 디스크를 쓰면 남은 공간 확인만으로는 부족하므로, 작업마다
+예상 크기를 볼륨별로 예약하고 (남은 공간 - 다른 작업의 예약 - 여유분)이 모자라면 시작을 미룹니다.
+예약은 작업이 받은 만큼 줄어들어, 이미 디스크에 기록된 양을 두 번 세지 않습니다.
+"""
+
+import os
+import errno
+import shutil
+import threading
+from typing import Dict, Hashable, Iterable, Optional, Tuple
+
+# 예약과 별도로 항상 남겨 둘 여유 공간
+DEFAULT_MARGIN = 512 * 1024 * 1024
+
+
+def _existing_dir(path: str) -> str:
+    """path 또는 가장 가까운 존재하는 상위 폴더 (아직 만들지 않은 저장 폴더용)"""
+    path = os.path.abspath(path or '.')
+    while not os.path.exists(path):
+        parent = os.path.dirname(path)
+        if parent == path:
+            break
+        path = parent
+    return path
+
+
+def volume_of(path: str) -> int:
+    """경로가 속한 볼륨(장치) 번호"""
+    return os.stat(_existing_dir(path)).st_dev
+
+
+def free_space(path: str) -> int:
+    """경로가 속한 볼륨의 남은 공간 (바이트)"""
+    return shutil.disk_usage(_existing_dir(path)).free
+
+
+def no_space_error(needed: int, available: int) -> OSError:
+    """공간 부족 예외 (재시도 정책에서 재시도 불가 오류로 분류됨)"""
+    return OSError(errno.ENOSPC, f"No space left on device (필요: {needed // 2 ** 20}MiB, "
+                                 f"사용 가능: {max(0, available) // 2 ** 20}MiB)")
+
+
+class _Reservation:
+    __slots__ = ('volumes', 'temp_volume', 'written')
+
+    def __init__(self, volumes: Dict[int, int], temp_volume: Optional[int]):
+        self.volumes = volumes  # 볼륨 -> 예약 바이트
+        self.temp_volume = temp_volume  # 임시 파일이 기록되는 볼륨
+        self.written = 0  # 이미 받은 바이트 (임시 파일 볼륨의 예약에서 차감)
+
+    def remaining(self, volume: int) -> int:
+        reserved = self.volumes.get(volume, 0)
+        if volume == self.temp_volume:
+            reserved -= self.written
+        return max(0, reserved)
+
+
+class DiskReservations:
+    """작업별 디스크 공간 예약 목록 (스레드 안전)"""
+
+    def __init__(self, margin: int = DEFAULT_MARGIN):
+        """
+        Args:
+            margin: 예약과 별도로 항상 남겨 둘 여유 공간 (바이트)
+        """
+        self.margin = margin
+        self._lock = threading.Lock()
+        self._reservations: Dict[Hashable, _Reservation] = {}
+
+    def try_reserve(self, key: Hashable, needs: Iterable[Tuple[str, int]]) -> bool:
+        """
+        공간이 충분하면 예약 (같은 키로 다시 예약하면 교체)
+
+        Args:
+            key: 작업마다 고유한 키 (템플릿 저장 경로는 작업끼리 겹칠 수 있으므로 쓰지 않음)
+            needs: (경로, 바이트) 목록, 첫 항목은 임시 파일 위치 (같은 볼륨이면 합산)
+
+        Returns:
+            예약했으면 True, 어느 볼륨이든 공간이 모자라면 False
+        """
+        volumes: Dict[int, int] = {}
+        paths: Dict[int, str] = {}
+        temp_volume = None
+        for path, nbytes in needs:
+            volume = volume_of(path)
+            if temp_volume is None:
+                temp_volume = volume
+            volumes[volume] = volumes.get(volume, 0) + max(0, int(nbytes))
+            paths.setdefault(volume, path)
+
+        with self._lock:
+            for volume, nbytes in volumes.items():
+                if self._available(volume, paths[volume], key) < nbytes:
+                    return False
+            self._reservations[key] = _Reservation(volumes, temp_volume)
+            return True
+
+    def has(self, key: Hashable) -> bool:
+        """키로 예약된 공간이 있는지"""
+        with self._lock:
+            return key in self._reservations
+
+    def available(self, path: str, exclude: Optional[Hashable] = None) -> int:
+        """경로의 볼륨에서 새로 예약할 수 있는 공간 (남은 공간 - 다른 예약 - 여유분)"""
+        volume = volume_of(path)
+        with self._lock:
+            return self._available(volume, path, exclude)
+
+    def has_others(self, path: str, exclude: Optional[Hashable] = None) -> bool:
+        """같은 볼륨에 다른 작업의 예약이 있는지 (기다리면 공간이 생길 수 있는지)"""
+        volume = volume_of(path)
+        with self._lock:
+            return any(volume in reservation.volumes
+                       for key, reservation in self._reservations.items() if key != exclude)
+
+    def set_written(self, key: Hashable, nbytes: int):
+        """작업이 지금까지 받은 바이트 (그만큼 예약에서 차감)"""
+        with self._lock:
+            reservation = self._reservations.get(key)
+            if reservation is not None:
+                reservation.written = nbytes
+
+    def release(self, key: Hashable):
+        """예약 해제 (예약이 없으면 무시)"""
+        with self._lock:
+            self._reservations.pop(key, None)
+
+    def _available(self, volume: int, path: str, exclude: Optional[Hashable]) -> int:
+        reserved = sum(reservation.remaining(volume)
+                       for key, reservation in self._reservations.items() if key != exclude)
+        return free_space(path) - reserved - self.margin
+
+
+_shared_reservations: Optional[DiskReservations] = None
+_shared_lock = threading.Lock()
+
+
+def get_disk_reservations() -> DiskReservations:
+    """프로세스 공용 예약 목록 인스턴스"""
+    global _shared_reservations
+    with _shared_lock:
+        if _shared_reservations is None:
+            _shared_reservations = DiskReservations()
+        return _shared_reservations
@@ -0,0 +1,407 @@
+"""
+유튜브 다운로드 엔진 (PyQt6 비의존)
+
+GUI 워커(YoutubeDownloadWorker), CLI 배치 모드, 별도 프로세스 어디서나 같은 코드로
+다운로드를 실행할 수 있도록 시그널 대신 콜백으로 진행 상태를 전달합니다.
+"""
+
+import os
+import time
+import uuid
+import threading
+import contextlib
+from pathlib import Path
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+from bandwidth import TokenBucket, get_bandwidth_shaper
+from disk_space import get_disk_reservations, no_space_error
+from download_presets import (add_postprocess_planner, build_ydl_opts, estimate_download_size,
+                              find_downloaded_file, find_ffmpeg_path)
+from metadata_cache import extract_video_id, get_metadata_cache
+from output_index import content_key, get_output_index, reuse_output
+from postprocess_pool import get_postprocess_pool
+from retry_policy import RetryPolicy
+from ydl_factory import create_youtube_dl
+from ydl_pool import get_ydl_pool
+
+
+# 진행 이벤트 최소 전달 간격 (초) - 조각(fragment)마다 호출되는 후크를 작업당 초당 5회로 제한
+PROGRESS_INTERVAL = 0.2
+
+# 디스크 공간이 부족할 때 다시 확인하는 주기 (초)
+DISK_WAIT_INTERVAL = 5.0
+
+
+def _noop(*_):
+    pass
+
+
+def _format_bytes(num: Optional[float]) -> str:
+    """바이트 수를 사람이 읽기 쉬운 단위로 변환"""
+    if num is None:
+        return 'N/A'
+    for unit in ('B', 'KiB', 'MiB', 'GiB'):
+        if num < 1024 or unit == 'GiB':
+            return f"{num:.1f}{unit}" if unit != 'B' else f"{int(num)}B"
+        num /= 1024
+
+
+def format_progress_event(event: dict) -> str:
+    """진행 이벤트를 진행 상태 텍스트로 변환"""
+    total = event.get('total')
+    downloaded = event.get('downloaded') or 0
+    percent = f"{downloaded / total * 100:.1f}%" if total else _format_bytes(downloaded)
+
+    speed = event.get('speed')
+    speed_str = f"{_format_bytes(speed)}/s" if speed else 'N/A'
+
+    eta = event.get('eta')
+    eta_str = f"{int(eta) // 60:02d}:{int(eta) % 60:02d}" if eta is not None else 'N/A'
+
+    return f"다운로드 중: {percent} (속도: {speed_str}, ETA: {eta_str})"
+
+
+class DownloadCancelled(Exception):
+    """사용자가 다운로드를 취소함"""
+
+
+class DownloadEngine:
+    """단일 URL 다운로드를 실행하는 엔진"""
+
+    def __init__(self, url: str, output_path: str, download_type: str = 'audio',
+                 info: Optional[dict] = None, ffmpeg_location: Optional[str] = None,
+                 connections: int = 1, parallel_formats: bool = True, temp_dir: Optional[str] = None,
+                 on_progress: Callable[[str], None] = None,
+                 on_title: Callable[[str], None] = None,
+                 on_file_path: Callable[[str], None] = None,
+                 on_progress_event: Callable[[dict], None] = None,
+                 on_network_done: Callable[[], None] = None,
+                 on_retry: Callable[[dict], None] = None,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 reservation_key: Optional[Hashable] = None, reserve_disk: bool = True):
+        """
+        Args:
+            url: 유튜브 URL
+            output_path: 저장 경로 (확장자는 yt-dlp가 결정)
+            download_type: 'audio' (M4A), 'video_best' (최고화질 비디오), 'video_720p', 'video_480p'
+            info: 이미 추출된 영상 정보 (extract_info(process=False) 결과, 없으면 엔진에서 추출)
+            ffmpeg_location: FFmpeg 경로 (None이면 자동 검색)
+            connections: 포맷당 동시 연결 수 (2 이상이면 Range 구간 다운로드, 1이면 단일 연결)
+            parallel_formats: 비디오+오디오 포맷을 동시에 받은 뒤 병합 (진행률은 두 포맷 합계)
+            temp_dir: 임시/중간 파일을 둘 폴더 (None이면 저장 폴더)
+            on_progress: 진행 상태 텍스트 콜백
+            on_title: 영상 제목 확인 콜백
+            on_file_path: 실제 다운로드된 파일 경로 콜백
+            on_progress_event: 다운로드 진행 이벤트 콜백
+                ({'downloaded', 'total', 'speed', 'eta'} 숫자와 임시 파일 경로 'tmpfilename',
+                PROGRESS_INTERVAL 간격으로 제한).
+                없으면 같은 간격으로 on_progress에 텍스트로 전달
+            on_network_done: 전송이 모두 끝나고 후처리 슬롯을 기다리기 직전에 한 번 호출
+                (다운로드 스케줄러 슬롯을 일찍 반납하는 용도)
+            on_retry: 실패 후 재시도 대기 직전에 호출
+                ({'attempt', 'delay', 'kind'(ErrorKind 값), 'message'})
+            retry_policy: 재시도 정책 (None이면 기본 RetryPolicy)
+            reservation_key: 디스크 공간 예약 키 (None이면 엔진마다 새 키)
+                저장 경로가 템플릿이면 여러 작업이 같은 경로를 쓰므로 경로 대신 작업마다 고유한 키를 사용하며,
+                GUI는 작업 ID를 넘겨 시작 전에 예약한 공간을 그대로 이어받습니다.
+            reserve_disk: False면 엔진에서 디스크 공간을 예약/대기하지 않음
+                (별도 프로세스에서 실행되어 호출한 쪽이 이미 예약을 관리하는 경우)
+        """
+        self.url = url
+        self.output_path = output_path
+        self.download_type = download_type
+        self.info = info
+        self.ffmpeg_location = ffmpeg_location
+        self.connections = connections
+        self.parallel_formats = parallel_formats
+        self.temp_dir = temp_dir
+        self.on_progress = on_progress or _noop
+        self.on_title = on_title or _noop
+        self.on_file_path = on_file_path or _noop
+        self.on_progress_event = on_progress_event
+        self.on_network_done = on_network_done or _noop
+        self.on_retry = on_retry or _noop
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.reservation_key = reservation_key if reservation_key is not None else uuid.uuid4().hex
+        self.reserve_disk = reserve_disk
+
+        # 실행 결과
+        self.title: Optional[str] = None
+        self.downloaded_file: Optional[str] = None
+        self.last_error: Optional[BaseException] = None
+
+        self._is_cancelled = False
+        self._last_progress_time = 0.0
+
+        # 포맷별 진행 상황 (파일명 -> 후크 딕셔너리), 포맷을 동시에 받으면 여러 스레드에서 갱신
+        self._progress_lock = threading.Lock()
+        self._streams: Dict[str, dict] = {}
+
+        # 작업당 속도 제한 버킷 (전체 제한은 공용 대역폭 제한기가 적용)
+        self._job_bucket = TokenBucket()
+
+    def cancel(self):
+        """다운로드 취소 (다음 진행 후크 호출 시 중단)"""
+        self._is_cancelled = True
+
+    @property
+    def cancelled(self) -> bool:
+        return self._is_cancelled
+
+    def run(self) -> Tuple[bool, str]:
+        """
+        다운로드 실행 (예외를 던지지 않음)
+
+        일시적 오류나 서버 속도 제한으로 실패하면 retry_policy에 따라 대기 후 다시 실행하며,
+        다시 실행할 때는 남아 있는 .part 파일(또는 구간 기록)에서 이어받습니다.
+
+        Returns:
+            (성공여부, 메시지)
+        """
+        attempt = 0
+        try:
+            while True:
+                self.last_error = None
+                success, message = self._run_once()
+                if success or self._is_cancelled or self.last_error is None:
+                    return success, message
+
+                decision = self.retry_policy.next_delay(self.last_error, attempt)
+                if decision is None:
+                    return success, message
+                kind, delay = decision
+                attempt += 1
+
+                self.on_retry({'attempt': attempt, 'delay': delay, 'kind': kind.value, 'message': message})
+                deadline = time.monotonic() + delay
+                while time.monotonic() < deadline:
+                    if self._is_cancelled:
+                        return False, "취소됨"
+                    remaining = deadline - time.monotonic()
+                    self.on_progress(f"재시도 대기 중 ({attempt}/{self.retry_policy.max_retries}, "
+                                     f"{int(remaining) + 1}초): {message}")
+                    time.sleep(min(1.0, max(0.0, remaining)))
+                self.on_progress(f"재시도 중 ({attempt}/{self.retry_policy.max_retries})...")
+        finally:
+            # 디스크 공간 예약 해제 (실패/취소 포함)
+            get_disk_reservations().release(self.reservation_key)
+
+    def _run_once(self) -> Tuple[bool, str]:
+        """다운로드 한 번 실행 (실패 원인 예외는 last_error에 기록)"""
+        reused_info = False
+        with self._progress_lock:
+            self._streams.clear()
+        try:
+            # 저장 폴더 생성
+            Path(self.output_path).parent.mkdir(parents=True, exist_ok=True)
+
+            # 파일명에서 확장자 제거 (yt-dlp가 자동으로 추가)
+            base_path = os.path.splitext(self.output_path)[0]
+
+            # 이미 받은 영상이면 기존 파일 재사용 (URL로 영상 ID를 알 수 있는 경우, 네트워크 없이 확인)
+            key = content_key(self.url)
+            if self._reuse_existing_output(key):
+                return True, f"이미 받은 파일 사용: {os.path.basename(self.downloaded_file)}"
+
+            # FFmpeg 경로 찾기
+            ffmpeg_location = self.ffmpeg_location or find_ffmpeg_path()
+            if not ffmpeg_location:
+                return False, "FFmpeg를 찾을 수 없습니다. FFmpeg를 설치해주세요."
+
+            # 다운로드 타입에 따른 옵션 설정
+            ydl_opts = build_ydl_opts(self.download_type, base_path, ffmpeg_location,
+                                      progress_hooks=[self._progress_hook], temp_dir=self.temp_dir)
+
+            # 같은 옵션으로 끝난 작업의 YoutubeDL을 재사용 (연결/쿠키/추출기 유지)
+            with get_ydl_pool().borrow(ydl_opts, self._create_youtube_dl,
+                                       key_extra=(self.download_type, self.connections, self.parallel_formats),
+                                       postprocess_slot=self._postprocess_slot,
+                                       throttle=self._throttle) as ydl:
+                # 취소 확인
+                if self._is_cancelled:
+                    return False, "취소됨"
+
+                # 영상 정보 가져오기 (큐에서 전달받은 정보 → 디스크 캐시 → 네트워크 순)
+                cache = get_metadata_cache()
+                video_id = extract_video_id(self.url)
+                info = self.info
+                if info is None and cache:
+                    info = cache.get(video_id)
+                if info is None:
+                    self.on_progress("정보 수집 중...")
+                    info = ydl.sanitize_info(ydl.extract_info(self.url, download=False, process=False))
+                    if cache:
+                        cache.put(video_id, info)
+                else:
+                    reused_info = True
+                video_title = info.get('title') or 'Unknown'
+                duration = info.get('duration') or 0
+
+                # URL만으로 영상을 구분할 수 없었던 경우 추출된 ID로 다시 확인
+                if key is None:
+                    key = content_key(self.url, info)
+                    if self._reuse_existing_output(key, video_title):
+                        return True, f"이미 받은 파일 사용: {os.path.basename(self.downloaded_file)}"
+
+                # 예상 크기만큼 디스크 공간 예약 (부족하면 다른 작업이 끝날 때까지 대기)
+                if self.reserve_disk:
+                    self._reserve_disk_space(info)
+
+                # 제목 콜백
+                if info.get('title'):
+                    self.title = video_title
+                    self.on_title(video_title)
+
+                # 취소 확인
+                if self._is_cancelled:
+                    return False, "취소됨"
+
+                # 다운로드 시작
+                self.on_progress(f"다운로드 시작... ({duration // 60}분 {duration % 60}초)")
+
+                # 다운로드 실행 및 결과 받기 (추출된 정보로 바로 처리, 재추출 없음)
+                result = ydl.process_ie_result(info, download=True)
+                if not info.get('title'):
+                    video_title = result.get('title') or video_title
+                    self.title = video_title
+                    self.on_title(video_title)
+
+                # 취소 확인
+                if self._is_cancelled:
+                    return False, "취소됨"
+
+                # 실제 다운로드된 파일 경로 찾기
+                self.downloaded_file = find_downloaded_file(ydl, result, self.download_type)
+                if self.downloaded_file:
+                    self.on_file_path(self.downloaded_file)
+
+                    # 다음에 같은 영상을 요청하면 재사용하도록 기록
+                    index = get_output_index()
+                    if index:
+                        index.record(key or content_key(self.url, result), self.download_type,
+                                     self.downloaded_file)
+
+                self.on_progress("완료!")
+                return True, f"다운로드 완료: {video_title}"
+
+        except Exception as e:
+            if self._is_cancelled:
+                return False, "취소됨"
+            self.last_error = e
+
+            # 재사용한 정보가 만료되었을 수 있으므로 캐시 무효화 (다음 시도는 새로 추출)
+            if reused_info:
+                self.info = None
+                cache = get_metadata_cache()
+                if cache:
+                    cache.invalidate(extract_video_id(self.url))
+            self.on_progress(f"오류: {str(e)}")
+            return False, f"오류: {str(e)}"
+
+    def _reserve_disk_space(self, info: dict):
+        """
+        예상 크기를 임시 폴더와 저장 폴더에 예약 (병합/변환 중에는 원본과 결과가 함께 있으므로 양쪽 모두)
+
+        공간이 모자라면 다른 작업이 끝나 공간이 생길 때까지 기다리고, 기다려도 소용없으면
+        (같은 디스크를 쓰는 다른 작업이 없으면) 공간 부족 오류를 던집니다.
+        """
+        estimate = estimate_download_size(info, self.download_type)
+        if not estimate:
+            return
+
+        save_dir = os.path.dirname(self.output_path) or '.'
+        needs = [(self.temp_dir or save_dir, estimate), (save_dir, estimate)]
+        reservations = get_disk_reservations()
+        while not reservations.try_reserve(self.reservation_key, needs):
+            waiting_for = [path for path, _ in needs if reservations.has_others(path, exclude=self.reservation_key)]
+            if not waiting_for:
+                available = min(reservations.available(path) for path, _ in needs)
+                raise no_space_error(estimate * 2 if self.temp_dir is None else estimate, available)
+            self.on_progress(f"디스크 공간 부족 - 다른 작업이 끝날 때까지 대기 중 (필요: {_format_bytes(estimate)})")
+            deadline = time.monotonic() + DISK_WAIT_INTERVAL
+            while time.monotonic() < deadline:
+                if self._is_cancelled:
+                    raise DownloadCancelled("Download cancelled by user")
+                time.sleep(0.25)
+
+    def _create_youtube_dl(self, ydl_opts: dict):
+        """풀에 없을 때 새 YoutubeDL 생성 (작업별 설정은 풀이 빌려줄 때마다 교체)"""
+        ydl = create_youtube_dl(ydl_opts, self.connections, self.parallel_formats,
+                                postprocess_slot=self._postprocess_slot, throttle=self._throttle)
+        # 원본 오디오 코덱에 따라 병합/추출 시 스트림 복사 또는 AAC 변환
+        add_postprocess_planner(ydl, self.download_type)
+        return ydl
+
+    def _reuse_existing_output(self, key: Optional[str], title: Optional[str] = None) -> bool:
+        """같은 영상/형식의 완료된 파일이 있으면 저장 경로에 링크(또는 복사)하고 True"""
+        index = get_output_index()
+        existing = index.lookup(key, self.download_type) if index else None
+        if not existing:
+            return False
+
+        # 저장 경로가 yt-dlp 템플릿이면 기존 파일명 그대로, 아니면 지정한 파일명에 기존 확장자
+        base_path = os.path.splitext(self.output_path)[0]
+        if '%(' in base_path:
+            target = os.path.join(os.path.dirname(base_path), os.path.basename(existing))
+        else:
+            target = base_path + os.path.splitext(existing)[1]
+
+        self.downloaded_file = reuse_output(existing, target)
+        self.title = title or os.path.splitext(os.path.basename(existing))[0]
+        self.on_title(self.title)
+        self.on_file_path(self.downloaded_file)
+        self.on_progress("완료! (이미 받은 파일 사용)")
+        return True
+
+    def _throttle(self, nbytes: int):
+        """받은 바이트를 공용 대역폭 제한기에 반영하고 제한을 넘었으면 대기"""
+        get_bandwidth_shaper().throttle(nbytes, self._job_bucket, cancelled=lambda: self._is_cancelled)
+        if self._is_cancelled:
+            raise DownloadCancelled("Download cancelled by user")
+
+    @contextlib.contextmanager
+    def _postprocess_slot(self):
+        """전송 완료 알림 후 공용 후처리 풀의 슬롯을 받아 후처리 실행"""
+        self.on_network_done()
+        pool = get_postprocess_pool()
+        with pool.slot(on_wait=lambda: self.on_progress("후처리 대기 중..."),
+                       cancelled=lambda: self._is_cancelled):
+            self.on_progress("후처리 중...")
+            yield
+
+    def _progress_hook(self, d):
+        """yt-dlp 진행 상태 후크 (비디오+오디오는 두 포맷의 합계로 보고)"""
+        if self._is_cancelled:
+            raise DownloadCancelled("Download cancelled by user")
+
+        with self._progress_lock:
+            self._streams[d.get('filename') or ''] = d
+            streams = list(self._streams.values())
+
+            if d['status'] == 'downloading':
+                downloaded = sum(s.get('downloaded_bytes') or 0 for s in streams)
+                total = sum(s.get('total_bytes') or s.get('total_bytes_estimate') or 0 for s in streams) or None
+                speed = sum(s.get('speed') or 0 for s in streams if s['status'] == 'downloading') or None
+
+                # 전달 간격 제한 (마지막 조각은 항상 전달)
+                now = time.monotonic()
+                if now - self._last_progress_time < PROGRESS_INTERVAL and not (total and downloaded >= total):
+                    return
+                self._last_progress_time = now
+
+            # 받은 만큼은 이미 디스크에 있으므로 예약에서 차감
+            if d['status'] == 'downloading':
+                get_disk_reservations().set_written(self.reservation_key, downloaded)
+
+        if d['status'] == 'downloading':
+            event = {
+                'downloaded': downloaded,
+                'total': total,
+                'speed': speed,
+                'eta': (total - downloaded) / speed if total and speed else d.get('eta'),
+                'tmpfilename': d.get('tmpfilename'),
+            }
+            if self.on_progress_event is not None:
+                self.on_progress_event(event)
+            else:
+                self.on_progress(format_progress_event(event))
@@ -0,0 +1,302 @@
+"""
+다운로드 형식별 yt-dlp 옵션 및 공용 유틸리티 (PyQt6 비의존)
+"""
+
+import os
+import re
+import sys
+import unicodedata
+from typing import Callable, List, Optional
+
+from binary_probe import app_bin_dir, get_binary_probe
+
+# 지원하는 다운로드 타입
+DOWNLOAD_TYPES = ('audio', 'video_best', 'video_720p', 'video_480p')
+
+# 비디오 프리셋별 포맷 및 오디오 비트레이트
+_VIDEO_PRESETS = {
+    # 최고 화질 비디오 + 최고 음질 오디오
+    'video_best': ('bestvideo[ext=mp4]+bestaudio/best[ext=mp4]/best', '320k'),
+    # 720p 비디오 + 최고 음질 오디오
+    'video_720p': ('bestvideo[height<=720][ext=mp4]+bestaudio/best[height<=720][ext=mp4]/best', '256k'),
+    # 480p 비디오 + 고음질 오디오
+    'video_480p': ('bestvideo[height<=480][ext=mp4]+bestaudio/best[height<=480][ext=mp4]/best', '192k'),
+}
+
+# MP4/M4A 컨테이너에 그대로(스트림 복사) 넣을 수 있는 오디오 코덱 (그 외는 AAC로 변환)
+_MP4_COPY_AUDIO_CODECS = ('mp4a', 'aac')
+
+
+def find_ffmpeg_path():
+    """
+    FFmpeg 경로 찾기 (앱 번들 bin 디렉토리, 시스템 PATH, Homebrew 순)
+
+    탐색 결과와 quarantine 처리 여부를 기억하므로 작업마다 호출해도 하위 프로세스를 실행하지 않습니다.
+    """
+    probe = get_binary_probe()
+    ffmpeg_path = probe.find('ffmpeg')
+    if ffmpeg_path and getattr(sys, 'frozen', False) and os.path.dirname(ffmpeg_path) == app_bin_dir():
+        # 앱 번들에 포함된 바이너리는 macOS에서 quarantine 속성 제거 (AtomicParsley도 같은 폴더)
+        probe.clear_quarantine(ffmpeg_path)
+        atomicparsley_path = os.path.join(app_bin_dir(), 'AtomicParsley')
+        if os.path.exists(atomicparsley_path):
+            probe.clear_quarantine(atomicparsley_path)
+    return ffmpeg_path
+
+
+def get_extension(download_type: str) -> str:
+    """다운로드 타입에 따른 확장자 반환"""
+    if download_type == 'audio':
+        return '.m4a'
+    return '.mp4'
+
+
+def sanitize_filename(name: str) -> str:
+    """파일명을 안전하게 정제"""
+    name = (name or "download").strip()
+
+    # 이모지 및 비ASCII 특수문자 제거 (한글, 일본어, 중국어는 유지)
+    # Unicode 범위: 이모지 제거, 한중일 문자 유지
+    cleaned_name = ""
+    for char in name:
+        # 이모지 및 기타 심볼 제거
+        if unicodedata.category(char).startswith('So'):  # Symbol, Other
+            continue
+        # 이모지 modifier 제거
+        if '\U0001F000' <= char <= '\U0001FFFF':  # Emoji 범위
+            continue
+        cleaned_name += char
+
+    name = cleaned_name.strip()
+
+    # 경로 구분자 및 상위 디렉토리 참조 제거
+    name = name.replace(os.sep, "_").replace("/", "_").replace("\\", "_")
+    name = re.sub(r'\.\.+', '_', name)
+
+    # 파일명에 허용되지 않는 문자 제거 (Windows 호환)
+    name = re.sub(r'[<>:"|?*]', '_', name)
+
+    # 연속된 공백을 하나로
+    name = re.sub(r'\s+', ' ', name)
+
+    # 파일명 길이 제한 (너무 긴 경우 잘라냄)
+    if len(name) > 200:
+        name = name[:200]
+
+    return name.strip() or "download"
+
+
+def build_ydl_opts(download_type: str, base_path: str, ffmpeg_location: str,
+                   progress_hooks: Optional[List[Callable]] = None,
+                   temp_dir: Optional[str] = None) -> dict:
+    """
+    다운로드 타입에 맞는 yt-dlp 옵션 생성
+
+    Args:
+        download_type: 'audio' (M4A), 'video_best', 'video_720p', 'video_480p'
+        base_path: 확장자를 제외한 출력 경로 (yt-dlp 템플릿 사용 가능)
+        ffmpeg_location: FFmpeg 실행 파일 경로
+        progress_hooks: yt-dlp 진행 상태 후크 목록
+        temp_dir: 임시/중간 파일(.part, 병합 전 포맷, 썸네일)을 둘 폴더
+            (None이면 저장 폴더, 완료된 결과만 저장 폴더로 옮겨짐)
+    """
+    opts = _preset_ydl_opts(download_type, base_path, ffmpeg_location, list(progress_hooks or []))
+    if temp_dir:
+        # yt-dlp는 outtmpl이 상대 경로일 때만 paths의 home/temp를 적용
+        opts['paths'] = {'home': os.path.dirname(base_path) or '.', 'temp': temp_dir}
+        opts['outtmpl'] = os.path.basename(base_path) + '.%(ext)s'
+    return opts
+
+
+def _preset_ydl_opts(download_type: str, base_path: str, ffmpeg_location: str,
+                     progress_hooks: List[Callable]) -> dict:
+    """다운로드 타입별 기본 yt-dlp 옵션"""
+    if download_type == 'audio':
+        return {
+            # 최고 음질 오디오 선택 (유튜브의 경우 일반적으로 Opus ~160kbps 또는 AAC ~256kbps)
+            'format': 'bestaudio/best',
+            'outtmpl': base_path + '.%(ext)s',
+            'noplaylist': True,  # 플레이리스트 무시, 단일 비디오만
+            'writethumbnail': True,  # 썸네일 다운로드
+            'ffmpeg_location': ffmpeg_location,  # FFmpeg 경로 명시
+            'postprocessors': [
+                {
+                    'key': 'FFmpegExtractAudio',
+                    'preferredcodec': 'm4a',
+                    'preferredquality': '320',  # 320kbps로 변환 (원본이 더 낮으면 원본 유지)
+                },
+                {
+                    'key': 'EmbedThumbnail',  # 썸네일을 앨범 아트로 임베드
+                },
+            ],
+            # 변환 시 오디오 품질 옵션 (원본이 AAC면 add_postprocess_planner가 스트림 복사로 바꿈)
+            'postprocessor_args': _transcode_args(download_type),
+            'prefer_ffmpeg': True,
+            'keepvideo': False,
+            'quiet': True,
+            'no_warnings': True,
+            'progress_hooks': progress_hooks,
+        }
+
+    if download_type in _VIDEO_PRESETS:
+        video_format, _ = _VIDEO_PRESETS[download_type]
+        return {
+            'format': video_format,
+            'outtmpl': base_path + '.%(ext)s',
+            'noplaylist': True,  # 플레이리스트 무시
+            'writethumbnail': True,  # 썸네일 다운로드
+            'ffmpeg_location': ffmpeg_location,  # FFmpeg 경로 명시
+            'merge_output_format': 'mp4',
+            'postprocessors': [
+                {
+                    'key': 'EmbedThumbnail',  # 썸네일을 비디오에 임베드
+                },
+            ],
+            # 병합 시 오디오 변환 옵션 (원본이 AAC면 add_postprocess_planner가 스트림 복사로 바꿈)
+            'postprocessor_args': _transcode_args(download_type),
+            'quiet': True,
+            'no_warnings': True,
+            'progress_hooks': progress_hooks,
+        }
+
+    return {
+        'format': 'best[ext=mp4]/best',
+        'outtmpl': base_path + '.%(ext)s',
+        'ffmpeg_location': ffmpeg_location,  # FFmpeg 경로 명시
+        'quiet': True,
+        'no_warnings': True,
+        'progress_hooks': progress_hooks,
+    }
+
+
+def estimate_download_size(info: dict, download_type: str) -> Optional[int]:
+    """
+    추출된 정보(filesize/filesize_approx, 없으면 비트레이트x길이)로 받을 크기 추정
+
+    포맷 선택 전 정보(process=False)에서도 동작하며, 프리셋이 고를 수 있는 포맷 중
+    가장 큰 것을 기준으로 하므로 실제보다 크게 추정합니다. 추정할 수 없으면 None.
+    """
+    duration = info.get('duration') or 0
+
+    def size_of(f: dict) -> Optional[int]:
+        size = f.get('filesize') or f.get('filesize_approx')
+        if not size and f.get('tbr') and duration:
+            size = f['tbr'] * 125 * duration  # kbit/s -> 바이트
+        return int(size) if size else None
+
+    formats = info.get('formats') or []
+    if not formats:
+        return size_of(info)
+
+    def largest(candidates) -> Optional[int]:
+        sizes = [s for s in map(size_of, candidates) if s]
+        return max(sizes) if sizes else None
+
+    audio_only = [f for f in formats if f.get('vcodec') == 'none' and f.get('acodec') not in (None, 'none')]
+    if download_type == 'audio':
+        return largest(audio_only) or largest(formats)
+
+    height = None
+    if download_type in _VIDEO_PRESETS:
+        match = re.search(r'height<=(\d+)', _VIDEO_PRESETS[download_type][0])
+        height = int(match.group(1)) if match else None
+    fits = [f for f in formats if not height or (f.get('height') or 0) <= height]
+    video_only = [f for f in fits if f.get('vcodec') not in (None, 'none') and f.get('acodec') == 'none']
+
+    video = largest(video_only)
+    if video:
+        return video + (largest(audio_only) or 0)
+    return largest(fits) or largest(formats)
+
+
+def _transcode_args(download_type: str) -> dict:
+    """오디오를 AAC로 변환할 때의 후처리 인자 (후처리기 이름별)"""
+    if download_type == 'audio':
+        return {'extractaudio': ['-ar', '48000']}  # 샘플링 레이트 48kHz (고음질)
+    if download_type in _VIDEO_PRESETS:
+        _, audio_bitrate = _VIDEO_PRESETS[download_type]
+        return {'merger': [
+            '-c:a', 'aac',  # AAC 오디오 코덱
+            '-b:a', audio_bitrate,  # 프리셋별 오디오 비트레이트
+            '-ar', '48000',  # 샘플링 레이트 48kHz
+        ]}
+    return {}
+
+
+def _audio_codec(info: dict) -> str:
+    """선택된 포맷의 오디오 코덱 (알 수 없으면 빈 문자열)"""
+    for f in info.get('requested_formats') or [info]:
+        acodec = (f.get('acodec') or '').lower()
+        if acodec and acodec != 'none':
+            return acodec
+    return ''
+
+
+def plan_postprocessor_args(download_type: str, info: dict) -> dict:
+    """
+    선택된 포맷을 보고 후처리 인자 결정
+
+    원본 오디오가 AAC라 MP4/M4A에 그대로 넣을 수 있으면 빈 딕셔너리(스트림 복사, 재인코딩 없음)를,
+    그 외(Opus 등, 또는 코덱을 알 수 없으면) AAC 변환 인자를 반환합니다.
+    병합 없이 받은 단일 비디오 포맷은 변환할 단계가 없으므로 항상 빈 딕셔너리입니다.
+    """
+    if _audio_codec(info).startswith(_MP4_COPY_AUDIO_CODECS):
+        return {}
+    if download_type in _VIDEO_PRESETS and not info.get('requested_formats'):
+        return {}
+    return _transcode_args(download_type)
+
+
+_planner_class = None
+
+
+def add_postprocess_planner(ydl, download_type: str):
+    """포맷 선택 후 다운로드 전에 후처리 인자를 정하는 후처리기를 YoutubeDL에 등록"""
+    global _planner_class
+    if _planner_class is None:
+        from yt_dlp.postprocessor.common import PostProcessor
+
+        class PostprocessPlannerPP(PostProcessor):
+            """선택된 포맷의 코덱에 맞춰 postprocessor_args 설정 (스트림 복사 또는 AAC 변환)"""
+
+            def __init__(self, downloader, download_type):
+                super().__init__(downloader)
+                self.download_type = download_type
+
+            def run(self, info):
+                args = plan_postprocessor_args(self.download_type, info)
+                self._downloader.params['postprocessor_args'] = args
+                self.write_debug(f'Audio {"transcode" if args else "stream copy"} '
+                                 f'(acodec={_audio_codec(info) or "unknown"})')
+                return [], info
+
+        _planner_class = PostprocessPlannerPP
+
+    ydl.add_post_processor(_planner_class(ydl, download_type), when='before_dl')
+
+
+def find_downloaded_file(ydl, result: dict, download_type: str) -> Optional[str]:
+    """yt-dlp 처리 결과에서 실제 다운로드된 파일 경로 찾기 (없으면 None)"""
+    downloaded_file = ydl.prepare_filename(result)
+
+    # 오디오 전용인 경우 확장자가 변경됨
+    if download_type == 'audio':
+        # m4a 확장자로 변경
+        downloaded_file = os.path.splitext(downloaded_file)[0] + '.m4a'
+
+    # 실제 파일이 존재하는지 확인
+    if os.path.exists(downloaded_file):
+        return downloaded_file
+
+    # 파일을 찾을 수 없으면 디렉토리에서 검색
+    base_dir = os.path.dirname(downloaded_file)
+    base_name = os.path.splitext(os.path.basename(downloaded_file))[0]
+    ext = get_extension(download_type)
+
+    # 디렉토리에서 유사한 파일 찾기
+    if os.path.exists(base_dir):
+        for file in os.listdir(base_dir):
+            if file.endswith(ext) and base_name[:30] in file:
+                return os.path.join(base_dir, file)
+
+    return None
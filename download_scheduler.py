@@ -0,0 +1,190 @@
+"""
+동시 다운로드 수를 제한하는 다운로드 스케줄러 (Qt 비의존)
+"""
+
+import heapq
+import itertools
+import threading
+import urllib.parse
+from typing import Callable, Dict, Hashable, List, Optional, Set
+
+
+# 같은 서비스의 다른 도메인 (짧은 주소 등) -> 대표 호스트
+HOST_ALIASES = {
+    'youtu.be': 'youtube.com',
+    'music.youtube.com': 'youtube.com',
+    'youtube-nocookie.com': 'youtube.com',
+}
+
+
+def host_of(url: str) -> str:
+    """URL에서 호스트 키 추출 (www., m. 접두어와 HOST_ALIASES의 도메인은 같은 호스트로 취급)"""
+    netloc = urllib.parse.urlparse(url).netloc.lower()
+    netloc = netloc.rsplit('@', 1)[-1].split(':', 1)[0]
+    for prefix in ('www.', 'm.'):
+        if netloc.startswith(prefix):
+            netloc = netloc[len(prefix):]
+            break
+    return HOST_ALIASES.get(netloc, netloc)
+
+
+class DownloadScheduler:
+    """
+    전역 동시 실행 수와 호스트별 동시 실행 수를 제한하는 우선순위 큐
+
+    작업은 (우선순위 내림차순, 등록 순서) 순으로 시작되며, 실행 중인 작업이
+    finish()/remove()로 슬롯을 반납하면 다음 대기 작업이 자동으로 시작됩니다.
+    실제 다운로드 시작은 생성자에 전달한 start_callback(key)이 담당합니다.
+    admit(key)가 False를 반환한 작업(예: 디스크 공간 부족)은 대기열에 남겨 두고
+    다음 작업을 먼저 시작합니다. 거절된 작업은 실행 중인 작업이 슬롯을 반납하거나
+    pump()를 호출할 때까지 admit을 다시 묻지 않습니다.
+    """
+
+    def __init__(self, start_callback: Callable[[Hashable], None],
+                 max_concurrent: int = 3, per_host_limit: Optional[int] = None,
+                 admit: Optional[Callable[[Hashable], bool]] = None):
+        """
+        Args:
+            start_callback: 작업을 시작할 때 호출되는 함수 (인자: 작업 키)
+            max_concurrent: 전역 최대 동시 다운로드 수
+            per_host_limit: 호스트별 최대 동시 다운로드 수 (None이면 제한 없음)
+            admit: 시작 직전에 호출, False면 보류 (락 안에서 호출되므로 가벼워야 함)
+        """
+        self._start_callback = start_callback
+        self._admit = admit
+        self._max_concurrent = max(1, int(max_concurrent))
+        self._per_host_limit = per_host_limit
+        self._lock = threading.RLock()
+        self._heap: List[list] = []  # [-priority, seq, key, host] (key가 None이면 삭제된 항목)
+        self._entries: Dict[Hashable, list] = {}  # 대기 중인 작업 키 -> 힙 항목
+        self._running: Dict[Hashable, str] = {}  # 실행 중인 작업 키 -> 호스트
+        self._host_counts: Dict[str, int] = {}
+        self._refused: Set[Hashable] = set()  # admit이 거절한 대기 작업 (슬롯 반납/pump() 전까지 다시 묻지 않음)
+        self._seq = itertools.count()
+
+    # ── 설정 ──
+    @property
+    def max_concurrent(self) -> int:
+        return self._max_concurrent
+
+    @max_concurrent.setter
+    def max_concurrent(self, value: int):
+        with self._lock:
+            self._max_concurrent = max(1, int(value))
+        self._pump()
+
+    @property
+    def per_host_limit(self) -> Optional[int]:
+        return self._per_host_limit
+
+    @per_host_limit.setter
+    def per_host_limit(self, value: Optional[int]):
+        with self._lock:
+            self._per_host_limit = value if value is None else max(1, int(value))
+        self._pump()
+
+    # ── 상태 조회 ──
+    def is_queued(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def is_running(self, key: Hashable) -> bool:
+        return key in self._running
+
+    @property
+    def queued_count(self) -> int:
+        return len(self._entries)
+
+    @property
+    def running_count(self) -> int:
+        return len(self._running)
+
+    # ── 작업 관리 ──
+    def enqueue(self, key: Hashable, url: str, priority: int = 0) -> bool:
+        """
+        작업을 대기열에 추가
+
+        Returns:
+            추가되었으면 True, 이미 대기 중이거나 실행 중이면 False
+        """
+        with self._lock:
+            if key in self._entries or key in self._running:
+                return False
+            entry = [-priority, next(self._seq), key, host_of(url)]
+            self._entries[key] = entry
+            heapq.heappush(self._heap, entry)
+        self._pump()
+        return True
+
+    def finish(self, key: Hashable):
+        """실행 중인 작업의 슬롯 반납 (완료/실패/취소 공통)"""
+        with self._lock:
+            self._release(key)
+        self._pump()
+
+    def remove(self, key: Hashable):
+        """대기 중이거나 실행 중인 작업을 스케줄러에서 제거"""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                entry[2] = None  # 힙에서는 지연 삭제
+            self._refused.discard(key)
+            self._release(key)
+        self._pump()
+
+    def pump(self):
+        """보류된 작업을 다시 확인하여 시작할 수 있으면 시작 (admit이 거절한 작업도 다시 확인)"""
+        with self._lock:
+            self._refused.clear()
+        self._pump()
+
+    def clear(self):
+        """대기 중인 작업을 모두 제거 (실행 중인 작업은 유지)"""
+        with self._lock:
+            self._heap = []
+            self._entries = {}
+            self._refused.clear()
+
+    # ── 내부 ──
+    def _release(self, key: Hashable):
+        host = self._running.pop(key, None)
+        if host is None:
+            return
+        self._refused.clear()  # 반납된 자원(디스크 예약 등)으로 시작할 수 있을지 다시 확인
+        remaining = self._host_counts.get(host, 0) - 1
+        if remaining > 0:
+            self._host_counts[host] = remaining
+        else:
+            self._host_counts.pop(host, None)
+
+    def _host_available(self, host: str) -> bool:
+        if self._per_host_limit is None:
+            return True
+        return self._host_counts.get(host, 0) < self._per_host_limit
+
+    def _pump(self):
+        """빈 슬롯만큼 대기 작업 시작"""
+        to_start = []
+        with self._lock:
+            blocked = []
+            while self._heap and len(self._running) < self._max_concurrent:
+                entry = heapq.heappop(self._heap)
+                key, host = entry[2], entry[3]
+                if key is None:
+                    continue
+                if not self._host_available(host) or key in self._refused:
+                    blocked.append(entry)
+                    continue
+                if self._admit and not self._admit(key):
+                    self._refused.add(key)
+                    blocked.append(entry)
+                    continue
+                del self._entries[key]
+                self._running[key] = host
+                self._host_counts[host] = self._host_counts.get(host, 0) + 1
+                to_start.append(key)
+            for entry in blocked:
+                heapq.heappush(self._heap, entry)
+
+        # 콜백은 락 밖에서 호출 (콜백 안에서 finish()를 불러도 안전)
+        for key in to_start:
+            self._start_callback(key)
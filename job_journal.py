@@ -0,0 +1,117 @@
+"""
+다운로드 큐 작업 저널 (SQLite WAL, PyQt6 비의존)
+
+큐에 있는 작업(완료된 작업 제외)을 상태가 바뀔 때마다 기록해 두어, 앱이 종료되거나
+비정상 종료된 뒤 다시 실행했을 때 작업 목록을 복원합니다. 중단된 다운로드는 같은 저장
+경로로 다시 시작하므로 yt-dlp가 남아 있는 .part 파일에서 이어받습니다.
+"""
+
+import os
+import time
+import contextlib
+import sqlite3
+import threading
+from typing import Iterable, List, Optional
+
+from metadata_cache import default_cache_dir
+
+# 기록하는 작업 속성 (queue_model.Job과 같은 이름, status는 JobStatus 이름으로 저장)
+_FIELDS = ('job_id', 'url', 'save_dir', 'filename', 'download_type', 'status',
+           'message', 'target_path', 'part_path', 'auto_start')
+
+
+class JobJournal:
+    """작업 ID를 키로 큐 작업 상태를 보관하는 스레드 안전 저널"""
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path: SQLite 파일 경로 (None이면 기본 캐시 디렉토리의 jobs.sqlite3)
+        """
+        self.path = path or os.path.join(default_cache_dir(), 'jobs.sqlite3')
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS jobs ('
+            ' job_id INTEGER PRIMARY KEY,'
+            ' url TEXT NOT NULL,'
+            ' save_dir TEXT NOT NULL,'
+            ' filename TEXT NOT NULL,'
+            ' download_type TEXT NOT NULL,'
+            ' status TEXT NOT NULL,'
+            ' message TEXT,'
+            ' target_path TEXT,'
+            ' part_path TEXT,'
+            ' auto_start INTEGER NOT NULL DEFAULT 0,'
+            ' updated REAL NOT NULL)'
+        )
+        # 이전 버전에서 만든 저널에는 auto_start 열이 없음
+        columns = {row[1] for row in self._conn.execute('PRAGMA table_info(jobs)')}
+        if 'auto_start' not in columns:
+            self._conn.execute('ALTER TABLE jobs ADD COLUMN auto_start INTEGER NOT NULL DEFAULT 0')
+
+    def record(self, jobs: Iterable):
+        """작업 상태 기록 (queue_model.Job 또는 같은 속성을 가진 객체, 한 트랜잭션으로 저장)"""
+        now = time.time()
+        rows = [
+            tuple(job.status.name if field == 'status' else getattr(job, field) for field in _FIELDS) + (now,)
+            for job in jobs
+        ]
+        if not rows:
+            return
+
+        placeholders = ', '.join('?' * (len(_FIELDS) + 1))
+        with self._lock:
+            with self._transaction():
+                self._conn.executemany(
+                    f'INSERT OR REPLACE INTO jobs ({", ".join(_FIELDS)}, updated) VALUES ({placeholders})',
+                    rows
+                )
+
+    def remove(self, job_ids: Iterable[int]):
+        """작업 기록 삭제"""
+        ids = [(job_id,) for job_id in job_ids]
+        if not ids:
+            return
+        with self._lock:
+            with self._transaction():
+                self._conn.executemany('DELETE FROM jobs WHERE job_id = ?', ids)
+
+    def load(self) -> List[dict]:
+        """기록된 작업 목록 (작업 ID 순, 필드 이름 -> 값 딕셔너리)"""
+        with self._lock:
+            rows = self._conn.execute(f'SELECT {", ".join(_FIELDS)} FROM jobs ORDER BY job_id').fetchall()
+        return [dict(zip(_FIELDS, row)) for row in rows]
+
+    def close(self):
+        """WAL 내용을 본 파일에 반영하고 닫기"""
+        with self._lock:
+            try:
+                self._conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+            except sqlite3.Error:
+                pass
+            self._conn.close()
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        """autocommit 연결에서 여러 문장을 한 트랜잭션으로 묶기 (락을 잡은 상태에서 호출)"""
+        self._conn.execute('BEGIN')
+        try:
+            yield
+        except BaseException:
+            self._conn.execute('ROLLBACK')
+            raise
+        self._conn.execute('COMMIT')
+
+
+def open_job_journal() -> Optional[JobJournal]:
+    """기본 위치의 저널 열기 (열 수 없으면 None)"""
+    try:
+        return JobJournal()
+    except (OSError, sqlite3.Error) as e:
+        print(f"작업 저널을 열 수 없습니다: {e}")
+        return None
@@ -0,0 +1,199 @@
+"""
+영상 메타데이터 디스크 캐시 (SQLite, 영상 ID 기준, TTL + LRU 정리)
+
+캐시된 정보는 저장된 포맷 URL 그대로 다운로드에 쓰이므로, 항목의 유효 시간은 TTL과
+포맷 URL의 만료 시각(expire= 값) 중 이른 쪽에서 여유분을 뺀 시각까지입니다.
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import sqlite3
+import threading
+import urllib.parse
+from typing import Optional
+
+# 유튜브 영상 ID (11자)
+_VIDEO_ID_RE = re.compile(r'^[A-Za-z0-9_-]{11}$')
+
+# 경로형 URL에서 영상 ID가 오는 위치 (/shorts/ID, /embed/ID 등)
+_PATH_PREFIXES = ('shorts', 'embed', 'v', 'e', 'live')
+
+# 기본 캐시 설정
+DEFAULT_TTL = 60 * 60  # 1시간 (포맷 URL에 만료 시각이 없을 때의 상한)
+DEFAULT_MAX_ENTRIES = 500
+
+# 포맷 URL 만료 시각보다 이만큼 먼저 만료 처리 (다운로드 시간, 시계 차이 여유분, 초)
+EXPIRE_MARGIN = 15 * 60
+
+# 포맷 URL의 만료 시각 (?expire=1700000000 또는 /expire/1700000000/)
+_EXPIRE_RE = re.compile(r'[?&/]expire[=/](\d{9,})')
+
+
+def extract_video_id(url: str) -> Optional[str]:
+    """
+    유튜브 URL에서 정규 영상 ID 추출
+
+    youtu.be/ID, watch?v=ID, /shorts/ID, /embed/ID, /live/ID 형식을 지원하며,
+    유튜브가 아닌 URL이면 None을 반환합니다.
+    """
+    parsed = urllib.parse.urlparse(url.strip())
+    host = parsed.netloc.lower().split(':', 1)[0]
+    parts = [p for p in parsed.path.split('/') if p]
+
+    video_id = None
+    if host == 'youtu.be' or host.endswith('.youtu.be'):
+        video_id = parts[0] if parts else None
+    elif host == 'youtube.com' or host.endswith('.youtube.com') or host == 'youtube-nocookie.com' \
+            or host.endswith('.youtube-nocookie.com'):
+        if parts[:1] == ['watch']:
+            video_id = urllib.parse.parse_qs(parsed.query).get('v', [None])[0]
+        elif len(parts) >= 2 and parts[0] in _PATH_PREFIXES:
+            video_id = parts[1]
+
+    if video_id and _VIDEO_ID_RE.match(video_id):
+        return video_id
+    return None
+
+
+def stream_url_expiry(info: dict) -> Optional[float]:
+    """정보에 들어 있는 포맷 URL 중 가장 이른 만료 시각 (유닉스 시간, 알 수 없으면 None)"""
+    formats = list(info.get('formats') or []) + list(info.get('requested_formats') or []) + [info]
+    expiries = []
+    for fmt in formats:
+        for key in ('url', 'manifest_url', 'fragment_base_url'):
+            match = _EXPIRE_RE.search(str(fmt.get(key) or ''))
+            if match:
+                expiries.append(float(match.group(1)))
+    return min(expiries) if expiries else None
+
+
+def default_cache_dir() -> str:
+    """캐시 디렉토리 경로 (빌드된 앱은 사용자 Application Support, 개발 모드는 소스 폴더)"""
+    if getattr(sys, 'frozen', False):
+        return os.path.expanduser('~/Library/Application Support/YoutubeDownloader')
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache')
+
+
+class MetadataCache:
+    """영상 ID를 키로 extract_info 결과를 보관하는 스레드 안전 캐시"""
+
+    def __init__(self, path: Optional[str] = None, ttl: float = DEFAULT_TTL,
+                 max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        Args:
+            path: SQLite 파일 경로 (None이면 기본 캐시 디렉토리의 metadata.sqlite3)
+            ttl: 항목 유효 시간 (초, 포맷 URL이 그보다 먼저 만료되면 그 시각 - EXPIRE_MARGIN까지)
+            max_entries: 최대 항목 수 (초과 시 가장 오래 사용하지 않은 항목부터 삭제)
+        """
+        self.path = path or os.path.join(default_cache_dir(), 'metadata.sqlite3')
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS metadata ('
+            ' video_id TEXT PRIMARY KEY,'
+            ' info TEXT NOT NULL,'
+            ' created REAL NOT NULL,'
+            ' accessed REAL NOT NULL,'
+            ' expires REAL)'
+        )
+        # 이전 버전에서 만든 캐시에는 expires 열이 없음 (없는 항목은 TTL로만 판단)
+        columns = {row[1] for row in self._conn.execute('PRAGMA table_info(metadata)')}
+        if 'expires' not in columns:
+            self._conn.execute('ALTER TABLE metadata ADD COLUMN expires REAL')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS metadata_accessed ON metadata(accessed)')
+
+    def get(self, video_id: Optional[str]) -> Optional[dict]:
+        """캐시된 정보 반환 (없거나 만료되었으면 None)"""
+        if not video_id:
+            return None
+
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT info, created, expires FROM metadata WHERE video_id = ?', (video_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            if now - row[1] > self.ttl or (row[2] is not None and now >= row[2]):
+                self._conn.execute('DELETE FROM metadata WHERE video_id = ?', (video_id,))
+                return None
+            self._conn.execute('UPDATE metadata SET accessed = ? WHERE video_id = ?', (now, video_id))
+
+        try:
+            return json.loads(row[0])
+        except ValueError:
+            self.invalidate(video_id)
+            return None
+
+    def put(self, video_id: Optional[str], info: dict):
+        """
+        정보 저장 (JSON으로 직렬화할 수 없는 값은 문자열로 저장)
+
+        포맷 URL이 EXPIRE_MARGIN 안에 만료되면 저장하지 않습니다 (다음 요청은 새로 추출).
+        """
+        if not video_id:
+            return
+
+        now = time.time()
+        expiry = stream_url_expiry(info)
+        expires = expiry - EXPIRE_MARGIN if expiry is not None else None
+        if expires is not None and expires <= now:
+            self.invalidate(video_id)
+            return
+
+        data = json.dumps(info, ensure_ascii=False, default=str)
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO metadata (video_id, info, created, accessed, expires) VALUES (?, ?, ?, ?, ?)',
+                (video_id, data, now, now, expires)
+            )
+            self._evict(now)
+
+    def invalidate(self, video_id: Optional[str] = None):
+        """특정 영상(또는 video_id가 None이면 전체) 캐시 삭제"""
+        with self._lock:
+            if video_id is None:
+                self._conn.execute('DELETE FROM metadata')
+            else:
+                self._conn.execute('DELETE FROM metadata WHERE video_id = ?', (video_id,))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _evict(self, now: float):
+        """만료 항목 및 최대 개수 초과분(LRU) 삭제 (락을 잡은 상태에서 호출)"""
+        self._conn.execute('DELETE FROM metadata WHERE created < ? OR expires <= ?', (now - self.ttl, now))
+        count = self._conn.execute('SELECT COUNT(*) FROM metadata').fetchone()[0]
+        if count > self.max_entries:
+            self._conn.execute(
+                'DELETE FROM metadata WHERE video_id IN '
+                '(SELECT video_id FROM metadata ORDER BY accessed ASC LIMIT ?)',
+                (count - self.max_entries,)
+            )
+
+
+_shared_cache: Optional[MetadataCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_metadata_cache() -> Optional[MetadataCache]:
+    """프로세스 공용 캐시 인스턴스 (열 수 없으면 None)"""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            try:
+                _shared_cache = MetadataCache()
+            except (OSError, sqlite3.Error) as e:
+                print(f"메타데이터 캐시를 열 수 없습니다: {e}")
+                return None
+        return _shared_cache
@@ -0,0 +1,140 @@
+"""
+완료된 다운로드 결과 색인 (SQLite, (영상 키, 다운로드 타입) 기준, PyQt6 비의존)
+
+같은 영상을 다른 URL 형식(youtu.be, watch?v=, shorts 등)으로 다시 받거나 이전 세션에서
+이미 받은 영상을 다시 요청하면, 네트워크 다운로드와 변환 없이 기존 파일을 하드 링크
+(같은 볼륨이 아니면 복사)로 재사용합니다.
+"""
+
+import os
+import time
+import shutil
+import sqlite3
+import threading
+from typing import Optional
+
+from metadata_cache import default_cache_dir, extract_video_id
+
+
+def content_key(url: str, info: Optional[dict] = None) -> Optional[str]:
+    """
+    영상의 정규 키 (유튜브는 영상 ID, 그 외는 '추출기:ID')
+
+    URL만으로 알 수 없으면 추출된 정보(info)의 extractor_key/id를 사용하며,
+    둘 다 없으면 None을 반환합니다.
+    """
+    video_id = extract_video_id(url)
+    if video_id:
+        return video_id
+    if info and info.get('id'):
+        extractor = info.get('extractor_key') or info.get('ie_key') or ''
+        if extractor.lower() == 'youtube':
+            return info['id']
+        return f"{extractor}:{info['id']}"
+    return None
+
+
+def reuse_output(existing: str, target: str) -> str:
+    """
+    기존 결과 파일을 target 위치에 하드 링크 (실패하면 복사), 최종 경로 반환
+
+    target이 기존 파일과 같거나 이미 있으면 그대로 사용합니다.
+    """
+    if os.path.abspath(existing) == os.path.abspath(target) or os.path.exists(target):
+        return target
+
+    os.makedirs(os.path.dirname(target) or '.', exist_ok=True)
+    try:
+        os.link(existing, target)
+    except OSError:
+        shutil.copy2(existing, target)
+    return target
+
+
+class OutputIndex:
+    """(영상 키, 다운로드 타입) -> 완료된 파일 경로를 보관하는 스레드 안전 색인"""
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path: SQLite 파일 경로 (None이면 기본 캐시 디렉토리의 outputs.sqlite3)
+        """
+        self.path = path or os.path.join(default_cache_dir(), 'outputs.sqlite3')
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS outputs ('
+            ' content_key TEXT NOT NULL,'
+            ' download_type TEXT NOT NULL,'
+            ' path TEXT NOT NULL,'
+            ' size INTEGER NOT NULL,'
+            ' created REAL NOT NULL,'
+            ' PRIMARY KEY (content_key, download_type))'
+        )
+
+    def lookup(self, key: Optional[str], download_type: str) -> Optional[str]:
+        """완료된 파일 경로 반환 (없거나 파일이 지워졌거나 크기가 바뀌었으면 None)"""
+        if not key:
+            return None
+
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT path, size FROM outputs WHERE content_key = ? AND download_type = ?',
+                (key, download_type)
+            ).fetchone()
+        if row is None:
+            return None
+
+        path, size = row
+        try:
+            if os.path.getsize(path) == size:
+                return path
+        except OSError:
+            pass
+        self.forget(key, download_type)
+        return None
+
+    def record(self, key: Optional[str], download_type: str, path: str):
+        """완료된 파일 기록"""
+        if not key or not path:
+            return
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            return
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO outputs (content_key, download_type, path, size, created) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (key, download_type, os.path.abspath(path), size, time.time())
+            )
+
+    def forget(self, key: str, download_type: str):
+        with self._lock:
+            self._conn.execute('DELETE FROM outputs WHERE content_key = ? AND download_type = ?',
+                               (key, download_type))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_shared_index: Optional[OutputIndex] = None
+_shared_lock = threading.Lock()
+
+
+def get_output_index() -> Optional[OutputIndex]:
+    """프로세스 공용 색인 인스턴스 (열 수 없으면 None)"""
+    global _shared_index
+    with _shared_lock:
+        if _shared_index is None:
+            try:
+                _shared_index = OutputIndex()
+            except (OSError, sqlite3.Error) as e:
+                print(f"다운로드 결과 색인을 열 수 없습니다: {e}")
+                return None
+        return _shared_index
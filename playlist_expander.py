@@ -0,0 +1,127 @@
+"""
+플레이리스트/채널 목록 펼치기 (PyQt6 비의존)
+
+yt-dlp의 평면 추출(extract_flat)로 목록의 영상 URL만 가져오며, 추출기가 돌려주는 항목
+제너레이터를 그대로 따라가므로 다음 페이지는 앞 항목을 소비한 뒤에야 요청됩니다.
+호출자는 항목이 나오는 대로 대기열에 넣어 목록을 다 받기 전에 다운로드를 시작할 수 있고,
+목록 크기와 관계없이 전체 목록을 메모리에 만들지 않습니다.
+"""
+
+import urllib.parse
+from typing import Callable, Iterator, Optional
+
+from metadata_cache import extract_video_id
+from output_index import content_key, get_output_index
+from ydl_pool import get_ydl_pool
+
+# 목록 조회용 yt-dlp 옵션 (영상 정보는 다운로드할 때 따로 추출)
+_EXPAND_OPTS = {
+    'quiet': True,
+    'no_warnings': True,
+    'extract_flat': 'in_playlist',
+    'lazy_playlist': True,
+    'noplaylist': False,
+}
+
+# 채널/목록을 가리키는 유튜브 경로 (첫 경로 조각)
+_COLLECTION_PATHS = ('playlist', 'channel', 'c', 'user')
+
+# 중첩 목록(채널의 탭 등)을 따라가는 최대 깊이
+_MAX_DEPTH = 3
+
+
+def is_collection_url(url: str) -> bool:
+    """
+    플레이리스트/채널 URL인지 (유튜브 기준)
+
+    list= 파라미터가 있거나 /playlist, /@핸들, /channel/, /c/, /user/ 경로이면 True입니다.
+    watch?v=ID&list=... 처럼 영상과 목록이 함께 있으면 목록으로 취급합니다.
+    """
+    parsed = urllib.parse.urlparse(url.strip())
+    host = parsed.netloc.lower().split(':', 1)[0]
+    if not (host == 'youtube.com' or host.endswith('.youtube.com') or host == 'youtu.be'):
+        return False
+    if urllib.parse.parse_qs(parsed.query).get('list'):
+        return True
+    parts = [p for p in parsed.path.split('/') if p]
+    return bool(parts) and (parts[0] in _COLLECTION_PATHS or parts[0].startswith('@'))
+
+
+def _entry_url(entry: dict) -> Optional[str]:
+    url = entry.get('url') or entry.get('webpage_url')
+    if url and '://' not in url and entry.get('ie_key') == 'Youtube':
+        url = f"https://www.youtube.com/watch?v={url}"
+    return url
+
+
+def _is_nested(entry: dict) -> bool:
+    """항목이 영상이 아니라 다시 펼쳐야 하는 목록인지"""
+    if entry.get('_type') == 'playlist':
+        return True
+    url = _entry_url(entry) or ''
+    return entry.get('ie_key') == 'YoutubeTab' or (is_collection_url(url) and not extract_video_id(url))
+
+
+def completed_filter(download_type: str) -> Callable[[str], bool]:
+    """이미 같은 형식으로 받은 영상이면 True를 반환하는 skip 함수 (결과 색인 기준)"""
+    index = get_output_index()
+
+    def is_completed(url: str) -> bool:
+        return index is not None and index.lookup(content_key(url), download_type) is not None
+
+    return is_completed
+
+
+def iter_playlist_entries(url: str, skip: Optional[Callable[[str], bool]] = None) -> Iterator[dict]:
+    """
+    목록의 영상 항목을 페이지를 받는 대로 하나씩 반환 (목록 순서)
+
+    목록이 아닌 URL이면 그 URL 하나만 반환합니다. 같은 목록에 두 번 나오는 영상은 한 번만
+    반환하며, 목록 중간에 오류가 나면 이미 반환한 항목은 그대로 두고 예외를 전달합니다.
+
+    Args:
+        url: 플레이리스트/채널 URL
+        skip: 영상 URL을 받아 True를 반환하면 건너뜀 (예: 이미 받은 영상)
+
+    Yields:
+        {'url', 'id', 'title', 'duration'} (평면 추출이라 제목/길이는 없을 수 있음)
+    """
+    seen = set()
+
+    def walk(result: dict, depth: int) -> Iterator[dict]:
+        if result.get('_type') not in ('playlist', 'multi_video'):
+            yield result
+            return
+        for entry in result.get('entries') or ():
+            if not entry:
+                continue
+            if _is_nested(entry) and depth < _MAX_DEPTH:
+                if entry.get('_type') != 'playlist':
+                    entry = ydl.extract_info(_entry_url(entry), download=False, process=False)
+                    if not entry:
+                        continue
+                yield from walk(entry, depth + 1)
+            else:
+                yield entry
+
+    with get_ydl_pool().borrow(_EXPAND_OPTS) as ydl:
+        result = ydl.extract_info(url, download=False, process=False)
+        if not result:
+            return
+        for entry in walk(result, 0):
+            entry_url = url if entry is result else _entry_url(entry)
+            if not entry_url:
+                continue
+            video_id = entry.get('id') or extract_video_id(entry_url)
+            key = video_id or entry_url
+            if key in seen:
+                continue
+            seen.add(key)
+            if skip and skip(entry_url):
+                continue
+            yield {
+                'url': entry_url,
+                'id': video_id,
+                'title': entry.get('title'),
+                'duration': entry.get('duration'),
+            }
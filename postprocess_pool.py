@@ -0,0 +1,108 @@
+"""
+ffmpeg 후처리 동시 실행 수 제한 (PyQt6 비의존)
+
+다운로드 워커는 네트워크 전송이 끝나면 스케줄러 슬롯을 반납하고, 이 풀에서 후처리 슬롯을
+받은 뒤에 ffmpeg 후처리(병합/오디오 추출/썸네일 임베드)를 실행합니다. 슬롯을 기다리는 작업은
+도착 순서대로 시작하므로, 동시 다운로드 수(네트워크)와 동시 후처리 수(CPU)를 따로 조절할 수 있습니다.
+"""
+
+import os
+import threading
+import contextlib
+from collections import deque
+from typing import Callable, Optional
+
+# 취소 여부를 확인하는 주기 (초)
+_CANCEL_POLL_INTERVAL = 0.25
+
+
+def default_postprocess_workers() -> int:
+    """기본 동시 후처리 수 (CPU 코어 수)"""
+    return os.cpu_count() or 2
+
+
+class PostprocessCancelled(Exception):
+    """후처리 슬롯을 기다리는 중에 취소됨"""
+
+
+class PostprocessPool:
+    """동시 후처리 수를 제한하는 FIFO 슬롯 풀"""
+
+    def __init__(self, max_workers: Optional[int] = None):
+        """
+        Args:
+            max_workers: 최대 동시 후처리 수 (None이면 CPU 코어 수)
+        """
+        self._max_workers = max(1, int(max_workers or default_postprocess_workers()))
+        self._cond = threading.Condition()
+        self._running = 0
+        self._waiting = deque()  # 슬롯을 기다리는 순서
+
+    @property
+    def max_workers(self) -> int:
+        return self._max_workers
+
+    @max_workers.setter
+    def max_workers(self, value: int):
+        with self._cond:
+            self._max_workers = max(1, int(value))
+            self._cond.notify_all()
+
+    @property
+    def running_count(self) -> int:
+        return self._running
+
+    @property
+    def waiting_count(self) -> int:
+        return len(self._waiting)
+
+    @contextlib.contextmanager
+    def slot(self, on_wait: Optional[Callable[[], None]] = None,
+             cancelled: Optional[Callable[[], bool]] = None):
+        """
+        후처리 슬롯을 받아 블록 실행 (블록이 끝나면 반납)
+
+        Args:
+            on_wait: 바로 시작할 수 없어 기다려야 할 때 한 번 호출
+            cancelled: True를 반환하면 대기를 멈추고 PostprocessCancelled
+        """
+        ticket = object()
+        with self._cond:
+            self._waiting.append(ticket)
+            must_wait = not self._can_start(ticket)
+        if must_wait and on_wait:
+            on_wait()
+
+        with self._cond:
+            while not self._can_start(ticket):
+                if cancelled and cancelled():
+                    self._waiting.remove(ticket)
+                    self._cond.notify_all()
+                    raise PostprocessCancelled("후처리 대기 중 취소됨")
+                self._cond.wait(_CANCEL_POLL_INTERVAL)
+            self._waiting.popleft()
+            self._running += 1
+            self._cond.notify_all()
+
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._running -= 1
+                self._cond.notify_all()
+
+    def _can_start(self, ticket) -> bool:
+        return self._waiting[0] is ticket and self._running < self._max_workers
+
+
+_shared_pool: Optional[PostprocessPool] = None
+_shared_lock = threading.Lock()
+
+
+def get_postprocess_pool() -> PostprocessPool:
+    """프로세스 공용 후처리 풀 인스턴스"""
+    global _shared_pool
+    with _shared_lock:
+        if _shared_pool is None:
+            _shared_pool = PostprocessPool()
+        return _shared_pool
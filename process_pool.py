@@ -0,0 +1,194 @@
+"""
+다운로드를 별도 프로세스에서 실행하는 재사용 프로세스 풀 (PyQt6 비의존)
+
+yt-dlp의 추출/서명 해석/포맷 선택은 순수 파이썬 CPU 작업이라 한 프로세스 안의
+여러 스레드에서는 GIL 때문에 직렬화됩니다. 각 다운로드를 풀의 자식 프로세스에서
+DownloadEngine으로 실행하고, 진행 이벤트는 작업별 큐로 부모 프로세스에 전달합니다.
+
+후처리 풀(postprocess_pool), 디스크 공간 예약(disk_space), 메타데이터 캐시와 출력 인덱스의
+공용 인스턴스는 프로세스마다 따로 있습니다. 따라서 이 모드에서 동시 ffmpeg 수는 자식 프로세스
+수(기본: CPU 코어 수)로 제한되고, 자식 프로세스는 형제 프로세스의 디스크 예약을 볼 수 없으므로
+부모가 이미 예약한 작업은 reserve_disk=False로 제출해 엔진 쪽 예약을 건너뜁니다.
+대역폭 제한(bandwidth)의 토큰 버킷은 공유 메모리로 옮겨 모든 자식 프로세스가 함께 사용합니다.
+"""
+
+import os
+import queue
+import threading
+import itertools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Hashable, Optional, Tuple
+
+from bandwidth import attach_bandwidth_shaper, get_bandwidth_shaper
+
+# 자식 프로세스에서 취소 여부를 확인하는 주기 (초)
+_CANCEL_POLL_INTERVAL = 0.25
+
+
+def _run_job(job_id: int, kwargs: dict, events, cancel_flags):
+    """자식 프로세스에서 다운로드 실행 (이벤트: (종류, 값) 튜플)"""
+    from download_engine import DownloadEngine
+
+    # 대기 중에 취소된 작업은 시작하지 않음
+    if cancel_flags.get(job_id):
+        events.put(('finished', (False, "취소됨")))
+        return
+
+    engine = DownloadEngine(
+        on_progress=lambda msg: events.put(('progress', msg)),
+        on_title=lambda title: events.put(('title', title)),
+        on_file_path=lambda path: events.put(('file_path', path)),
+        on_progress_event=lambda event: events.put(('progress_event', event)),
+        on_network_done=lambda: events.put(('network_done', None)),
+        on_retry=lambda event: events.put(('retry', event)),
+        **kwargs
+    )
+
+    # 부모의 취소 요청 감시
+    done = threading.Event()
+
+    def watch_cancel():
+        while not done.wait(_CANCEL_POLL_INTERVAL):
+            if cancel_flags.get(job_id):
+                engine.cancel()
+                return
+
+    watcher = threading.Thread(target=watch_cancel, daemon=True)
+    watcher.start()
+    try:
+        result = engine.run()
+    finally:
+        done.set()
+    events.put(('finished', result))
+
+
+class ProcessJob:
+    """풀에 제출된 작업 핸들"""
+
+    def __init__(self, pool: 'ProcessDownloadPool', job_id: int, events):
+        self._pool = pool
+        self.job_id = job_id
+        self._events = events
+        self.future = None
+
+    def get_event(self, timeout: Optional[float] = None) -> Optional[Tuple[str, object]]:
+        """
+        다음 이벤트 반환 (timeout 내에 없으면 None)
+
+        풀 종료 등으로 매니저 연결이 끊기면 실패한 finished 이벤트를 반환하므로
+        호출한 쪽은 항상 finished로 끝납니다.
+        """
+        try:
+            return self._events.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        except (EOFError, OSError):
+            return ('finished', (False, "오류: 프로세스 풀이 종료됨"))
+
+    def cancel(self):
+        """작업 취소 요청"""
+        self._pool.cancel(self.job_id)
+
+    def _on_done(self, future):
+        # 자식 프로세스가 비정상 종료되거나 풀 종료로 취소된 경우에도 finished 이벤트 보장
+        try:
+            if future.cancelled():
+                self._events.put(('finished', (False, "취소됨")))
+            elif future.exception() is not None:
+                self._events.put(('finished', (False, f"오류: 프로세스 실행 실패 ({future.exception()})")))
+        except Exception:
+            pass  # 풀 종료로 매니저가 이미 내려간 경우
+        self._pool._forget(self.job_id)
+
+
+class ProcessDownloadPool:
+    """DownloadEngine 작업을 실행하는 재사용 프로세스 풀"""
+
+    def __init__(self, max_workers: Optional[int] = None):
+        """
+        Args:
+            max_workers: 자식 프로세스 수 (None이면 CPU 코어 수)
+        """
+        self.max_workers = max_workers or os.cpu_count() or 2
+        self._ctx = multiprocessing.get_context('spawn')
+        self._lock = threading.Lock()
+        self._executor = None
+        self._manager = None
+        self._cancel_flags = None
+        self._ids = itertools.count(1)
+
+    def _ensure_started(self):
+        if self._executor is None:
+            self._manager = self._ctx.Manager()
+            self._cancel_flags = self._manager.dict()
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=self._ctx,
+                                                 initializer=attach_bandwidth_shaper,
+                                                 initargs=get_bandwidth_shaper().share(self._ctx))
+
+    def submit(self, url: str, output_path: str, download_type: str = 'audio',
+               info: Optional[dict] = None, connections: int = 1,
+               temp_dir: Optional[str] = None, reservation_key: Optional[Hashable] = None,
+               reserve_disk: bool = True) -> ProcessJob:
+        """다운로드 작업 제출"""
+        with self._lock:
+            self._ensure_started()
+            job = ProcessJob(self, next(self._ids), self._manager.Queue())
+            kwargs = {'url': url, 'output_path': output_path,
+                      'download_type': download_type, 'info': info, 'connections': connections,
+                      'temp_dir': temp_dir, 'reservation_key': reservation_key,
+                      'reserve_disk': reserve_disk}
+            job.future = self._executor.submit(_run_job, job.job_id, kwargs, job._events, self._cancel_flags)
+        job.future.add_done_callback(job._on_done)
+        return job
+
+    def cancel(self, job_id: int):
+        with self._lock:
+            if self._cancel_flags is not None:
+                self._cancel_flags[job_id] = True
+
+    def _forget(self, job_id: int):
+        with self._lock:
+            if self._cancel_flags is not None:
+                self._cancel_flags.pop(job_id, None)
+
+    def shutdown(self):
+        """
+        실행 중인 작업을 취소하고 풀 종료
+
+        실행 중인 다운로드는 취소 요청만으로 바로 끝나지 않으므로 남아 있는 자식 프로세스를 종료합니다
+        (받던 .part 파일은 남아 다음에 이어받음).
+        """
+        with self._lock:
+            executor, manager = self._executor, self._manager
+            self._executor = self._manager = self._cancel_flags = None
+        if executor is not None:
+            processes = list((getattr(executor, '_processes', None) or {}).values())
+            executor.shutdown(wait=False, cancel_futures=True)
+            for process in processes:
+                if process.is_alive():
+                    process.kill()
+        if manager is not None:
+            manager.shutdown()
+
+
+_shared_pool: Optional[ProcessDownloadPool] = None
+_shared_lock = threading.Lock()
+
+
+def get_process_pool() -> ProcessDownloadPool:
+    """프로세스 공용 풀 인스턴스"""
+    global _shared_pool
+    with _shared_lock:
+        if _shared_pool is None:
+            _shared_pool = ProcessDownloadPool()
+        return _shared_pool
+
+
+def shutdown_process_pool():
+    """공용 풀이 시작되었으면 종료"""
+    global _shared_pool
+    with _shared_lock:
+        pool, _shared_pool = _shared_pool, None
+    if pool is not None:
+        pool.shutdown()
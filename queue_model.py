@@ -0,0 +1,243 @@
+"""
+다운로드 큐 데이터 모델 (작업 저장소 + QAbstractTableModel)
+"""
+
+import enum
+from typing import Callable, Dict, Hashable, Iterable, Iterator, List, Optional
+
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+
+class JobStatus(enum.IntEnum):
+    """작업 상태"""
+    RESOLVING = 0  # 제목 확인 중
+    IDLE = 1  # 대기 중 (다운로드 시작 전)
+    QUEUED = 2  # 스케줄러 대기열
+    RUNNING = 3  # 다운로드 진행 중
+    DONE = 4  # 완료
+    FAILED = 5  # 실패
+    STOPPED = 6  # 사용자가 중지
+    POSTPROCESSING = 7  # 전송 완료, 후처리 대기/진행 중 (다운로드 슬롯은 반납됨)
+
+
+# 상태별 표시 텍스트 (RUNNING/POSTPROCESSING/FAILED는 작업 메시지를 함께 표시)
+STATUS_LABELS = {
+    JobStatus.RESOLVING: "제목 확인 중…",
+    JobStatus.IDLE: "대기 중",
+    JobStatus.QUEUED: "대기열",
+    JobStatus.RUNNING: "시작 중...",
+    JobStatus.DONE: "✓ 완료",
+    JobStatus.FAILED: "✗ 실패",
+    JobStatus.STOPPED: "중지됨",
+    JobStatus.POSTPROCESSING: "후처리 대기 중...",
+}
+
+# 다운로드 타입별 형식 표시 텍스트 (형식 콤보박스 항목과 동일한 순서)
+FORMAT_LABELS = {
+    'audio': "오디오 전용 (M4A - 최고 음질)",
+    'video_best': "비디오 (MP4 - 최고 화질)",
+    'video_720p': "비디오 (MP4 - 720p)",
+    'video_480p': "비디오 (MP4 - 480p)",
+}
+
+# 다운로드 타입별 음질 표시 텍스트
+QUALITY_LABELS = {
+    'audio': '320kbps M4A',
+    'video_best': '320kbps AAC',
+    'video_720p': '256kbps AAC',
+    'video_480p': '192kbps AAC',
+}
+
+# 이보다 많은 구간으로 흩어진 행을 제거할 때는 구간별 알림 대신 모델 재설정
+_MAX_REMOVE_RANGES = 16
+
+
+class Job:
+    """다운로드 작업 하나 (테이블의 한 행)"""
+
+    __slots__ = ('job_id', 'url', 'save_dir', 'filename', 'download_type', 'status',
+                 'message', 'file_path', 'target_path', 'part_path', 'connections', 'auto_start')
+
+    def __init__(self, url: str, save_dir: str, filename: str, download_type: str,
+                 status: JobStatus = JobStatus.IDLE, auto_start: bool = False):
+        self.job_id: Optional[int] = None  # 모델에 추가될 때 부여되는 고유 ID (행이 바뀌어도 유지)
+        self.url = url
+        self.save_dir = save_dir
+        self.filename = filename
+        self.download_type = download_type
+        self.status = status
+        self.message = ''  # 진행 상태 텍스트 또는 실패 메시지
+        self.file_path: Optional[str] = None  # 실제 다운로드된 파일 경로
+        self.target_path: Optional[str] = None  # 워커에 전달한 저장 경로 (이어받기 시 같은 경로 사용)
+        self.part_path: Optional[str] = None  # 다운로드 중인 임시(.part) 파일 경로
+        self.connections = 1  # 포맷당 동시 연결 수 (2 이상이면 구간 다운로드)
+        self.auto_start = auto_start  # 제목 확인 후 자동으로 대기열에 등록할지 여부
+
+    def status_text(self) -> str:
+        if self.status in (JobStatus.RUNNING, JobStatus.POSTPROCESSING) and self.message:
+            return self.message
+        if self.status == JobStatus.QUEUED and self.message:
+            return f"{STATUS_LABELS[JobStatus.QUEUED]} ({self.message})"
+        if self.status == JobStatus.FAILED and self.message:
+            return f"{STATUS_LABELS[JobStatus.FAILED]}: {self.message}"
+        return STATUS_LABELS[self.status]
+
+
+def _discard_id(index: Dict[Hashable, List[int]], key: Hashable, job_id: int):
+    """색인에서 작업 ID 제거 (목록이 비면 키도 제거)"""
+    ids = index[key]
+    ids.remove(job_id)
+    if not ids:
+        del index[key]
+
+
+class QueueTableModel(QAbstractTableModel):
+    """
+    작업 목록을 테이블로 보여주는 모델 (보이는 행만 그려짐)
+
+    작업은 고유 ID로 다루며, ID -> 행 번호 색인과 URL/중복 판단 키 -> ID 색인을 추가/삭제 시
+    함께 갱신합니다.
+    워커 시그널처럼 나중에 도착하는 이벤트는 ID로 행을 찾으므로, 그 사이에 앞쪽 행이
+    삭제되어도 다른 행에 기록되지 않습니다.
+    """
+
+    COLUMNS = ["URL", "저장 경로", "파일명", "형식", "음질", "진행 상태"]
+    COL_URL, COL_DIR, COL_FILENAME, COL_FORMAT, COL_QUALITY, COL_STATUS = range(6)
+
+    def __init__(self, parent=None, key: Optional[Callable[[Job], Hashable]] = None):
+        """
+        Args:
+            parent: 부모 QObject
+            key: 중복 판단 키 함수 (jobs_with_key()로 같은 키의 작업을 찾음, None이면 URL)
+        """
+        super().__init__(parent)
+        self._key = key or (lambda job: job.url)
+        self._jobs: List[Job] = []
+        self._rows: Dict[int, int] = {}  # 작업 ID -> 행 번호
+        self._url_ids: Dict[str, List[int]] = {}  # URL -> 작업 ID 목록 (추가 순)
+        self._key_ids: Dict[Hashable, List[int]] = {}  # 중복 판단 키 -> 작업 ID 목록 (추가 순)
+        self._next_id = 1
+
+    # ── QAbstractTableModel ──
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._jobs)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        if role not in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole) or not index.isValid():
+            return None
+
+        job = self._jobs[index.row()]
+        column = index.column()
+        if column == self.COL_URL:
+            return job.url
+        if column == self.COL_DIR:
+            return job.save_dir
+        if column == self.COL_FILENAME:
+            return job.filename or STATUS_LABELS[JobStatus.RESOLVING]
+        if column == self.COL_FORMAT:
+            return FORMAT_LABELS.get(job.download_type, job.download_type)
+        if column == self.COL_QUALITY:
+            return QUALITY_LABELS.get(job.download_type, 'N/A')
+        if column == self.COL_STATUS:
+            return job.status_text()
+        return None
+
+    def headerData(self, section: int, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.COLUMNS[section]
+        return super().headerData(section, orientation, role)
+
+    # ── 작업 관리 ──
+    def job(self, job_id: int) -> Optional[Job]:
+        """ID로 작업 조회 (삭제된 작업이면 None)"""
+        row = self._rows.get(job_id)
+        return None if row is None else self._jobs[row]
+
+    def job_at(self, row: int) -> Job:
+        return self._jobs[row]
+
+    def row_of(self, job_id: int) -> Optional[int]:
+        return self._rows.get(job_id)
+
+    def jobs(self) -> Iterator[Job]:
+        return iter(self._jobs)
+
+    def jobs_with_url(self, url: str) -> List[Job]:
+        """URL이 같은 작업 목록 (추가 순)"""
+        return [self._jobs[self._rows[job_id]] for job_id in self._url_ids.get(url, ())]
+
+    def jobs_with_key(self, key: Hashable) -> List[Job]:
+        """중복 판단 키가 같은 작업 목록 (추가 순)"""
+        return [self._jobs[self._rows[job_id]] for job_id in self._key_ids.get(key, ())]
+
+    def append_jobs(self, jobs: Iterable[Job]) -> List[int]:
+        """작업을 끝에 추가하고 부여된 ID 목록 반환"""
+        jobs = list(jobs)
+        if not jobs:
+            return []
+
+        first = len(self._jobs)
+        self.beginInsertRows(QModelIndex(), first, first + len(jobs) - 1)
+        for row, job in enumerate(jobs, first):
+            # 복원된 작업은 기존 ID 유지, 새 ID는 항상 그보다 크게
+            if job.job_id is None:
+                job.job_id = self._next_id
+            self._next_id = max(self._next_id, job.job_id + 1)
+            self._rows[job.job_id] = row
+            self._url_ids.setdefault(job.url, []).append(job.job_id)
+            self._key_ids.setdefault(self._key(job), []).append(job.job_id)
+        self._jobs.extend(jobs)
+        self.endInsertRows()
+        return [job.job_id for job in jobs]
+
+    def remove_jobs(self, job_ids: Iterable[int]) -> int:
+        """
+        작업 여러 개 제거 (없는 ID는 무시) 후 제거된 개수 반환
+
+        연속된 행은 한 번에 제거하고, 행 색인은 처음 삭제된 행 이후만 한 번 다시 계산합니다.
+        흩어진 구간이 많으면 모델을 한 번에 재설정하여 전체 비용을 O(n)으로 유지합니다.
+        """
+        rows = sorted({self._rows[job_id] for job_id in job_ids if job_id in self._rows})
+        if not rows:
+            return 0
+
+        # 연속 구간으로 묶기 [(시작, 끝), ...]
+        ranges = []
+        for row in rows:
+            if ranges and ranges[-1][1] == row - 1:
+                ranges[-1][1] = row
+            else:
+                ranges.append([row, row])
+
+        for row in rows:
+            job = self._jobs[row]
+            del self._rows[job.job_id]
+            _discard_id(self._url_ids, job.url, job.job_id)
+            _discard_id(self._key_ids, self._key(job), job.job_id)
+
+        if len(ranges) > _MAX_REMOVE_RANGES:
+            removed = set(rows)
+            self.beginResetModel()
+            self._jobs = [job for row, job in enumerate(self._jobs) if row not in removed]
+            self.endResetModel()
+        else:
+            for first, last in reversed(ranges):
+                self.beginRemoveRows(QModelIndex(), first, last)
+                del self._jobs[first:last + 1]
+                self.endRemoveRows()
+
+        for row in range(rows[0], len(self._jobs)):
+            self._rows[self._jobs[row].job_id] = row
+        return len(rows)
+
+    def update_job(self, job_id: int, *columns: int):
+        """작업 변경을 뷰에 알림 (기본: 진행 상태 칸만, 삭제된 작업이면 무시)"""
+        row = self._rows.get(job_id)
+        if row is None:
+            return
+        for column in columns or (self.COL_STATUS,):
+            index = self.index(row, column)
+            self.dataChanged.emit(index, index)
@@ -0,0 +1,247 @@
+"""
+다운로드 실패 분류와 재시도 정책 (PyQt6/yt-dlp 비의존)
+
+- classify_error(): 예외(또는 메시지)를 일시적 오류, 서버 속도 제한(429 등), 재시도 불가 오류로 분류
+- RetryPolicy: 지터를 넣은 지수 백오프 (서버가 Retry-After를 주면 그 이상 대기)
+- ConcurrencyGovernor: 속도 제한이 감지되면 동시 다운로드 수를 절반으로 줄이고,
+  한동안 제한이 없으면 하나씩 원래 값까지 늘림
+
+재시도는 같은 저장 경로로 다운로드를 다시 실행하므로 yt-dlp의 .part 파일이나 구간 다운로드
+기록에서 이어받습니다.
+"""
+
+import re
+import time
+import random
+import threading
+import contextlib
+from enum import Enum
+from email.utils import parsedate_to_datetime
+from typing import Callable, Iterator, Optional, Tuple
+
+
+class ErrorKind(Enum):
+    """실패 종류"""
+    TRANSIENT = 'transient'  # 연결 끊김, 시간 초과, 5xx, 만료된 URL(403) 등
+    THROTTLED = 'throttled'  # 서버 속도 제한 (429, 봇 확인 등)
+    FATAL = 'fatal'  # 비공개/삭제된 영상, 404, 후처리 실패 등 다시 해도 같은 결과
+    UNKNOWN = 'unknown'  # 분류할 수 없는 오류 (한 번만 재시도)
+
+
+# 메시지 패턴 (앞의 항목 우선)
+_FATAL_PATTERNS = re.compile(
+    r'private video|video unavailable|is not available|has been removed|copyright|'
+    r'confirm your age|members[- ]only|unsupported url|is not a valid url|'
+    r'postprocessing|ffmpeg|ffprobe|no space left|permission denied|'
+    r'requested format is not available|취소',
+    re.IGNORECASE,
+)
+_THROTTLED_PATTERNS = re.compile(
+    r'too many requests|rate[- ]limit|not a bot|try again later',
+    re.IGNORECASE,
+)
+_TRANSIENT_PATTERNS = re.compile(
+    r'timed? ?out|connection (?:reset|refused|aborted)|remote end closed|incompleteread|'
+    r'incomplete read|broken pipe|temporary failure|name resolution|network is unreachable|'
+    r'unable to download|fragment|did not get any data|content too short|bytes, expected|구간',
+    re.IGNORECASE,
+)
+_HTTP_STATUS_PATTERN = re.compile(r'HTTP Error (\d{3})')
+# 메시지에 상태 코드만 있는 경우 (영상 ID, 바이트 수, URL 안의 숫자는 제외하도록 HTTP 문맥에서만)
+_THROTTLED_STATUS_PATTERN = re.compile(r'\b(?:HTTP(?: Error)?|status(?: code)?)\s*:?\s*429\b', re.IGNORECASE)
+
+_FATAL_STATUS = (400, 401, 404, 410, 451)
+
+
+def _error_chain(error: BaseException) -> Iterator[BaseException]:
+    """예외와 그 원인들 (yt-dlp DownloadError.exc_info, __cause__, __context__)"""
+    seen = set()
+    pending = [error]
+    while pending:
+        current = pending.pop(0)
+        if current is None or id(current) in seen:
+            continue
+        seen.add(id(current))
+        yield current
+        exc_info = getattr(current, 'exc_info', None)
+        if isinstance(exc_info, tuple) and len(exc_info) > 1:
+            pending.append(exc_info[1])
+        pending += [current.__cause__, current.__context__]
+
+
+def _http_status(error: BaseException) -> Optional[int]:
+    for current in _error_chain(error):
+        status = getattr(current, 'status', None) or getattr(current, 'code', None)
+        if isinstance(status, int) and 100 <= status < 600:
+            return status
+        match = _HTTP_STATUS_PATTERN.search(str(current))
+        if match:
+            return int(match.group(1))
+    return None
+
+
+def retry_after(error: BaseException) -> Optional[float]:
+    """응답의 Retry-After 헤더 값 (초, 없으면 None)"""
+    for current in _error_chain(error):
+        headers = getattr(getattr(current, 'response', None), 'headers', None) or getattr(current, 'headers', None)
+        value = headers.get('Retry-After') if hasattr(headers, 'get') else None
+        if not value:
+            continue
+        value = str(value).strip()
+        if value.isdigit():
+            return float(value)
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+def classify_error(error) -> ErrorKind:
+    """예외 또는 오류 메시지의 실패 종류"""
+    if isinstance(error, BaseException):
+        status = _http_status(error)
+        if status == 429:
+            return ErrorKind.THROTTLED
+        if status in _FATAL_STATUS:
+            return ErrorKind.FATAL
+        if status is not None and (status >= 500 or status == 403):
+            return ErrorKind.TRANSIENT
+        names = {type(e).__name__ for e in _error_chain(error)}
+        if names & {'PostProcessingError', 'DownloadCancelled', 'UnsupportedError', 'GeoRestrictedError'}:
+            return ErrorKind.FATAL
+        if names & {'ConnectionError', 'TimeoutError', 'IncompleteRead', 'SegmentError', 'TransportError'}:
+            return ErrorKind.TRANSIENT
+        message = ' '.join(str(e) for e in _error_chain(error))
+    else:
+        message = str(error)
+
+    if _FATAL_PATTERNS.search(message):
+        return ErrorKind.FATAL
+    if _THROTTLED_PATTERNS.search(message) or _THROTTLED_STATUS_PATTERN.search(message):
+        return ErrorKind.THROTTLED
+    if _TRANSIENT_PATTERNS.search(message):
+        return ErrorKind.TRANSIENT
+    return ErrorKind.UNKNOWN
+
+
+class RetryPolicy:
+    """지터를 넣은 지수 백오프 재시도 정책"""
+
+    def __init__(self, max_retries: int = 5, base_delay: float = 2.0, max_delay: float = 300.0,
+                 throttled_delay: float = 30.0, unknown_retries: int = 1):
+        """
+        Args:
+            max_retries: 일시적 오류/속도 제한 시 최대 재시도 횟수
+            base_delay: 첫 재시도 대기 시간의 상한 (초, 재시도마다 두 배)
+            max_delay: 대기 시간 상한 (초)
+            throttled_delay: 속도 제한 시 첫 대기 시간의 상한 (초)
+            unknown_retries: 분류할 수 없는 오류의 최대 재시도 횟수
+        """
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.throttled_delay = throttled_delay
+        self.unknown_retries = unknown_retries
+
+    def next_delay(self, error, attempt: int) -> Optional[Tuple[ErrorKind, float]]:
+        """
+        재시도 여부와 대기 시간
+
+        Args:
+            error: 실패한 예외 (또는 메시지)
+            attempt: 지금까지 재시도한 횟수
+
+        Returns:
+            (실패 종류, 대기 초) 또는 재시도하지 않으면 None
+        """
+        kind = classify_error(error)
+        limit = {ErrorKind.FATAL: 0, ErrorKind.UNKNOWN: self.unknown_retries}.get(kind, self.max_retries)
+        if attempt >= limit:
+            return None
+
+        base = self.throttled_delay if kind == ErrorKind.THROTTLED else self.base_delay
+        ceiling = min(self.max_delay, base * (2 ** attempt))
+        # 여러 작업이 한꺼번에 다시 몰리지 않도록 상한의 절반~전체 사이에서 무작위 대기
+        delay = random.uniform(ceiling / 2, ceiling)
+        if isinstance(error, BaseException):
+            server_delay = retry_after(error)
+            if server_delay is not None:
+                delay = max(delay, min(server_delay, self.max_delay * 4))
+        return kind, delay
+
+
+class ConcurrencyGovernor:
+    """속도 제한을 감지하면 동시 다운로드 수를 줄이는 조절기 (곱셈 감소, 덧셈 증가)"""
+
+    def __init__(self, ceiling: int, on_change: Optional[Callable[[int], None]] = None,
+                 recovery_interval: float = 60.0):
+        """
+        Args:
+            ceiling: 사용자가 정한 최대 동시 다운로드 수
+            on_change: 허용 동시 수가 바뀔 때 호출 (예: 스케줄러 max_concurrent 갱신)
+            recovery_interval: 마지막 속도 제한 이후 이 시간(초)이 지날 때마다 하나씩 늘림
+        """
+        self._cond = threading.Condition()
+        self._ceiling = max(1, int(ceiling))
+        self._limit = self._ceiling
+        self._running = 0
+        self._last_change = 0.0
+        self.on_change = on_change
+        self.recovery_interval = recovery_interval
+
+    @property
+    def limit(self) -> int:
+        """지금 허용하는 동시 다운로드 수"""
+        return self._limit
+
+    @property
+    def ceiling(self) -> int:
+        return self._ceiling
+
+    @ceiling.setter
+    def ceiling(self, value: int):
+        with self._cond:
+            self._ceiling = max(1, int(value))
+            throttled = self._limit < self._ceiling and time.monotonic() - self._last_change < self.recovery_interval
+        self._set_limit(min(self._limit, self._ceiling) if throttled else self._ceiling)
+
+    def throttled(self):
+        """속도 제한 감지 (허용 동시 수 절반으로, 최소 1)"""
+        with self._cond:
+            recently = time.monotonic() - self._last_change < 1.0
+        # 같은 순간에 여러 작업이 동시에 보고해도 한 번만 줄임
+        if not recently:
+            self._set_limit(max(1, self._limit // 2))
+
+    def succeeded(self):
+        """작업 성공 (속도 제한 없이 충분히 지났으면 허용 동시 수 하나 늘림)"""
+        with self._cond:
+            recover = (self._limit < self._ceiling
+                       and time.monotonic() - self._last_change >= self.recovery_interval)
+        if recover:
+            self._set_limit(self._limit + 1)
+
+    @contextlib.contextmanager
+    def slot(self):
+        """허용 동시 수 안에서 블록 실행 (직접 스레드를 돌리는 배치 모드용)"""
+        with self._cond:
+            while self._running >= self._limit:
+                self._cond.wait()
+            self._running += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._running -= 1
+                self._cond.notify_all()
+
+    def _set_limit(self, value: int):
+        with self._cond:
+            if value == self._limit:
+                return
+            self._limit = value
+            self._last_change = time.monotonic()
+            self._cond.notify_all()
+        if self.on_change:
+            self.on_change(value)
@@ -0,0 +1,317 @@
+"""
+멀티 커넥션 구간(Range) 다운로드 (PyQt6 비의존)
+
+하나의 포맷을 바이트 구간으로 나누어 여러 연결로 동시에 받고, 미리 크기를 잡아 둔
+임시 파일의 해당 위치에 바로 기록합니다. 연결당 속도 제한이 걸리는 서버에서 전체
+속도를 회선 속도에 가깝게 올리기 위한 옵션 기능입니다.
+
+yt-dlp 없이도 동작하므로 로컬 Range 서버로 단독 테스트할 수 있으며, yt-dlp 연동은
+ydl_factory.create_youtube_dl()이 담당합니다.
+"""
+
+import os
+import json
+import errno
+import time
+import queue
+import threading
+import http.client
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+# 구간 크기 및 구간 다운로드를 사용할 최소 파일 크기
+DEFAULT_SEGMENT_SIZE = 4 * 1024 * 1024
+MIN_SEGMENTED_SIZE = 8 * 1024 * 1024
+
+# 구간별 재시도 횟수 (재시도마다 대기 시간 두 배)
+DEFAULT_RETRIES = 5
+_RETRY_BACKOFF = 0.5
+
+# 최대 연결 수
+MAX_CONNECTIONS = 16
+
+_READ_SIZE = 64 * 1024
+_TIMEOUT = 20
+_MAX_REDIRECTS = 5
+
+# 재시도해도 소용없는 응답 (URL 만료, 권한 없음 등)
+_FATAL_STATUS = (401, 403, 404, 410)
+
+
+class SegmentationUnavailable(Exception):
+    """서버가 Range 요청을 지원하지 않거나 파일이 작아 구간 다운로드를 쓰지 않음"""
+
+
+class SegmentError(Exception):
+    """구간 다운로드 실패 (재시도 초과 또는 재시도 불가 응답)"""
+
+
+def _open_connection(url: str) -> Tuple[http.client.HTTPConnection, str]:
+    """URL의 호스트로 연결 생성, (연결, 요청 경로) 반환"""
+    parsed = urllib.parse.urlsplit(url)
+    conn_class = http.client.HTTPSConnection if parsed.scheme == 'https' else http.client.HTTPConnection
+    path = parsed.path or '/'
+    if parsed.query:
+        path += '?' + parsed.query
+    return conn_class(parsed.netloc, timeout=_TIMEOUT), path
+
+
+def _preallocate(f, size: int):
+    """파일을 size 크기로 할당 (가능하면 디스크 블록까지 확보하여 받는 도중 공간 부족 방지)"""
+    f.truncate(size)
+    if hasattr(os, 'posix_fallocate'):
+        try:
+            os.posix_fallocate(f.fileno(), 0, size)
+        except OSError as e:
+            if e.errno == errno.ENOSPC:
+                raise
+            # 파일 시스템이 지원하지 않으면 희소 파일로 진행
+
+
+class SegmentedDownloader:
+    """URL 하나를 여러 연결로 구간 다운로드"""
+
+    def __init__(self, url: str, path: str, headers: Optional[Dict[str, str]] = None,
+                 connections: int = 4, segment_size: int = DEFAULT_SEGMENT_SIZE,
+                 retries: int = DEFAULT_RETRIES, min_size: int = MIN_SEGMENTED_SIZE,
+                 throttle: Optional[Callable[[int], None]] = None):
+        """
+        Args:
+            url: 다운로드 URL (http/https)
+            path: 저장할 파일 경로 (보통 .part 임시 파일)
+            headers: 요청 헤더 (User-Agent 등)
+            connections: 동시 연결 수
+            segment_size: 구간 크기 (바이트)
+            retries: 구간별 재시도 횟수
+            min_size: 이보다 작은 파일은 SegmentationUnavailable
+            throttle: 조각을 받을 때마다 받은 바이트 수로 호출 (속도 제한 대기, 여러 스레드에서 호출됨)
+        """
+        self.url = url
+        self.path = path
+        self.headers = {k: v for k, v in (headers or {}).items() if k.lower() != 'range'}
+        self.connections = max(1, min(int(connections), MAX_CONNECTIONS))
+        self.segment_size = max(_READ_SIZE, int(segment_size))
+        self.retries = retries
+        self.min_size = min_size
+        self.throttle = throttle
+
+        self.total: Optional[int] = None
+        self.downloaded = 0
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._done_segments = set()
+        self._local = threading.local()
+
+    @property
+    def state_path(self) -> str:
+        """완료된 구간 목록을 기록하는 파일 (이어받기용)"""
+        return self.path + '.segments'
+
+    def prepare(self) -> int:
+        """
+        리다이렉트를 따라가 최종 URL과 전체 크기를 확인
+
+        Returns:
+            전체 크기 (바이트)
+
+        Raises:
+            SegmentationUnavailable: Range 미지원, 크기 불명, 또는 min_size 미만
+        """
+        url = self.url
+        for _ in range(_MAX_REDIRECTS + 1):
+            conn, path = _open_connection(url)
+            try:
+                conn.request('GET', path, headers=dict(self.headers, Range='bytes=0-0'))
+                response = conn.getresponse()
+                response.read()
+            except (OSError, http.client.HTTPException) as e:
+                raise SegmentationUnavailable(f"크기 확인 실패: {e}")
+            finally:
+                conn.close()
+
+            if response.status in (301, 302, 303, 307, 308) and response.getheader('Location'):
+                url = urllib.parse.urljoin(url, response.getheader('Location'))
+                continue
+            break
+        else:
+            raise SegmentationUnavailable("리다이렉트가 너무 많습니다")
+
+        content_range = response.getheader('Content-Range') or ''
+        if response.status != 206 or '/' not in content_range:
+            raise SegmentationUnavailable(f"Range 요청 미지원 (HTTP {response.status})")
+        total = content_range.rsplit('/', 1)[1].strip()
+        if not total.isdigit():
+            raise SegmentationUnavailable("전체 크기를 알 수 없습니다")
+        if int(total) < self.min_size:
+            raise SegmentationUnavailable("파일이 작아 구간 다운로드가 필요 없습니다")
+
+        self.url = url
+        self.total = int(total)
+        return self.total
+
+    def download(self, progress: Optional[Callable[[int, int], None]] = None,
+                 interval: float = 0.2) -> int:
+        """
+        구간 다운로드 실행 (호출한 스레드는 진행 상황 보고만 담당)
+
+        progress(받은 바이트, 전체 바이트)는 호출한 스레드에서 interval 간격으로 불리며,
+        progress가 예외를 던지면(취소 등) 모든 연결을 멈추고 그 예외를 다시 던집니다.
+        임시 파일과 구간 기록은 남겨 두므로 다음 호출에서 이어받습니다.
+
+        Returns:
+            전체 크기 (바이트)
+        """
+        if self.total is None:
+            self.prepare()
+
+        segments = self._plan_segments()
+        pending = queue.Queue()
+        for index in segments:
+            pending.put(index)
+
+        self._stop.clear()
+        errors: List[BaseException] = []
+        with ThreadPoolExecutor(max_workers=min(self.connections, max(1, len(segments))),
+                                thread_name_prefix='segment') as executor:
+            futures = [executor.submit(self._worker, pending, errors)
+                       for _ in range(min(self.connections, max(1, len(segments))))]
+            try:
+                while not all(future.done() for future in futures):
+                    time.sleep(interval)
+                    if progress:
+                        progress(self.downloaded, self.total)
+            except BaseException:
+                self._stop.set()
+                raise
+
+        if errors:
+            raise errors[0]
+        if self._stop.is_set():
+            raise SegmentError("구간 다운로드가 중단되었습니다")
+        if progress:
+            progress(self.total, self.total)
+
+        try:
+            os.remove(self.state_path)
+        except OSError:
+            pass
+        return self.total
+
+    def cancel(self):
+        """진행 중인 구간 다운로드 중단"""
+        self._stop.set()
+
+    # ── 내부 ──
+    def _plan_segments(self) -> List[int]:
+        """임시 파일을 준비하고 아직 받지 않은 구간 번호 목록 반환"""
+        count = (self.total + self.segment_size - 1) // self.segment_size
+        done = set()
+
+        # 같은 크기의 임시 파일과 구간 기록이 있으면 완료된 구간은 건너뜀
+        if os.path.exists(self.path) and os.path.getsize(self.path) == self.total:
+            try:
+                with open(self.state_path, 'r', encoding='utf-8') as f:
+                    state = json.load(f)
+                if state.get('total') == self.total and state.get('segment_size') == self.segment_size:
+                    done = {i for i in state.get('done', []) if 0 <= i < count}
+            except (OSError, ValueError):
+                done = set()
+        else:
+            # 전체 크기로 미리 할당 (각 연결이 자기 위치에 바로 기록)
+            with open(self.path, 'wb') as f:
+                _preallocate(f, self.total)
+
+        self._done_segments = done
+        self.downloaded = sum(self._segment_bounds(i)[1] - self._segment_bounds(i)[0] + 1 for i in done)
+        self._save_state()
+        return [i for i in range(count) if i not in done]
+
+    def _segment_bounds(self, index: int) -> Tuple[int, int]:
+        start = index * self.segment_size
+        return start, min(start + self.segment_size, self.total) - 1
+
+    def _save_state(self):
+        data = {'total': self.total, 'segment_size': self.segment_size, 'done': sorted(self._done_segments)}
+        tmp_path = self.state_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.state_path)
+
+    def _worker(self, pending: queue.Queue, errors: List[BaseException]):
+        """연결 하나로 대기 중인 구간을 차례로 받음 (연결은 구간 사이에 재사용)"""
+        try:
+            with open(self.path, 'r+b') as f:
+                while not self._stop.is_set():
+                    try:
+                        index = pending.get_nowait()
+                    except queue.Empty:
+                        return
+                    if not self._fetch_segment(index, f):
+                        return
+                    with self._lock:
+                        self._done_segments.add(index)
+                        self._save_state()
+        except BaseException as e:
+            errors.append(e)
+            self._stop.set()
+        finally:
+            conn = getattr(self._local, 'conn', None)
+            if conn is not None:
+                conn.close()
+                self._local.conn = None
+
+    def _connection(self) -> Tuple[http.client.HTTPConnection, str]:
+        if getattr(self._local, 'conn', None) is None:
+            self._local.conn, self._local.path = _open_connection(self.url)
+        return self._local.conn, self._local.path
+
+    def _drop_connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+        self._local.conn = None
+
+    def _fetch_segment(self, index: int, f) -> bool:
+        """구간 하나 받기 (끊기면 받은 위치부터 재시도, 중단되면 False)"""
+        start, end = self._segment_bounds(index)
+        offset = start
+        attempt = 0
+        while offset <= end:
+            if self._stop.is_set():
+                return False
+            try:
+                conn, path = self._connection()
+                conn.request('GET', path, headers=dict(self.headers, Range=f'bytes={offset}-{end}'))
+                response = conn.getresponse()
+                if response.status in _FATAL_STATUS:
+                    response.read()
+                    raise SegmentError(f"HTTP {response.status} (구간 {start}-{end})")
+                if response.status != 206:
+                    response.read()
+                    raise OSError(f"HTTP {response.status} (구간 {start}-{end})")
+
+                f.seek(offset)
+                while offset <= end:
+                    if self._stop.is_set():
+                        self._drop_connection()
+                        return False
+                    chunk = response.read(min(_READ_SIZE, end - offset + 1))
+                    if not chunk:
+                        raise OSError("연결이 끊어졌습니다")
+                    f.write(chunk)
+                    offset += len(chunk)
+                    with self._lock:
+                        self.downloaded += len(chunk)
+                    if self.throttle:
+                        self.throttle(len(chunk))
+                attempt = 0
+            except (OSError, http.client.HTTPException) as e:
+                self._drop_connection()
+                attempt += 1
+                if attempt > self.retries:
+                    raise SegmentError(f"구간 {start}-{end} 다운로드 실패: {e}")
+                if self._stop.wait(_RETRY_BACKOFF * (2 ** (attempt - 1))):
+                    return False
+        return True
@@ -0,0 +1,277 @@
+"""
+구간(span) 기반 시작 시간 추적 (PyQt6 비의존)
+
+- span()/start(): 이름 있는 구간을 측정 (스레드별로 중첩, 스레드 ID 기록)
+- instant(): 한 시점 이벤트 (상태 메시지 등)
+- export_chrome(): Chrome trace-event JSON으로 저장 (chrome://tracing, Perfetto에서 열기)
+- check_baseline(): 구간별 합계 시간을 기록해 둔 기준값과 비교하여 느려진 구간 목록 반환
+
+명령줄에서 기준값 기록/비교:
+    python startup_trace.py baseline trace.json -o startup_baseline.json
+    python startup_trace.py check trace.json --baseline startup_baseline.json
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import threading
+import contextlib
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# 기준값 대비 허용 배율과 여유 시간 (짧은 구간의 측정 잡음 흡수)
+DEFAULT_TOLERANCE = 1.5
+DEFAULT_SLACK_MS = 50.0
+
+# 모듈을 처음 가져온 시각 (앱 시작 시각으로 사용)
+_ORIGIN_NS = time.perf_counter_ns()
+
+_logger = logging.getLogger(__name__)
+
+
+class Span:
+    """측정 중인 구간 (stop()을 호출하면 기록됨)"""
+
+    __slots__ = ('tracer', 'name', 'args', 'tid', 'stack', 'depth', 'start_ns', 'end_ns')
+
+    def __init__(self, tracer: 'Tracer', name: str, args: dict, stack: list):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+        self.tid = threading.get_ident()
+        self.stack = stack  # 시작한 스레드의 진행 중인 구간 목록
+        self.depth = len(stack)
+        self.start_ns = time.perf_counter_ns()
+        self.end_ns: Optional[int] = None
+
+    @property
+    def duration_ms(self) -> float:
+        end_ns = self.end_ns if self.end_ns is not None else time.perf_counter_ns()
+        return (end_ns - self.start_ns) / 1e6
+
+    def stop(self, **args):
+        """구간 종료 (args는 결과 정보로 추가, 두 번 호출하면 무시)"""
+        if self.end_ns is None:
+            self.end_ns = time.perf_counter_ns()
+            self.args.update(args)
+            self.tracer._finish(self)
+
+
+class Tracer:
+    """스레드 안전 구간 추적기"""
+
+    def __init__(self, origin_ns: Optional[int] = None, logger: Optional[logging.Logger] = None):
+        """
+        Args:
+            origin_ns: 경과 시간 기준 시각 (perf_counter_ns, None이면 모듈을 가져온 시각)
+            logger: 구간이 끝날 때마다 DEBUG 수준으로 기록할 로거 (None이면 이 모듈의 로거)
+        """
+        self.origin_ns = _ORIGIN_NS if origin_ns is None else origin_ns
+        self.logger = logger or _logger
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._spans: List[Span] = []
+        self._instants: List[Tuple[str, int, int, dict]] = []
+        self._thread_names: Dict[int, str] = {}
+
+    def start(self, name: str, **args) -> Span:
+        """구간 시작 (현재 스레드에서 진행 중인 구간 안에 중첩됨)"""
+        stack = self._stack()
+        span = Span(self, name, args, stack)
+        stack.append(span)
+        self._remember_thread()
+        return span
+
+    @contextlib.contextmanager
+    def span(self, name: str, **args) -> Iterator[Span]:
+        """블록 실행 시간을 구간으로 기록"""
+        span = self.start(name, **args)
+        try:
+            yield span
+        finally:
+            span.stop()
+
+    def instant(self, name: str, **args):
+        """한 시점 이벤트 기록"""
+        now = time.perf_counter_ns()
+        self._remember_thread()
+        with self._lock:
+            self._instants.append((name, threading.get_ident(), now, args))
+        self._log(f"{name}{self._format_args(args)}", now)
+
+    def phase_totals(self) -> Dict[str, float]:
+        """구간 이름별 합계 시간 (밀리초, 끝난 구간만)"""
+        with self._lock:
+            spans = list(self._spans)
+        return totals_from_events(_complete_event(span, self.origin_ns) for span in spans)
+
+    def chrome_events(self) -> List[dict]:
+        """Chrome trace-event 형식 이벤트 목록"""
+        with self._lock:
+            spans = list(self._spans)
+            instants = list(self._instants)
+            thread_names = dict(self._thread_names)
+        pid = os.getpid()
+        events = [{'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': name}}
+                  for tid, name in thread_names.items()]
+        events += [_complete_event(span, self.origin_ns) for span in spans]
+        events += [{'name': name, 'ph': 'i', 's': 't', 'pid': pid, 'tid': tid,
+                    'ts': (ts - self.origin_ns) / 1e3, 'args': args}
+                   for name, tid, ts, args in instants]
+        return events
+
+    def export_chrome(self, path: str):
+        """Chrome trace-event JSON 파일로 저장"""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': self.chrome_events(), 'displayTimeUnit': 'ms'}, f, ensure_ascii=False)
+
+    # ── 내부 ──
+    def _stack(self) -> List[Span]:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _remember_thread(self):
+        tid = threading.get_ident()
+        if tid not in self._thread_names:
+            with self._lock:
+                self._thread_names[tid] = threading.current_thread().name
+
+    def _finish(self, span: Span):
+        # 안쪽 구간을 닫지 않고 바깥 구간을 닫은 경우 안쪽 구간도 스택에서 제거
+        # (다른 스레드에서 닫을 수도 있으므로 시작한 스레드의 스택 기준)
+        with self._lock:
+            if span in span.stack:
+                del span.stack[span.stack.index(span):]
+            self._spans.append(span)
+        self._log(f"{'  ' * span.depth}{span.name}{self._format_args(span.args)} ({span.duration_ms:.1f}ms)",
+                  span.end_ns)
+
+    @staticmethod
+    def _format_args(args: dict) -> str:
+        return f" [{', '.join(f'{k}={v}' for k, v in args.items())}]" if args else ''
+
+    def _log(self, text: str, at_ns: int):
+        self.logger.debug("[+%7.1fms] %s", (at_ns - self.origin_ns) / 1e6, text)
+
+
+def _complete_event(span: Span, origin_ns: int) -> dict:
+    return {'name': span.name, 'ph': 'X', 'pid': os.getpid(), 'tid': span.tid,
+            'ts': (span.start_ns - origin_ns) / 1e3, 'dur': (span.end_ns - span.start_ns) / 1e3,
+            'args': span.args}
+
+
+def totals_from_events(events) -> Dict[str, float]:
+    """Chrome trace-event 목록에서 구간 이름별 합계 시간 (밀리초)"""
+    totals: Dict[str, float] = {}
+    for event in events:
+        if event.get('ph') == 'X':
+            totals[event['name']] = totals.get(event['name'], 0.0) + event.get('dur', 0) / 1e3
+    return totals
+
+
+def load_trace_totals(path: str) -> Dict[str, float]:
+    """Chrome trace-event JSON 파일의 구간별 합계 시간"""
+    with open(path, 'r', encoding='utf-8') as f:
+        try:
+            data = json.load(f)
+        except ValueError as e:
+            raise ValueError(f"JSON을 읽을 수 없습니다: {path} ({e})") from e
+    events = data.get('traceEvents', []) if isinstance(data, dict) else data
+    if not isinstance(events, list) or not all(isinstance(event, dict) for event in events):
+        raise ValueError(f"Chrome trace-event 형식이 아닙니다: {path}")
+    return totals_from_events(events)
+
+
+def load_baseline(path: str) -> Dict[str, float]:
+    """기준값 파일 (구간 이름 -> 밀리초)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        try:
+            baseline = json.load(f)
+        except ValueError as e:
+            raise ValueError(f"JSON을 읽을 수 없습니다: {path} ({e})") from e
+    if not isinstance(baseline, dict) or not all(isinstance(ms, (int, float)) for ms in baseline.values()):
+        raise ValueError(f"기준값 파일 형식이 아닙니다: {path}")
+    return baseline
+
+
+def check_baseline(totals: Dict[str, float], baseline: Dict[str, float],
+                   tolerance: float = DEFAULT_TOLERANCE,
+                   slack_ms: float = DEFAULT_SLACK_MS) -> List[Tuple[str, float, float]]:
+    """
+    기준값보다 느려진 구간 목록
+
+    Args:
+        totals: 이번 측정의 구간별 합계 시간 (밀리초)
+        baseline: 기준 구간별 시간 (밀리초, 여기에 있는 구간만 비교)
+        tolerance: 허용 배율 (기준값 x 배율 + 여유 시간까지 허용)
+        slack_ms: 여유 시간 (밀리초)
+
+    Returns:
+        [(구간 이름, 측정값, 허용값), ...] (없으면 빈 목록)
+    """
+    regressions = []
+    for name, expected in baseline.items():
+        actual = totals.get(name)
+        allowed = expected * tolerance + slack_ms
+        if actual is not None and actual > allowed:
+            regressions.append((name, actual, allowed))
+    return regressions
+
+
+_shared_tracer: Optional[Tracer] = None
+_shared_lock = threading.Lock()
+
+
+def get_tracer() -> Tracer:
+    """프로세스 공용 추적기 인스턴스"""
+    global _shared_tracer
+    with _shared_lock:
+        if _shared_tracer is None:
+            _shared_tracer = Tracer()
+        return _shared_tracer
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="시작 시간 추적 결과로 기준값 기록/비교")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    record = commands.add_parser('baseline', help="추적 파일의 구간별 시간을 기준값으로 저장")
+    record.add_argument('trace', help="Chrome trace-event JSON 파일")
+    record.add_argument('-o', '--output', default='startup_baseline.json', help="기준값 파일")
+
+    check = commands.add_parser('check', help="기준값보다 느려진 구간이 있으면 실패 (종료 코드 1)")
+    check.add_argument('trace', help="Chrome trace-event JSON 파일")
+    check.add_argument('--baseline', default='startup_baseline.json', help="기준값 파일")
+    check.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE, help="허용 배율")
+    check.add_argument('--slack-ms', type=float, default=DEFAULT_SLACK_MS, help="여유 시간 (밀리초)")
+    args = parser.parse_args(argv)
+
+    # 읽을 수 없거나 형식이 잘못된 파일은 추적 정보 대신 한 줄 오류로 알림 (종료 코드 2)
+    try:
+        totals = load_trace_totals(args.trace)
+        if args.command == 'baseline':
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump({name: round(ms, 1) for name, ms in sorted(totals.items())}, f,
+                          ensure_ascii=False, indent=2)
+            print(f"기준값 저장: {args.output} ({len(totals)}개 구간)")
+            return 0
+        baseline = load_baseline(args.baseline)
+    except (OSError, ValueError) as e:
+        print(f"오류: {e}", file=sys.stderr)
+        return 2
+
+    regressions = check_baseline(totals, baseline, args.tolerance, args.slack_ms)
+    for name, actual, allowed in regressions:
+        print(f"✗ {name}: {actual:.1f}ms (허용 {allowed:.1f}ms, 기준 {baseline[name]:.1f}ms)", file=sys.stderr)
+    if not regressions:
+        print(f"✓ 모든 구간이 기준값 이내 ({len(baseline)}개 구간)")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
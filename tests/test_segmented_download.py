@@ -0,0 +1,152 @@
+"""
+segmented_download를 로컬 Range 서버로 확인하는 테스트
+
+- Range 지원 서버에서 여러 연결로 구간 다운로드
+- Range를 무시하는 서버에서는 yt-dlp 기본 HTTP 다운로드(HttpFD)로 대체
+- 중간에 끊긴 구간은 재시도하고, 실패한 다운로드는 .segments 기록으로 이어받기
+"""
+
+import os
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import segmented_download
+from segmented_download import SegmentationUnavailable, SegmentedDownloader, SegmentError
+
+SEGMENT_SIZE = 64 * 1024
+DATA = bytes(range(256)) * (SEGMENT_SIZE * 6 // 256 + 100)  # 마지막 구간은 짧게
+
+
+class RangeHandler(BaseHTTPRequestHandler):
+    """DATA를 보내는 HTTP/1.1 핸들러 (서버 속성으로 Range 무시/구간 끊기 동작 지정)"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        match = re.fullmatch(r'bytes=(\d+)-(\d*)', self.headers.get('Range') or '')
+        if server.ignore_range or match is None:
+            start, end = 0, len(DATA) - 1
+            self.send_response(200)
+        else:
+            start = int(match.group(1))
+            end = min(int(match.group(2) or len(DATA) - 1), len(DATA) - 1)
+            self.send_response(206)
+            self.send_header('Content-Range', f'bytes {start}-{end}/{len(DATA)}')
+        self.send_header('Content-Length', str(end - start + 1))
+        self.send_header('Content-Type', 'application/octet-stream')
+        self.end_headers()
+
+        with server.lock:
+            server.requests.append((start, end))
+            cut = start in server.cut_at and server.cut_at[start] > 0
+            if cut:
+                server.cut_at[start] -= 1
+        if cut:
+            # 절반만 보내고 연결 끊기
+            self.wfile.write(DATA[start:start + (end - start + 1) // 2])
+            self.wfile.flush()
+            self.close_connection = True
+            return
+        self.wfile.write(DATA[start:end + 1])
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), RangeHandler)
+    httpd.daemon_threads = True
+    httpd.ignore_range = False
+    httpd.cut_at = {}  # 구간 시작 위치 -> 끊을 횟수
+    httpd.requests = []
+    httpd.lock = threading.Lock()
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    httpd.url = f'http://127.0.0.1:{httpd.server_port}/video.mp4'
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(segmented_download, '_RETRY_BACKOFF', 0.01)
+
+
+def _downloader(server, path, **kwargs):
+    kwargs.setdefault('connections', 3)
+    return SegmentedDownloader(server.url, str(path), segment_size=SEGMENT_SIZE, min_size=0, **kwargs)
+
+
+def test_ranged_download(server, tmp_path):
+    path = tmp_path / 'video.mp4.part'
+    reported = []
+
+    total = _downloader(server, path).download(progress=lambda done, size: reported.append((done, size)),
+                                               interval=0.01)
+
+    assert total == len(DATA)
+    assert path.read_bytes() == DATA
+    assert reported[-1] == (len(DATA), len(DATA))
+    assert not os.path.exists(str(path) + '.segments')
+    # 확인 요청 하나 + 구간마다 요청 하나
+    segments = {start for start, _ in server.requests[1:]}
+    assert segments == set(range(0, len(DATA), SEGMENT_SIZE))
+
+
+def test_server_ignoring_range_is_unavailable(server, tmp_path):
+    server.ignore_range = True
+    with pytest.raises(SegmentationUnavailable):
+        _downloader(server, tmp_path / 'video.mp4.part').prepare()
+
+
+def test_server_ignoring_range_falls_back_to_httpfd(server, tmp_path):
+    pytest.importorskip('yt_dlp')
+    from ydl_factory import create_youtube_dl
+
+    server.ignore_range = True
+    path = tmp_path / 'video.mp4'
+    info = {'id': 'video', 'url': server.url, 'protocol': 'http', 'ext': 'mp4', 'http_headers': {}}
+    with create_youtube_dl({'quiet': True, 'noprogress': True}, connections=4) as ydl:
+        success, _ = ydl.dl(str(path), info)
+
+    assert success
+    assert path.read_bytes() == DATA
+    # 구간 다운로드 없이 전체 요청만 들어옴
+    assert all(request == (0, len(DATA) - 1) for request in server.requests)
+
+
+def test_interrupted_segment_is_retried(server, tmp_path):
+    path = tmp_path / 'video.mp4.part'
+    server.cut_at[SEGMENT_SIZE * 2] = 2
+
+    _downloader(server, path, retries=3).download(interval=0.01)
+
+    assert path.read_bytes() == DATA
+    # 끊긴 구간은 받은 위치부터 다시 요청
+    retried = [start for start, _ in server.requests if SEGMENT_SIZE * 2 < start < SEGMENT_SIZE * 3]
+    assert retried
+
+
+def test_failed_download_resumes_from_segment_state(server, tmp_path):
+    path = tmp_path / 'video.mp4.part'
+    failing = SEGMENT_SIZE * 4
+    server.cut_at[failing] = 1
+
+    with pytest.raises(SegmentError):
+        _downloader(server, path, connections=1, retries=0).download(interval=0.01)
+    assert os.path.exists(str(path) + '.segments')
+
+    server.requests.clear()
+    _downloader(server, path, connections=1).download(interval=0.01)
+
+    assert path.read_bytes() == DATA
+    # 이미 받은 앞쪽 구간은 다시 받지 않음
+    starts = [start for start, _ in server.requests[1:]]
+    assert min(starts) == failing
+    assert not os.path.exists(str(path) + '.segments')
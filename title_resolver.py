@@ -0,0 +1,108 @@
+"""
+백그라운드 영상 정보(제목) 조회 풀
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Set
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+from metadata_cache import extract_video_id, get_metadata_cache
+from ydl_pool import get_ydl_pool
+
+# 조회 스레드 수
+DEFAULT_MAX_WORKERS = 4
+
+
+# 정보 조회용 yt-dlp 옵션
+_RESOLVE_OPTS = {
+    'quiet': True,
+    'no_warnings': True,
+    'extract_flat': False,
+    'noplaylist': True,  # 플레이리스트 무시, 단일 비디오만
+}
+
+
+def _resolve_batch(urls: List[str], on_resolved, on_failed):
+    """URL 묶음을 풀에서 빌린 YoutubeDL 인스턴스 하나로 순서대로 조회 (풀 스레드에서 실행)"""
+    cache = get_metadata_cache()
+    pending = []
+    for url in urls:
+        info = cache.get(extract_video_id(url)) if cache else None
+        if info is not None:
+            on_resolved(url, info)
+        else:
+            pending.append(url)
+    if not pending:
+        return
+
+    # 조회 실패는 URL별로 처리하므로 인스턴스는 계속 재사용 가능
+    with get_ydl_pool().borrow(_RESOLVE_OPTS) as ydl:
+        for url in pending:
+            try:
+                info = ydl.sanitize_info(ydl.extract_info(url, download=False, process=False))
+            except Exception as e:
+                on_failed(url, str(e))
+                continue
+
+            if cache:
+                cache.put(extract_video_id(url), info)
+            on_resolved(url, info)
+
+
+class TitleResolver(QObject):
+    """
+    URL의 영상 정보를 백그라운드 스레드 풀에서 조회
+
+    같은 이벤트 루프 틱에 요청된 URL은 한 번에 모아(batch) 스레드 수만큼 나눠 조회하고,
+    이미 조회 중인 URL은 다시 요청하지 않습니다(dedupe). 결과는 시그널로 GUI 스레드에 전달됩니다.
+    """
+
+    resolved = pyqtSignal(str, dict)  # (URL, extract_info(process=False) 결과)
+    failed = pyqtSignal(str, str)  # (URL, 오류 메시지)
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS, parent=None):
+        super().__init__(parent)
+        self._max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='title-resolver')
+        self._batch: Dict[str, None] = {}  # 이번 틱에 모인 URL (순서 유지)
+        self._in_flight: Set[str] = set()
+
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(0)
+        self._flush_timer.timeout.connect(self._flush)
+
+        self.resolved.connect(self._on_done)
+        self.failed.connect(self._on_done)
+
+    def request(self, url: str):
+        """URL 조회 요청 (이미 대기/조회 중이면 무시)"""
+        if url in self._in_flight or url in self._batch:
+            return
+        self._batch[url] = None
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def is_pending(self, url: str) -> bool:
+        return url in self._in_flight or url in self._batch
+
+    def shutdown(self):
+        """대기 중인 조회 취소 (진행 중인 조회는 백그라운드에서 마무리)"""
+        self._flush_timer.stop()
+        self._batch.clear()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _flush(self):
+        urls = list(self._batch)
+        self._batch.clear()
+        if not urls:
+            return
+
+        self._in_flight.update(urls)
+        chunks = min(self._max_workers, len(urls))
+        for i in range(chunks):
+            self._executor.submit(_resolve_batch, urls[i::chunks], self.resolved.emit, self.failed.emit)
+
+    def _on_done(self, url: str, *_):
+        self._in_flight.discard(url)
@@ -0,0 +1,215 @@
+"""
+다운로드 속도 옵션을 적용한 YoutubeDL 생성 (PyQt6 비의존)
+
+- 구간 다운로드: 직접 받는 http(s) 포맷을 SegmentedDownloader로 여러 연결에 나눠 받음
+- 포맷 동시 다운로드: bestvideo+bestaudio처럼 여러 포맷을 합치는 경우 각 포맷을 동시에 받고,
+  모두 끝나면 바로 병합(후처리) 시작
+- 후처리 슬롯: 후처리 전후를 감싸는 컨텍스트 매니저 (예: postprocess_pool로 동시 ffmpeg 수 제한)
+- 속도 제한: 받은 바이트 수를 throttle 함수에 알려 대기 (예: bandwidth의 공용 토큰 버킷)
+
+yt-dlp는 처음 YoutubeDL을 만들 때 import합니다.
+"""
+
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, ContextManager, Optional
+
+from segmented_download import MAX_CONNECTIONS, SegmentationUnavailable, SegmentedDownloader
+
+_ydl_class = None
+
+
+class FormatDownloadAborted(Exception):
+    """함께 받던 다른 포맷이 실패하여 중단됨"""
+
+
+def _fast_youtube_dl_class():
+    """속도 옵션을 지원하는 YoutubeDL 하위 클래스 (한 번만 생성)"""
+    global _ydl_class
+    if _ydl_class is not None:
+        return _ydl_class
+
+    import yt_dlp
+    from yt_dlp.downloader.http import HttpFD
+    from yt_dlp.utils import DownloadError
+
+    class SegmentedHttpFD(HttpFD):
+        """Range 지원 서버는 구간 다운로드, 아니면 yt-dlp 기본 HTTP 다운로드"""
+
+        connections = 4
+
+        def real_download(self, filename, info_dict):
+            tmpfilename = self.temp_name(filename)
+            downloader = SegmentedDownloader(
+                info_dict['url'], tmpfilename, info_dict.get('http_headers'),
+                connections=self.connections, throttle=self.ydl.throttle,
+            )
+            try:
+                total = downloader.prepare()
+            except SegmentationUnavailable:
+                return super().real_download(filename, info_dict)
+
+            self.report_destination(filename)
+            started = time.time()
+            resumed = None
+
+            def report(downloaded, total_bytes):
+                nonlocal resumed
+                if resumed is None:
+                    resumed = downloaded
+                elapsed = time.time() - started
+                speed = (downloaded - resumed) / elapsed if elapsed > 0 else None
+                self._hook_progress({
+                    'status': 'downloading',
+                    'downloaded_bytes': downloaded,
+                    'total_bytes': total_bytes,
+                    'tmpfilename': tmpfilename,
+                    'filename': filename,
+                    'speed': speed,
+                    'eta': (total_bytes - downloaded) / speed if speed else None,
+                    'elapsed': elapsed,
+                }, info_dict)
+
+            downloader.download(progress=report)
+            self.try_rename(tmpfilename, filename)
+            self._hook_progress({
+                'status': 'finished',
+                'downloaded_bytes': total,
+                'total_bytes': total,
+                'filename': filename,
+                'elapsed': time.time() - started,
+            }, info_dict)
+            return True
+
+    class FastYoutubeDL(yt_dlp.YoutubeDL):
+        """구간 다운로드와 포맷 동시 다운로드를 지원하는 YoutubeDL"""
+
+        segment_connections = 1
+        parallel_formats = False
+        postprocess_slot = None  # 후처리를 감싸는 컨텍스트 매니저 팩토리 (None이면 바로 실행)
+        throttle = None  # 받은 바이트 수를 받아 속도 제한만큼 대기하는 함수 (None이면 제한 없음)
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self._format_futures = None  # 동시 다운로드 중인 포맷 (process_info 실행 중에만 리스트)
+            self._format_abort = threading.Event()
+            self._throttled_bytes = {}  # 파일별로 속도 제한에 반영한 바이트 수
+            self.add_progress_hook(self._check_format_abort)
+            self.add_progress_hook(self._throttle_hook)
+
+        def process_info(self, info_dict):
+            # 여러 포맷을 합치는 경우에만 포맷별 다운로드를 동시에 실행
+            formats = info_dict.get('requested_formats') or ()
+            if not self.parallel_formats or len(formats) < 2:
+                return super().process_info(info_dict)
+
+            self._format_futures = []
+            self._format_abort.clear()
+            executor = ThreadPoolExecutor(max_workers=len(formats), thread_name_prefix='format')
+            self._format_executor = executor
+            try:
+                return super().process_info(info_dict)
+            finally:
+                # 후처리 전에 빠져나간 경우에도 다운로드 스레드를 남기지 않음
+                self._format_abort.set()
+                executor.shutdown(wait=True)
+                self._format_futures = None
+
+        def dl(self, name, info, subtitle=False, test=False):
+            if self._format_futures is not None and not subtitle and not test:
+                # 포맷 다운로드는 백그라운드로 넘기고 바로 다음 포맷으로 진행 (결과는 post_process에서 확인)
+                self._format_futures.append(self._format_executor.submit(self._dl_format, name, info))
+                return True, True
+            return self._dl_format(name, info, subtitle, test)
+
+        def post_process(self, filename, info, *args, **kwargs):
+            if self._format_futures:
+                self._wait_formats()
+            if self.postprocess_slot is None:
+                return super().post_process(filename, info, *args, **kwargs)
+            with self.postprocess_slot():
+                return super().post_process(filename, info, *args, **kwargs)
+
+        def _dl_format(self, name, info, subtitle=False, test=False):
+            # 프록시/쿠키가 필요한 경우는 yt-dlp 기본 다운로더에 맡김
+            if (self.segment_connections <= 1 or subtitle or test or name == '-'
+                    or info.get('protocol') not in ('http', 'https')
+                    or self.params.get('proxy') or self.params.get('cookiefile')):
+                return super().dl(name, info, subtitle=subtitle, test=test)
+
+            fd = SegmentedHttpFD(self, self.params)
+            fd.connections = self.segment_connections
+            for hook in self._progress_hooks:
+                # 구간 다운로드는 조각마다 직접 속도 제한 (진행 보고 스레드에서 제한하면 효과 없음)
+                if hook != self._throttle_hook:
+                    fd.add_progress_hook(hook)
+
+            new_info = dict(info)
+            new_info['http_headers'] = dict(self.params.get('http_headers') or {},
+                                            **(info.get('http_headers') or {}))
+            return fd.download(name, new_info, subtitle)
+
+        def _wait_formats(self):
+            """동시 다운로드한 포맷이 모두 끝날 때까지 대기 (하나라도 실패하면 나머지를 중단하고 예외)"""
+            futures, self._format_futures = self._format_futures, []
+            error = None
+            for future in futures:
+                try:
+                    success, _ = future.result()
+                    if not success and error is None:
+                        error = DownloadError("포맷 다운로드 실패")
+                except BaseException as e:
+                    if error is None or isinstance(error, FormatDownloadAborted):
+                        error = e
+                if error is not None:
+                    self._format_abort.set()
+            if error is not None:
+                raise error
+
+        def _throttle_hook(self, d):
+            # 진행 후크는 블록/조각마다 불리므로 직전 호출 이후 받은 양만큼 제한
+            # (이어받기한 파일의 첫 호출은 기준값만 기록)
+            if self.throttle is None:
+                return
+            key = d.get('tmpfilename') or d.get('filename')
+            if d['status'] != 'downloading':
+                self._throttled_bytes.pop(key, None)
+                return
+            downloaded = d.get('downloaded_bytes') or 0
+            previous = self._throttled_bytes.get(key)
+            self._throttled_bytes[key] = downloaded
+            if previous is not None and downloaded > previous:
+                self.throttle(downloaded - previous)
+
+        def _check_format_abort(self, d):
+            if self._format_futures is not None and self._format_abort.is_set():
+                raise FormatDownloadAborted("함께 받던 포맷이 실패하여 중단합니다")
+
+    _ydl_class = FastYoutubeDL
+    return _ydl_class
+
+
+def create_youtube_dl(ydl_opts: dict, connections: int = 1, parallel_formats: bool = False,
+                      postprocess_slot: Optional[Callable[[], ContextManager]] = None,
+                      throttle: Optional[Callable[[int], None]] = None):
+    """
+    YoutubeDL 인스턴스 생성
+
+    Args:
+        ydl_opts: yt-dlp 옵션
+        connections: 포맷당 동시 연결 수 (2 이상이면 직접 받는 http(s) 포맷을 구간 다운로드)
+        parallel_formats: 비디오+오디오처럼 합칠 포맷들을 동시에 다운로드
+        postprocess_slot: 후처리를 감쌀 컨텍스트 매니저를 반환하는 함수 (다운로드가 모두 끝난 뒤 진입)
+        throttle: 받은 바이트 수를 받아 속도 제한만큼 대기하는 함수 (여러 스레드에서 호출됨)
+    """
+    if connections <= 1 and not parallel_formats and postprocess_slot is None and throttle is None:
+        import yt_dlp
+        return yt_dlp.YoutubeDL(ydl_opts)
+
+    ydl = _fast_youtube_dl_class()(ydl_opts)
+    ydl.segment_connections = min(int(connections), MAX_CONNECTIONS)
+    ydl.parallel_formats = parallel_formats
+    ydl.postprocess_slot = postprocess_slot
+    ydl.throttle = throttle
+    return ydl
@@ -0,0 +1,160 @@
+"""
+재사용 YoutubeDL 인스턴스 풀 (PyQt6 비의존)
+
+YoutubeDL을 새로 만들 때마다 쿠키 저장소, HTTP 연결(TLS 핸드셰이크), 추출기 초기화가
+반복됩니다. 작업이 끝난 인스턴스를 옵션별로 보관했다가 같은 옵션의 다음 작업에 빌려주어
+연결(keep-alive)과 초기화된 추출기를 그대로 재사용합니다.
+
+작업마다 달라지는 옵션(저장 경로 템플릿과 폴더, 진행 후크)은 풀 키에서 빼고 빌릴 때마다 교체하며,
+작업 중 예외가 난 인스턴스는 상태를 믿을 수 없으므로 돌려받지 않고 닫습니다.
+"""
+
+import json
+import time
+import threading
+import contextlib
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# 키별로 보관할 최대 유휴 인스턴스 수
+DEFAULT_MAX_IDLE = 4
+
+# 이 시간 이상 쓰이지 않은 인스턴스는 닫음 (초, 서버가 keep-alive 연결을 끊는 시간과 비슷하게)
+DEFAULT_IDLE_TIMEOUT = 120.0
+
+# 빌릴 때마다 교체하는 작업별 옵션
+_PER_JOB_OPTIONS = ('outtmpl', 'paths', 'progress_hooks')
+
+
+def _options_key(ydl_opts: dict, extra: tuple) -> str:
+    """작업별 옵션을 제외한 옵션으로 풀 키 생성"""
+    shared = {k: v for k, v in ydl_opts.items() if k not in _PER_JOB_OPTIONS}
+    return json.dumps([shared, list(extra)], sort_keys=True, default=repr)
+
+
+def _default_factory(ydl_opts: dict):
+    import yt_dlp
+    return yt_dlp.YoutubeDL(ydl_opts)
+
+
+class _Entry:
+    """풀에 보관된 인스턴스와 생성 시점의 기본 상태"""
+
+    __slots__ = ('ydl', 'base_hooks', 'last_used')
+
+    def __init__(self, ydl):
+        self.ydl = ydl
+        self.base_hooks = list(ydl._progress_hooks)  # 인스턴스가 직접 등록한 후크 (작업 후크 제외)
+        self.last_used = time.monotonic()
+
+
+class YoutubeDLPool:
+    """옵션이 같은 작업끼리 YoutubeDL 인스턴스를 빌려 쓰는 스레드 안전 풀"""
+
+    def __init__(self, max_idle: int = DEFAULT_MAX_IDLE, idle_timeout: float = DEFAULT_IDLE_TIMEOUT):
+        """
+        Args:
+            max_idle: 키별 최대 유휴 인스턴스 수
+            idle_timeout: 유휴 인스턴스를 닫기까지의 시간 (초)
+        """
+        self.max_idle = max_idle
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._idle: Dict[str, List[_Entry]] = defaultdict(list)
+        self.created = 0
+        self.reused = 0
+
+    @contextlib.contextmanager
+    def borrow(self, ydl_opts: dict, factory: Optional[Callable[[dict], Any]] = None,
+               key_extra: Tuple = (), **attrs):
+        """
+        옵션에 맞는 YoutubeDL을 빌려 블록 실행 (정상 종료하면 풀에 반납)
+
+        Args:
+            ydl_opts: yt-dlp 옵션 (outtmpl, paths, progress_hooks는 빌릴 때마다 교체)
+            factory: 작업별 옵션을 뺀 옵션으로 새 인스턴스를 만드는 함수 (None이면 yt_dlp.YoutubeDL)
+            key_extra: factory가 옵션 외에 쓰는 설정 (같은 값끼리만 인스턴스 공유)
+            **attrs: 빌리는 동안 인스턴스에 설정할 속성 (반납 시 None으로 되돌림)
+        """
+        key = _options_key(ydl_opts, key_extra)
+        entry = self._take(key)
+        if entry is None:
+            shared_opts = {k: v for k, v in ydl_opts.items() if k not in _PER_JOB_OPTIONS}
+            entry = _Entry((factory or _default_factory)(shared_opts))
+            with self._lock:
+                self.created += 1
+        else:
+            with self._lock:
+                self.reused += 1
+
+        ydl = entry.ydl
+        self._prepare(entry, ydl_opts, attrs)
+        try:
+            yield ydl
+        except BaseException:
+            ydl.close()
+            raise
+        for name in attrs:
+            setattr(ydl, name, None)
+        self._give_back(key, entry)
+
+    def close(self):
+        """유휴 인스턴스를 모두 닫음 (쿠키 저장, 연결 종료)"""
+        with self._lock:
+            entries = [entry for entries in self._idle.values() for entry in entries]
+            self._idle.clear()
+        for entry in entries:
+            entry.ydl.close()
+
+    # ── 내부 ──
+    def _take(self, key: str) -> Optional[_Entry]:
+        """가장 최근에 반납된 유휴 인스턴스 (연결이 살아 있을 가능성이 높음)"""
+        expired = []
+        now = time.monotonic()
+        with self._lock:
+            for entries in self._idle.values():
+                expired += [e for e in entries if now - e.last_used > self.idle_timeout]
+                entries[:] = [e for e in entries if now - e.last_used <= self.idle_timeout]
+            entries = self._idle.get(key)
+            entry = entries.pop() if entries else None
+        for old in expired:
+            old.ydl.close()
+        return entry
+
+    def _give_back(self, key: str, entry: _Entry):
+        entry.last_used = time.monotonic()
+        with self._lock:
+            entries = self._idle[key]
+            entries.append(entry)
+            surplus = entries[:-self.max_idle] if len(entries) > self.max_idle else []
+            del entries[:len(surplus)]
+        for old in surplus:
+            old.ydl.close()
+
+    @staticmethod
+    def _prepare(entry: _Entry, ydl_opts: dict, attrs: dict):
+        """이전 작업의 흔적을 지우고 이번 작업의 옵션 적용"""
+        ydl = entry.ydl
+        # 후처리기가 바꿀 수 있는 옵션(postprocessor_args 등)은 원래 값으로 되돌림
+        ydl.params.update({k: v for k, v in ydl_opts.items() if k not in _PER_JOB_OPTIONS})
+        ydl.params['outtmpl'] = ydl_opts.get('outtmpl') or {}
+        ydl.params['paths'] = dict(ydl_opts.get('paths') or {})
+        ydl._parse_outtmpl()
+        ydl._progress_hooks = entry.base_hooks + list(ydl_opts.get('progress_hooks') or [])
+        ydl._num_downloads = 0
+        ydl._download_retcode = 0
+        for name, value in attrs.items():
+            setattr(ydl, name, value)
+
+
+_shared_pool: Optional[YoutubeDLPool] = None
+_shared_lock = threading.Lock()
+
+
+def get_ydl_pool() -> YoutubeDLPool:
+    """프로세스 공용 YoutubeDL 풀 인스턴스"""
+    global _shared_pool
+    with _shared_lock:
+        if _shared_pool is None:
+            _shared_pool = YoutubeDLPool()
+        return _shared_pool
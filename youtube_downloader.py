@@ -1,12 +1,30 @@
 #!/usr/bin/env python3
 """
 유튜브 영상을 고음질 M4A 오디오로 다운로드하는 프로그램
+
+배치 모드 (PyQt6 불필요):
+    python youtube_downloader.py --batch urls.txt -j 4 --results results.jsonl
+    cat manifest.jsonl | python youtube_downloader.py --batch - -o downloads
+    python youtube_downloader.py --playlist "https://www.youtube.com/playlist?list=..." -t video_720p
 """
 
 import os
 import sys
+import csv
+import json
+import time
+import argparse
+import contextlib
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
+from typing import Iterable, Iterator, List, Optional
 import yt_dlp
+from bandwidth import get_bandwidth_shaper, parse_rate
+from download_engine import DownloadEngine
+from download_presets import DOWNLOAD_TYPES, find_ffmpeg_path, get_extension, sanitize_filename
+from output_index import content_key
+from playlist_expander import completed_filter, is_collection_url, iter_playlist_entries
+from retry_policy import ConcurrencyGovernor, ErrorKind, RetryPolicy
 
 
 def download_youtube_audio(url, output_path='downloads'):
@@ -34,21 +52,27 @@ def download_youtube_audio(url, output_path='downloads'):
         'ignoreerrors': False,
     }
 
+    # 단일 다운로드는 yt-dlp 자체 속도 제한으로 충분 (전체/작업당 제한 중 작은 값)
+    shaper = get_bandwidth_shaper()
+    limits = [limit for limit in (shaper.current_limit, shaper.job_limit) if limit]
+    if limits:
+        ydl_opts['ratelimit'] = min(limits)
+
     try:
         print(f"\n유튜브 영상 다운로드 시작: {url}\n")
 
         with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            # 영상 정보 가져오기
-            info = ydl.extract_info(url, download=False)
-            video_title = info.get('title', 'Unknown')
-            duration = info.get('duration', 0)
+            # 영상 정보 가져오기 (포맷 선택 없이 1회 추출)
+            info = ydl.extract_info(url, download=False, process=False)
+            video_title = info.get('title') or 'Unknown'
+            duration = info.get('duration') or 0
 
             print(f"제목: {video_title}")
             print(f"길이: {duration // 60}분 {duration % 60}초")
             print(f"다운로드 폴더: {output_path}\n")
 
-            # 다운로드 실행
-            ydl.download([url])
+            # 다운로드 실행 (추출된 정보를 그대로 처리, 재추출 없음)
+            ydl.process_ie_result(info, download=True)
 
         print(f"\n✓ 다운로드 완료!")
         print(f"파일 위치: {output_path}/{video_title}.m4a")
@@ -58,17 +82,283 @@ def download_youtube_audio(url, output_path='downloads'):
         sys.exit(1)
 
 
+def load_manifest(lines: List[str], default_type: str = 'audio') -> List[dict]:
+    """
+    배치 입력 파싱
+
+    다음 형식을 지원합니다:
+        - URL 목록 (한 줄에 하나, '#'으로 시작하는 줄은 주석)
+        - CSV (헤더에 url 컬럼 필수, type/filename/output_dir 컬럼 선택)
+        - JSONL (한 줄에 하나의 객체, 키는 CSV와 동일)
+
+    Returns:
+        {'url', 'type', 'filename', 'output_dir'} 항목 목록
+    """
+    lines = [line.strip() for line in lines]
+    lines = [line for line in lines if line and not line.startswith('#')]
+    if not lines:
+        return []
+
+    if lines[0].startswith('{'):
+        rows = [json.loads(line) for line in lines]
+    elif 'url' in [col.strip().lower() for col in lines[0].split(',')]:
+        reader = csv.DictReader(lines)
+        rows = [{(k or '').strip().lower(): (v or '').strip() for k, v in row.items()} for row in reader]
+    else:
+        rows = [{'url': line} for line in lines]
+
+    items = []
+    for row in rows:
+        url = (row.get('url') or '').strip()
+        if not url:
+            continue
+        download_type = row.get('type') or default_type
+        if download_type not in DOWNLOAD_TYPES:
+            raise ValueError(f"알 수 없는 다운로드 형식: {download_type} ({url})")
+        items.append({
+            'url': url,
+            'type': download_type,
+            'filename': row.get('filename') or None,
+            'output_dir': row.get('output_dir') or None,
+        })
+    return items
+
+
+def download_item(item: dict, output_path: str, ffmpeg_location: str, connections: int = 1,
+                  retry_policy: Optional[RetryPolicy] = None,
+                  governor: Optional[ConcurrencyGovernor] = None,
+                  temp_dir: Optional[str] = None) -> dict:
+    """
+    배치 항목 하나 다운로드 (예외를 던지지 않고 결과 딕셔너리 반환)
+
+    Args:
+        retry_policy: 실패 시 재시도 정책 (None이면 기본값)
+        governor: 동시 실행 조절기 (서버 속도 제한이 감지되면 동시 다운로드 수를 줄임)
+        temp_dir: 임시/중간 파일을 둘 폴더 (None이면 저장 폴더)
+
+    Returns:
+        {'url', 'type', 'status' ('ok'|'error'), 'title', 'file', 'error', 'retries', 'elapsed'}
+    """
+    started = time.monotonic()
+    result = {'url': item['url'], 'type': item['type'], 'status': 'error',
+              'title': None, 'file': None, 'error': None, 'retries': 0}
+
+    save_dir = item.get('output_dir') or output_path
+
+    # 파일명이 없으면 영상 제목 사용 (yt-dlp 템플릿)
+    if item.get('filename'):
+        base_name = os.path.splitext(sanitize_filename(item['filename']))[0]
+    else:
+        base_name = '%(title).60s'
+
+    def on_retry(event):
+        result['retries'] = event['attempt']
+        print(f"  ↻ {item['url']}: {int(event['delay'])}초 후 재시도 ({event['attempt']}회) - {event['message']}",
+              file=sys.stderr)
+        if governor and event['kind'] == ErrorKind.THROTTLED.value:
+            governor.throttled()
+
+    engine = DownloadEngine(item['url'], os.path.join(save_dir, base_name + get_extension(item['type'])),
+                            item['type'], ffmpeg_location=ffmpeg_location, connections=connections,
+                            on_retry=on_retry, retry_policy=retry_policy, temp_dir=temp_dir)
+    with governor.slot() if governor else contextlib.nullcontext():
+        success, message = engine.run()
+    if success and governor:
+        governor.succeeded()
+
+    result['title'] = engine.title
+    result['file'] = engine.downloaded_file
+    if success:
+        result['status'] = 'ok'
+    else:
+        result['error'] = message
+    result['elapsed'] = round(time.monotonic() - started, 3)
+    return result
+
+
+def run_batch(items: Iterable[dict], output_path: str = 'downloads', jobs: int = 2,
+              results_path: Optional[str] = None, connections: int = 1, retries: int = 5,
+              temp_dir: Optional[str] = None) -> int:
+    """
+    배치 다운로드 실행
+
+    Args:
+        items: load_manifest() 결과 또는 항목을 하나씩 만드는 이터러블 (예: expand_playlists(),
+            다운로드 중인 항목이 jobs의 몇 배를 넘으면 다음 항목을 요청하지 않음)
+        output_path: 기본 다운로드 폴더
+        jobs: 동시 다운로드 수
+        results_path: 결과를 JSONL로 기록할 파일 (완료되는 순서대로 한 줄씩 기록)
+        connections: 포맷당 동시 연결 수 (2 이상이면 Range 구간 다운로드)
+        retries: 일시적 오류/서버 속도 제한 시 항목당 최대 재시도 횟수
+        temp_dir: 임시/중간 파일을 둘 폴더 (다른 디스크도 가능, 완료된 결과만 저장 폴더로 옮김)
+
+    Returns:
+        실패한 항목 수
+    """
+    total = len(items) if hasattr(items, '__len__') else None
+    ffmpeg_location = find_ffmpeg_path()
+    if not ffmpeg_location:
+        print("✗ FFmpeg를 찾을 수 없습니다. FFmpeg를 설치해주세요.", file=sys.stderr)
+        return total if total is not None else 1
+
+    # 서버 속도 제한이 감지되면 실행 중인 다운로드 수를 jobs 아래로 줄임
+    retry_policy = RetryPolicy(max_retries=retries)
+    governor = ConcurrencyGovernor(jobs)
+
+    results_file = open(results_path, 'w', encoding='utf-8') if results_path else None
+    done = failed = 0
+
+    def report(future):
+        nonlocal done, failed
+        done += 1
+        progress = f"{done}/{total}" if total is not None else str(done)
+        result = future.result()
+        if result['status'] == 'ok':
+            print(f"[{progress}] ✓ {result['title']} → {result['file']}", file=sys.stderr)
+        else:
+            failed += 1
+            print(f"[{progress}] ✗ {result['url']}: {result['error']}", file=sys.stderr)
+
+        if results_file:
+            results_file.write(json.dumps(result, ensure_ascii=False) + '\n')
+            results_file.flush()
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+            pending = set()
+            max_pending = max(1, jobs) * 2
+
+            def submit(item):
+                pending.add(executor.submit(download_item, item, output_path, ffmpeg_location, connections,
+                                            retry_policy, governor, temp_dir))
+                # 앞 항목이 끝날 때까지 다음 항목을 만들지 않음 (목록을 펼치는 이터러블도 그만큼만 진행)
+                while len(pending) >= max_pending:
+                    drain(FIRST_COMPLETED)
+
+            def drain(return_when):
+                finished, _ = wait(pending, return_when=return_when)
+                for future in finished:
+                    pending.discard(future)
+                    report(future)
+
+            # 같은 영상/형식이 여러 번 있으면 첫 항목을 먼저 받고, 나머지는 그 뒤에 실행하여 결과 파일을 재사용
+            seen = set()
+            repeats = []
+            for item in items:
+                key = (content_key(item['url']) or item['url'], item['type'])
+                if key in seen:
+                    repeats.append(item)
+                    continue
+                seen.add(key)
+                submit(item)
+            drain(ALL_COMPLETED)
+
+            for item in repeats:
+                submit(item)
+            drain(ALL_COMPLETED)
+    finally:
+        if results_file:
+            results_file.close()
+
+    print(f"\n완료: {done - failed}개 성공, {failed}개 실패", file=sys.stderr)
+    return failed
+
+
+def expand_playlists(items: Iterable[dict]) -> Iterator[dict]:
+    """
+    플레이리스트/채널 URL 항목을 영상 항목으로 펼침 (목록 페이지를 받는 대로 하나씩 반환)
+
+    펼친 항목은 원래 항목의 형식과 저장 폴더를 따르고 파일명은 영상 제목을 사용하며,
+    이미 같은 형식으로 받은 영상은 건너뜁니다. 목록을 가져오지 못하면 경고만 출력합니다.
+    """
+    for item in items:
+        if not is_collection_url(item['url']):
+            yield item
+            continue
+
+        print(f"플레이리스트 목록 가져오는 중: {item['url']}", file=sys.stderr)
+        count = 0
+        try:
+            for entry in iter_playlist_entries(item['url'], skip=completed_filter(item['type'])):
+                count += 1
+                yield dict(item, url=entry['url'], filename=None)
+        except Exception as e:
+            print(f"✗ 플레이리스트 목록 오류 ({count}개까지 추가됨): {item['url']}: {e}", file=sys.stderr)
+
+
+def main_batch(args):
+    """배치 모드 메인"""
+    if args.batch == '-':
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(args.batch, 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+
+    try:
+        items = load_manifest(lines, default_type=args.type)
+    except ValueError as e:
+        print(f"✗ 입력 파일 오류: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    if args.playlist:
+        items = expand_playlists(items)
+
+    failed = run_batch(items, args.output, args.jobs, args.results, args.connections, args.retries,
+                       args.temp_dir)
+    sys.exit(1 if failed else 0)
+
+
 def main():
     """메인 함수"""
+    parser = argparse.ArgumentParser(description="유튜브 고음질 오디오/비디오 다운로더")
+    parser.add_argument('url', nargs='?', help="유튜브 URL (단일 다운로드)")
+    parser.add_argument('output_dir', nargs='?', help="다운로드 폴더 (기본값: downloads)")
+    parser.add_argument('--batch', metavar='FILE', help="URL 목록/CSV/JSONL 파일 ('-'이면 표준 입력)")
+    parser.add_argument('-j', '--jobs', type=int, default=2, help="동시 다운로드 수 (기본값: 2)")
+    parser.add_argument('-t', '--type', default='audio', choices=DOWNLOAD_TYPES,
+                        help="기본 다운로드 형식 (기본값: audio)")
+    parser.add_argument('-o', '--output', default=None, help="다운로드 폴더 (기본값: downloads)")
+    parser.add_argument('--results', metavar='FILE', help="결과를 기록할 JSONL 파일")
+    parser.add_argument('--connections', type=int, default=1,
+                        help="포맷당 동시 연결 수, 2 이상이면 구간 다운로드 (기본값: 1)")
+    parser.add_argument('--retries', type=int, default=5,
+                        help="일시적 오류/서버 속도 제한 시 항목당 최대 재시도 횟수 (기본값: 5)")
+    parser.add_argument('--temp-dir', metavar='DIR',
+                        help="다운로드 중인 파일과 병합 전 파일을 둘 폴더 (기본값: 저장 폴더)")
+    parser.add_argument('--playlist', action='store_true',
+                        help="플레이리스트/채널 URL이면 목록의 영상을 모두 받음 (이미 받은 영상은 건너뜀)")
+    parser.add_argument('--limit-rate', type=parse_rate, default=0, metavar='RATE',
+                        help="모든 다운로드 합계 속도 제한, 예: 500K, 2M (기본값: 제한 없음)")
+    parser.add_argument('--job-limit-rate', type=parse_rate, default=0, metavar='RATE',
+                        help="작업당 속도 제한, 예: 1M (기본값: 제한 없음)")
+    args = parser.parse_args()
+
+    shaper = get_bandwidth_shaper()
+    shaper.global_limit = args.limit_rate
+    shaper.job_limit = args.job_limit_rate
+
+    if args.batch:
+        # 배치 모드에서는 위치 인자를 다운로드 폴더로 취급
+        args.output = args.output or args.url or 'downloads'
+        main_batch(args)
+        return
+
+    if args.playlist and args.url and is_collection_url(args.url):
+        # 목록을 펼치는 동안 앞 영상부터 다운로드 (배치 모드와 같은 경로)
+        item = {'url': args.url, 'type': args.type, 'filename': None, 'output_dir': None}
+        failed = run_batch(expand_playlists([item]), args.output_dir or args.output or 'downloads', args.jobs,
+                           args.results, args.connections, args.retries, args.temp_dir)
+        sys.exit(1 if failed else 0)
+
     print("=" * 60)
     print("유튜브 고음질 오디오 다운로더 (M4A)")
     print("=" * 60)
 
     # 명령줄 인자로 URL 받기
-    if len(sys.argv) > 1:
-        url = sys.argv[1]
+    if args.url:
+        url = args.url
         # 두 번째 인자로 출력 폴더를 받을 수 있음
-        output_path = sys.argv[2] if len(sys.argv) > 2 else 'downloads'
+        output_path = args.output_dir or args.output or 'downloads'
     else:
         # 사용자 입력 받기
         url = input("\n유튜브 URL을 입력하세요: ").strip()
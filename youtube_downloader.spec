@@ -9,6 +9,26 @@ a = Analysis(
     datas=[
         ('dependency_checker.py', '.'),
         ('youtube_worker.py', '.'),
+        ('download_scheduler.py', '.'),
+        ('metadata_cache.py', '.'),
+        ('title_resolver.py', '.'),
+        ('download_presets.py', '.'),
+        ('download_engine.py', '.'),
+        ('process_pool.py', '.'),
+        ('queue_model.py', '.'),
+        ('job_journal.py', '.'),
+        ('segmented_download.py', '.'),
+        ('ydl_factory.py', '.'),
+        ('postprocess_pool.py', '.'),
+        ('output_index.py', '.'),
+        ('bandwidth.py', '.'),
+        ('ydl_pool.py', '.'),
+        ('retry_policy.py', '.'),
+        ('disk_space.py', '.'),
+        ('playlist_expander.py', '.'),
+        ('binary_probe.py', '.'),
+        ('artifact_cache.py', '.'),
+        ('startup_trace.py', '.'),
     ],
     hiddenimports=[
         'PyQt6.QtCore',
@@ -19,6 +39,26 @@ a = Analysis(
         'yt_dlp.postprocessor',
         'dependency_checker',
         'youtube_worker',
+        'download_scheduler',
+        'metadata_cache',
+        'title_resolver',
+        'download_presets',
+        'download_engine',
+        'process_pool',
+        'queue_model',
+        'job_journal',
+        'segmented_download',
+        'ydl_factory',
+        'postprocess_pool',
+        'output_index',
+        'bandwidth',
+        'ydl_pool',
+        'retry_policy',
+        'disk_space',
+        'playlist_expander',
+        'binary_probe',
+        'artifact_cache',
+        'startup_trace',
     ],
     hookspath=[],
     hooksconfig={},
@@ -3,53 +3,85 @@
 """
 
 import os
-import re
 import sys
+import multiprocessing
 import subprocess
 import json
 import time
 import logging
 from datetime import datetime
-from typing import Dict, Optional
-from PyQt6.QtCore import Qt, QThread, pyqtSignal
+from typing import Dict, List, Optional, Set
+from startup_trace import check_baseline, get_tracer, load_baseline  # 시작 시각 기준이므로 PyQt6보다 먼저 import
+from PyQt6.QtCore import Qt, QThread, QTimer, pyqtSignal
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QLabel,
-    QPushButton, QFileDialog, QTableWidget, QTableWidgetItem, QHeaderView,
+    QPushButton, QFileDialog, QTableView, QHeaderView,
     QMessageBox, QComboBox, QGroupBox, QAbstractItemView, QMenu, QSplashScreen,
-    QProgressBar, QCheckBox
+    QProgressBar, QCheckBox, QSpinBox
 )
 from PyQt6.QtGui import QAction, QPixmap, QPainter, QColor, QFont
+from bandwidth import get_bandwidth_shaper
+from download_engine import format_progress_event
+from disk_space import get_disk_reservations
+from download_presets import estimate_download_size, get_extension, sanitize_filename
+from download_scheduler import DownloadScheduler
+from job_journal import open_job_journal
+from metadata_cache import extract_video_id, get_metadata_cache
+from output_index import content_key
+from playlist_expander import completed_filter, is_collection_url
+from postprocess_pool import default_postprocess_workers, get_postprocess_pool
+from segmented_download import MAX_CONNECTIONS
+from retry_policy import ConcurrencyGovernor, ErrorKind
+from queue_model import FORMAT_LABELS, QUALITY_LABELS, Job, JobStatus, QueueTableModel
+from title_resolver import TitleResolver
+from ydl_pool import get_ydl_pool
 
 # Lazy imports - 필요할 때만 import (시작 속도 개선)
 yt_dlp = None
 YoutubeDownloadWorker = None
+ProcessDownloadWorker = None
+PlaylistExpandWorker = None
 DependencyChecker = None
 
 def lazy_import_modules():
     """필요한 모듈을 lazy import"""
-    global yt_dlp, YoutubeDownloadWorker, DependencyChecker
+    global yt_dlp, YoutubeDownloadWorker, ProcessDownloadWorker, PlaylistExpandWorker, DependencyChecker
 
+    tracer = get_tracer()
     if yt_dlp is None:
-        log_timing("Importing yt_dlp module")
-        import yt_dlp as _yt_dlp
+        with tracer.span("import yt_dlp"):
+            import yt_dlp as _yt_dlp
         yt_dlp = _yt_dlp
-        log_timing("yt_dlp module imported")
 
     if YoutubeDownloadWorker is None:
-        log_timing("Importing YoutubeDownloadWorker")
-        from youtube_worker import YoutubeDownloadWorker as _Worker
+        with tracer.span("import youtube_worker"):
+            from youtube_worker import YoutubeDownloadWorker as _Worker
+            from youtube_worker import ProcessDownloadWorker as _ProcessWorker
+            from youtube_worker import PlaylistExpandWorker as _PlaylistWorker
         YoutubeDownloadWorker = _Worker
-        log_timing("YoutubeDownloadWorker imported")
+        ProcessDownloadWorker = _ProcessWorker
+        PlaylistExpandWorker = _PlaylistWorker
 
     if DependencyChecker is None:
-        log_timing("Importing DependencyChecker")
-        from dependency_checker import DependencyChecker as _Checker
+        with tracer.span("import dependency_checker"):
+            from dependency_checker import DependencyChecker as _Checker
         DependencyChecker = _Checker
-        log_timing("DependencyChecker imported")
 
 # 설정 파일 경로
 SETTINGS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "settings.json")
 
+# 동시 다운로드 기본값
+DEFAULT_MAX_CONCURRENT = 3
+
+# 진행 상태 화면 갱신 주기 (밀리초) - 이 주기마다 모인 진행 이벤트를 한 번에 반영
+PROGRESS_REFRESH_MS = 50
+
+# 디스크 공간 부족으로 보류된 작업 재확인 주기 (밀리초)
+DISK_RECHECK_MS = 10 * 1000
+
+# 속도 제한 시간대 일정 확인 주기 (밀리초)
+BANDWIDTH_REFRESH_MS = 30 * 1000
+
 # 로그 설정
 def setup_logging():
     """로그 시스템 설정"""
@@ -79,20 +111,31 @@ def setup_logging():
 
     return logging.getLogger(__name__)
 
-# 전역 시작 시간
-APP_START_TIME = time.time()
+# 시작 구간 추적 결과 저장 파일 / 비교할 기준값 파일 (환경 변수, 비어 있으면 사용 안 함)
+TRACE_FILE_ENV = 'YTDL_TRACE'
+TRACE_BASELINE_ENV = 'YTDL_TRACE_BASELINE'
 
-def log_timing(message):
-    """시작 시간으로부터 경과 시간과 함께 로그 출력"""
-    elapsed = (time.time() - APP_START_TIME) * 1000  # 밀리초
-    log_msg = f"[+{elapsed:7.1f}ms] {message}"
 
-    # 로그가 설정되어 있으면 로그에 기록
-    if logging.getLogger().hasHandlers():
-        logging.info(log_msg)
-    else:
-        # 로그가 설정되지 않았으면 print로 출력
-        print(log_msg, flush=True)
+def finish_startup_trace():
+    """시작 완료 후 구간별 합계 기록, 추적 파일 저장, 기준값보다 느려진 구간 경고"""
+    tracer = get_tracer()
+    totals = tracer.phase_totals()
+    logging.info("시작 구간 합계: " + ", ".join(f"{name}={ms:.1f}ms" for name, ms in totals.items()))
+
+    trace_path = os.environ.get(TRACE_FILE_ENV)
+    if trace_path:
+        tracer.export_chrome(trace_path)
+        logging.info(f"시작 추적 파일 저장: {trace_path}")
+
+    baseline_path = os.environ.get(TRACE_BASELINE_ENV)
+    if baseline_path:
+        try:
+            baseline = load_baseline(baseline_path)
+        except (OSError, ValueError) as e:
+            logging.warning(f"시작 기준값을 읽을 수 없습니다: {e}")
+            return
+        for name, actual, allowed in check_baseline(totals, baseline):
+            logging.warning(f"시작 구간이 기준값보다 느림: {name} {actual:.1f}ms (허용 {allowed:.1f}ms)")
 
 
 class InitWorker(QThread):
@@ -103,11 +146,12 @@ class InitWorker(QThread):
 
     def run(self):
         """초기화 실행"""
+        tracer = get_tracer()
         try:
             # Lazy import
-            lazy_import_modules()
+            with tracer.span("lazy imports"):
+                lazy_import_modules()
 
-            log_timing("InitWorker: Starting dependency check")
             self.progress.emit("의존성 확인 중...")
 
             # 의존성 확인 (출력 억제)
@@ -116,11 +160,10 @@ class InitWorker(QThread):
 
             # 표준 출력을 캡처하여 스플래시 스크린에 표시
             f = io.StringIO()
-            with contextlib.redirect_stdout(f):
+            with tracer.span("dependency check") as span, contextlib.redirect_stdout(f):
                 checker = DependencyChecker()
                 success = checker.check_and_install()
-
-            log_timing(f"InitWorker: Dependency check completed (success={success})")
+                span.args['success'] = success
 
             # 출력 내용을 줄 단위로 읽어 진행 상태 전송
             output = f.getvalue()
@@ -129,11 +172,10 @@ class InitWorker(QThread):
                     self.progress.emit(line.strip())
 
             self.progress.emit("초기화 완료!")
-            log_timing("InitWorker: Emitting finished signal")
             self.finished.emit(success)
 
         except Exception as e:
-            log_timing(f"InitWorker: Error - {str(e)}")
+            tracer.instant("init error", error=str(e))
             self.progress.emit(f"초기화 오류: {str(e)}")
             self.finished.emit(False)
 
@@ -164,9 +206,14 @@ class YoutubeDownloaderApp(QWidget):
         self.auto_download_checkbox.setChecked(True)  # 기본값: 체크됨
         url_layout.addWidget(self.auto_download_checkbox)
 
-        btn_fetch_title = QPushButton("제목 가져오기")
-        btn_fetch_title.clicked.connect(self.fetch_video_title)
-        url_layout.addWidget(btn_fetch_title)
+        # 플레이리스트/채널 URL이면 목록 전체를 펼쳐 큐에 추가 (끄면 영상 하나만)
+        self.playlist_checkbox = QCheckBox("플레이리스트/채널 전체")
+        self.playlist_checkbox.setToolTip("플레이리스트나 채널 URL의 영상을 모두 추가합니다 (이미 받은 영상은 건너뜀)")
+        url_layout.addWidget(self.playlist_checkbox)
+
+        self.btn_fetch_title = QPushButton("제목 가져오기")
+        self.btn_fetch_title.clicked.connect(self.fetch_video_title)
+        url_layout.addWidget(self.btn_fetch_title)
 
         input_layout.addLayout(url_layout)
 
@@ -191,17 +238,68 @@ class YoutubeDownloaderApp(QWidget):
         type_layout = QHBoxLayout()
         type_layout.addWidget(QLabel("다운로드 형식:"))
         self.type_combo = QComboBox()
-        self.type_combo.addItems([
-            "오디오 전용 (M4A - 최고 음질)",
-            "비디오 (MP4 - 최고 화질)",
-            "비디오 (MP4 - 720p)",
-            "비디오 (MP4 - 480p)"
-        ])
+        self.type_combo.addItems(list(FORMAT_LABELS.values()))
         self.type_combo.setCurrentIndex(0)
         type_layout.addWidget(self.type_combo, 1)
+
+        # 동시 다운로드 수
+        type_layout.addWidget(QLabel("동시 다운로드:"))
+        self.concurrency_spin = QSpinBox()
+        self.concurrency_spin.setRange(1, 16)
+        self.concurrency_spin.setValue(DEFAULT_MAX_CONCURRENT)
+        type_layout.addWidget(self.concurrency_spin)
+
+        # 작업당 연결 수 (2 이상이면 큰 포맷을 여러 연결로 나눠 받음)
+        type_layout.addWidget(QLabel("연결 수:"))
+        self.connections_spin = QSpinBox()
+        self.connections_spin.setRange(1, MAX_CONNECTIONS)
+        self.connections_spin.setValue(1)
+        self.connections_spin.setToolTip("큰 파일을 여러 연결로 나눠 동시에 받습니다 (1이면 사용 안 함)")
+        type_layout.addWidget(self.connections_spin)
+
+        # 동시 후처리 수 (ffmpeg 병합/변환, 다운로드 수와 따로 조절)
+        type_layout.addWidget(QLabel("동시 후처리:"))
+        self.postprocess_spin = QSpinBox()
+        self.postprocess_spin.setRange(1, 64)
+        self.postprocess_spin.setValue(default_postprocess_workers())
+        self.postprocess_spin.setToolTip("동시에 실행할 ffmpeg 후처리 수 (기본값: CPU 코어 수)")
+        type_layout.addWidget(self.postprocess_spin)
+
+        # 프로세스 모드 (다운로드를 별도 프로세스에서 실행하여 GIL 경합 회피)
+        self.process_mode_checkbox = QCheckBox("프로세스 모드")
+        self.process_mode_checkbox.setToolTip("각 다운로드를 별도 프로세스에서 실행합니다 (동시 다운로드가 많을 때 유리)")
+        type_layout.addWidget(self.process_mode_checkbox)
         type_layout.addStretch()
         input_layout.addLayout(type_layout)
 
+        # 속도 제한 (모든 다운로드 합계 / 작업당, 실행 중에도 바로 적용)
+        limit_layout = QHBoxLayout()
+        limit_layout.addWidget(QLabel("전체 속도 제한:"))
+        self.global_limit_spin = QSpinBox()
+        self.global_limit_spin.setRange(0, 10 * 1024 * 1024)
+        self.global_limit_spin.setSuffix(" KiB/s")
+        self.global_limit_spin.setSpecialValueText("제한 없음")
+        self.global_limit_spin.setToolTip("모든 다운로드의 합계 속도 (설정 파일의 시간대 일정이 있으면 그 시간에는 일정 우선)")
+        limit_layout.addWidget(self.global_limit_spin)
+
+        limit_layout.addWidget(QLabel("작업당 제한:"))
+        self.job_limit_spin = QSpinBox()
+        self.job_limit_spin.setRange(0, 10 * 1024 * 1024)
+        self.job_limit_spin.setSuffix(" KiB/s")
+        self.job_limit_spin.setSpecialValueText("제한 없음")
+        limit_layout.addWidget(self.job_limit_spin)
+
+        # 임시 폴더 (.part, 병합 전 포맷 등 중간 파일, 완료된 결과만 저장 경로로 옮김)
+        limit_layout.addWidget(QLabel("임시 폴더:"))
+        self.temp_dir_edit = QLineEdit()
+        self.temp_dir_edit.setPlaceholderText("저장 경로와 같음")
+        self.temp_dir_edit.setToolTip("다운로드 중인 파일과 병합 전 파일을 둘 폴더 (빠르거나 여유 공간이 큰 디스크)")
+        limit_layout.addWidget(self.temp_dir_edit, 1)
+        btn_temp_dir = QPushButton("폴더 선택...")
+        btn_temp_dir.clicked.connect(self.choose_temp_dir)
+        limit_layout.addWidget(btn_temp_dir)
+        input_layout.addLayout(limit_layout)
+
         input_group.setLayout(input_layout)
         main_layout.addWidget(input_group)
 
@@ -231,19 +329,22 @@ class YoutubeDownloaderApp(QWidget):
         main_layout.addLayout(btn_layout)
 
         # ── 다운로드 큐 테이블 ──
-        self.table = QTableWidget(0, 6)
-        self.table.setHorizontalHeaderLabels([
-            "URL", "저장 경로", "파일명", "형식", "음질", "진행 상태"
-        ])
+        self.model = QueueTableModel(self, key=lambda job: (self._dedup_key(job.url), job.download_type))
+        self.table = QTableView()
+        self.table.setModel(self.model)
 
         # 테이블 설정
         self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)  # 읽기 전용
         self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)  # Row 전체 선택
         self.table.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)  # 다중 선택 가능
-        self.table.cellDoubleClicked.connect(self._on_double_click)  # 더블클릭 이벤트
+        self.table.doubleClicked.connect(self._on_double_click)  # 더블클릭 이벤트
         self.table.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)  # 컨텍스트 메뉴 활성화
         self.table.customContextMenuRequested.connect(self._show_context_menu)  # 컨텍스트 메뉴 이벤트
 
+        # 행 높이 고정 (행이 많아도 크기 계산 없이 보이는 행만 그림)
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.table.verticalHeader().setDefaultSectionSize(self.table.fontMetrics().height() + 8)
+
         # 컬럼 크기 설정
         header = self.table.horizontalHeader()
         header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
@@ -262,49 +363,216 @@ class YoutubeDownloaderApp(QWidget):
         footer.setStyleSheet("color: gray; font-size: 11px; padding: 2px 4px;")
         main_layout.addWidget(footer)
 
-        # 워커 관리
+        # 워커 관리 (작업 ID -> 워커)
         self.workers: Dict[int, YoutubeDownloadWorker] = {}
 
-        # 파일 경로 추적 (row -> 실제 파일 경로)
-        self.file_paths: Dict[int, str] = {}
+        # 중지했지만 자식 프로세스의 취소를 기다리는 프로세스 모드 워커 (끝날 때까지 참조 유지)
+        self._detached_workers: Set[QThread] = set()
+
+        # 화면에 아직 반영하지 않은 진행 이벤트 (작업 ID -> 가장 최근 이벤트)
+        self._pending_progress: Dict[int, dict] = {}
+        self._progress_timer = QTimer(self)
+        self._progress_timer.setInterval(PROGRESS_REFRESH_MS)
+        self._progress_timer.timeout.connect(self._flush_progress)
+
+        # 추출된 영상 정보 (정리된 URL -> extract_info(process=False) 결과)
+        # 워커가 같은 URL을 다시 추출하지 않도록 전달
+        self.video_infos: Dict[str, dict] = {}
+
+        # 백그라운드 제목 조회 (add_to_queue가 GUI 스레드를 막지 않도록)
+        self.title_resolver = TitleResolver(parent=self)
+        self.title_resolver.resolved.connect(self._on_info_resolved)
+        self.title_resolver.failed.connect(self._on_info_failed)
+        self._fetch_title_url: Optional[str] = None
+
+        # 목록을 펼치는 중인 플레이리스트 워커
+        self.playlist_workers: List[PlaylistExpandWorker] = []
+
+        # 저장된 설정 로드
+        settings = self._load_settings()
+        if settings.get('download_path'):
+            self.dir_edit.setText(settings['download_path'])
+        self.concurrency_spin.setValue(settings.get('max_concurrent', DEFAULT_MAX_CONCURRENT))
+        self.process_mode_checkbox.setChecked(settings.get('process_mode', False))
+        self.process_mode_checkbox.toggled.connect(self._on_process_mode_changed)
+        self._update_postprocess_control()
+        self.playlist_checkbox.setChecked(settings.get('expand_playlists', False))
+        self.playlist_checkbox.toggled.connect(lambda checked: self._save_settings(expand_playlists=checked))
+        self.connections_spin.setValue(settings.get('segment_connections', 1))
+        self.connections_spin.valueChanged.connect(lambda value: self._save_settings(segment_connections=value))
+        self.postprocess_spin.setValue(settings.get('postprocess_workers', default_postprocess_workers()))
+        get_postprocess_pool().max_workers = self.postprocess_spin.value()
+        self.postprocess_spin.valueChanged.connect(self._on_postprocess_workers_changed)
+        self._init_bandwidth(settings)
+        self.temp_dir_edit.setText(settings.get('temp_dir', ''))
+        self.temp_dir_edit.editingFinished.connect(
+            lambda: self._save_settings(temp_dir=self.temp_dir_edit.text().strip()))
+
+        # 다운로드 스케줄러 (작업 ID 단위, 동시 실행 수 제한)
+        # 호스트별 제한은 설정 파일에 per_host_limit이 있을 때만 적용 (기본은 동시 다운로드 수만 적용)
+        self.scheduler = DownloadScheduler(
+            self._start_download,
+            max_concurrent=self.concurrency_spin.value(),
+            per_host_limit=settings.get('per_host_limit'),
+            admit=self._admit_job,
+        )
+
+        # 디스크 공간 부족으로 보류된 작업을 주기적으로 다시 확인 (외부에서 공간이 생긴 경우)
+        self.disk_timer = QTimer(self)
+        self.disk_timer.timeout.connect(self.scheduler.pump)
+        self.disk_timer.start(DISK_RECHECK_MS)
+        self.concurrency_spin.valueChanged.connect(self._on_concurrency_changed)
+
+        # 서버 속도 제한(429 등)이 감지되면 동시 다운로드 수를 자동으로 줄였다가 천천히 복구
+        self.governor = ConcurrencyGovernor(self.concurrency_spin.value(), on_change=self._on_governor_changed)
 
-        # 저장된 경로 로드
-        saved_path = self._load_settings()
-        if saved_path:
-            self.dir_edit.setText(saved_path)
+        # 작업 저널 (재시작 시 미완료 작업 복원, 창이 뜬 뒤 복원)
+        self.journal = open_job_journal()
+        if self.journal:
+            QTimer.singleShot(0, self._restore_jobs)
 
-    def _load_settings(self) -> Optional[str]:
-        """설정 파일에서 저장 경로 로드"""
+    def _load_settings(self) -> dict:
+        """설정 파일 로드"""
         try:
             if os.path.exists(SETTINGS_FILE):
                 with open(SETTINGS_FILE, 'r', encoding='utf-8') as f:
-                    settings = json.load(f)
-                    return settings.get('download_path', None)
+                    return json.load(f)
         except Exception as e:
             print(f"설정 로드 실패: {e}")
-        return None
+        return {}
 
-    def _save_settings(self, download_path: str):
-        """설정 파일에 저장 경로 저장"""
+    def _save_settings(self, **values):
+        """설정 파일에 값 저장 (기존 설정과 병합)"""
         try:
-            settings = {'download_path': download_path}
+            settings = self._load_settings()
+            settings.update(values)
             with open(SETTINGS_FILE, 'w', encoding='utf-8') as f:
                 json.dump(settings, f, ensure_ascii=False, indent=2)
         except Exception as e:
             print(f"설정 저장 실패: {e}")
 
+    def _on_concurrency_changed(self, value: int):
+        """동시 다운로드 수 변경 (속도 제한으로 줄어든 상태면 새 값까지 천천히 복구)"""
+        self.governor.ceiling = value
+        self._save_settings(max_concurrent=value)
+
+    def _on_governor_changed(self, limit: int):
+        """속도 제한 감지/복구로 허용 동시 다운로드 수가 바뀜"""
+        self.scheduler.max_concurrent = limit
+        if limit < self.concurrency_spin.value():
+            print(f"서버 속도 제한 감지 - 동시 다운로드 {limit}개로 줄임")
+
+    def _on_process_mode_changed(self, checked: bool):
+        """프로세스 모드 전환"""
+        self._update_postprocess_control()
+        self._save_settings(process_mode=checked)
+
+    def _update_postprocess_control(self):
+        """
+        프로세스 모드에서는 동시 후처리 수 설정을 비활성화
+
+        자식 프로세스마다 후처리 풀이 따로 있고 각자 한 작업만 실행하므로, 이 모드의 동시 ffmpeg 수는
+        자식 프로세스 수로 정해지며 이 설정은 적용되지 않습니다.
+        """
+        process_mode = self.process_mode_checkbox.isChecked()
+        self.postprocess_spin.setEnabled(not process_mode)
+        self.postprocess_spin.setToolTip(
+            "프로세스 모드에서는 동시 후처리 수가 자식 프로세스 수(CPU 코어 수)로 정해집니다" if process_mode
+            else "동시에 실행할 ffmpeg 후처리 수 (기본값: CPU 코어 수)")
+
+    def _on_postprocess_workers_changed(self, value: int):
+        """동시 후처리 수 변경"""
+        get_postprocess_pool().max_workers = value
+        self._save_settings(postprocess_workers=value)
+
+    def _init_bandwidth(self, settings: dict):
+        """저장된 속도 제한과 시간대 일정 적용"""
+        shaper = get_bandwidth_shaper()
+        try:
+            shaper.set_schedule(settings.get('bandwidth_schedule'))
+        except (KeyError, ValueError, TypeError) as e:
+            print(f"속도 제한 일정이 잘못되었습니다: {e}")
+
+        self.global_limit_spin.setValue(settings.get('global_limit_kib', 0))
+        self.job_limit_spin.setValue(settings.get('job_limit_kib', 0))
+        shaper.global_limit = self.global_limit_spin.value() * 1024
+        shaper.job_limit = self.job_limit_spin.value() * 1024
+        self.global_limit_spin.valueChanged.connect(self._on_global_limit_changed)
+        self.job_limit_spin.valueChanged.connect(self._on_job_limit_changed)
+
+        # 프로세스 모드에서는 부모가 다운로드하지 않으므로 일정 전환을 주기적으로 반영
+        self.bandwidth_timer = QTimer(self)
+        self.bandwidth_timer.timeout.connect(shaper.refresh)
+        self.bandwidth_timer.start(BANDWIDTH_REFRESH_MS)
+
+    def _on_global_limit_changed(self, value: int):
+        """전체 속도 제한 변경"""
+        get_bandwidth_shaper().global_limit = value * 1024
+        self._save_settings(global_limit_kib=value)
+
+    def _on_job_limit_changed(self, value: int):
+        """작업당 속도 제한 변경"""
+        get_bandwidth_shaper().job_limit = value * 1024
+        self._save_settings(job_limit_kib=value)
+
+    def _record_jobs(self, *jobs: Job):
+        """작업 상태를 저널에 기록 (완료된 작업은 저널에서 삭제)"""
+        if not self.journal:
+            return
+        self.journal.record(job for job in jobs if job.status != JobStatus.DONE)
+        self.journal.remove(job.job_id for job in jobs if job.status == JobStatus.DONE)
+
+    def _restore_jobs(self):
+        """저널에 남아 있는 작업 복원 (진행 중이던 작업은 .part 파일에서 이어받기)"""
+        try:
+            records = self.journal.load()
+        except Exception as e:
+            print(f"작업 저널을 읽을 수 없습니다: {e}")
+            return
+        if not records:
+            return
+
+        jobs = []
+        for record in records:
+            job = Job(record['url'], record['save_dir'], record['filename'], record['download_type'],
+                      JobStatus.__members__.get(record['status'], JobStatus.IDLE))
+            job.job_id = record['job_id']
+            job.message = record['message'] or ''
+            job.target_path = record['target_path']
+            job.part_path = record['part_path']
+            job.auto_start = bool(record['auto_start'])
+            job.connections = self.connections_spin.value()
+            if job.status in (JobStatus.RUNNING, JobStatus.POSTPROCESSING):
+                # 중단된 다운로드는 대기열로 되돌림
+                job.status = JobStatus.QUEUED
+                job.message = ''
+            jobs.append(job)
+        self.model.append_jobs(jobs)
+
+        lazy_import_modules()
+        for job in jobs:
+            if job.status == JobStatus.RESOLVING:
+                # 제목 확인 후 자동 시작 여부(auto_start)는 저장된 값 유지
+                self.title_resolver.request(job.url)
+            elif job.status == JobStatus.QUEUED:
+                self.scheduler.enqueue(job.job_id, job.url)
+
     def choose_dir(self):
         """저장 경로 선택 다이얼로그"""
         d = QFileDialog.getExistingDirectory(self, "저장 경로 선택")
         if d:
             self.dir_edit.setText(d)
-            self._save_settings(d)  # 저장 경로를 설정 파일에 저장
+            self._save_settings(download_path=d)  # 저장 경로를 설정 파일에 저장
 
-    def fetch_video_title(self):
-        """유튜브 URL에서 영상 제목 가져오기"""
-        # Lazy import
-        lazy_import_modules()
+    def choose_temp_dir(self):
+        """임시 폴더 선택 다이얼로그"""
+        d = QFileDialog.getExistingDirectory(self, "임시 폴더 선택")
+        if d:
+            self.temp_dir_edit.setText(d)
+            self._save_settings(temp_dir=d)
 
+    def fetch_video_title(self):
+        """유튜브 URL에서 영상 제목 가져오기 (백그라운드 조회 후 결과 표시)"""
         url = self.url_edit.text().strip()
         if not url:
             QMessageBox.warning(self, "입력 오류", "유튜브 URL을 입력해주세요.")
@@ -313,35 +581,76 @@ class YoutubeDownloaderApp(QWidget):
         # 플레이리스트 파라미터 제거 (단일 비디오만 처리)
         url = self._clean_url(url)
 
-        try:
-            # yt-dlp로 영상 정보 가져오기
-            ydl_opts = {
-                'quiet': True,
-                'no_warnings': True,
-                'extract_flat': False,
-                'noplaylist': True,  # 플레이리스트 무시, 단일 비디오만
-            }
-
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(url, download=False)
-                video_title = info.get('title', 'Unknown')
-                duration = info.get('duration', 0)
-
-                # 제목을 안전한 파일명으로 변환
-                safe_title = self._sanitize_filename(video_title)[:60]
-
-                # 파일명 입력창에 설정
-                self.filename_edit.setText(safe_title)
-
-                # 정보 표시
-                QMessageBox.information(
-                    self,
-                    "영상 정보",
-                    f"제목: {video_title}\n길이: {duration // 60}분 {duration % 60}초\n\n파일명이 자동으로 설정되었습니다."
-                )
+        # 이미 가져온 정보가 있으면 바로 표시
+        if url in self.video_infos:
+            self._show_fetched_title(self.video_infos[url])
+            return
 
-        except Exception as e:
-            QMessageBox.warning(self, "오류", f"영상 정보를 가져올 수 없습니다:\n{str(e)}")
+        self._fetch_title_url = url
+        self.btn_fetch_title.setEnabled(False)
+        self.btn_fetch_title.setText("가져오는 중...")
+        self.title_resolver.request(url)
+
+    def _show_fetched_title(self, info: dict):
+        """제목 가져오기 결과를 파일명 입력창에 설정하고 표시"""
+        video_title = info.get('title') or 'Unknown'
+        duration = info.get('duration') or 0
+
+        # 제목을 안전한 파일명으로 변환
+        safe_title = self._sanitize_filename(video_title)[:60]
+
+        # 파일명 입력창에 설정
+        self.filename_edit.setText(safe_title)
+
+        # 정보 표시
+        QMessageBox.information(
+            self,
+            "영상 정보",
+            f"제목: {video_title}\n길이: {duration // 60}분 {duration % 60}초\n\n파일명이 자동으로 설정되었습니다."
+        )
+
+    def _finish_fetch_title(self, url: str) -> bool:
+        """제목 가져오기 버튼 요청에 대한 응답이면 버튼 상태 복원"""
+        if url != self._fetch_title_url:
+            return False
+        self._fetch_title_url = None
+        self.btn_fetch_title.setEnabled(True)
+        self.btn_fetch_title.setText("제목 가져오기")
+        return True
+
+    def _on_info_resolved(self, url: str, info: dict):
+        """백그라운드 조회 완료 - 대기 중인 행의 파일명 채우기"""
+        # 다운로드 시 워커에 전달하여 재추출 방지
+        self.video_infos[url] = info
+
+        title = info.get('title') or 'download'
+        self._apply_resolved_filename(url, self._sanitize_filename(title)[:60])
+
+        if self._finish_fetch_title(url):
+            self._show_fetched_title(info)
+
+    def _on_info_failed(self, url: str, error: str):
+        """백그라운드 조회 실패 - 기본 파일명 사용"""
+        self._apply_resolved_filename(url, "download")
+
+        if self._finish_fetch_title(url):
+            QMessageBox.warning(self, "오류", f"영상 정보를 가져올 수 없습니다:\n{error}")
+
+    def _apply_resolved_filename(self, url: str, base_name: str):
+        """제목 확인 중인 작업(같은 URL)에 파일명을 설정하고, 자동 다운로드 대상이면 대기열 등록"""
+        for job in self.model.jobs_with_url(url):
+            if job.status != JobStatus.RESOLVING:
+                continue
+
+            job.filename = base_name + self._get_extension(job.download_type)
+            job.file_path = os.path.join(job.save_dir, job.filename)
+            job.status = JobStatus.IDLE
+            self.model.update_job(job.job_id, QueueTableModel.COL_FILENAME, QueueTableModel.COL_STATUS)
+            self._record_jobs(job)
+
+            if job.auto_start:
+                job.auto_start = False
+                self._enqueue_job(job.job_id)
 
     def _clean_url(self, url: str) -> str:
         """URL에서 불필요한 파라미터 제거"""
@@ -376,11 +685,16 @@ class YoutubeDownloaderApp(QWidget):
 
         return cleaned_url
 
+    def _selected_job_ids(self):
+        """선택된 작업 ID 목록 (행 순서)"""
+        rows = sorted(index.row() for index in self.table.selectionModel().selectedRows())
+        return [self.model.job_at(row).job_id for row in rows]
+
     def _show_context_menu(self, position):
         """마우스 오른쪽 클릭 컨텍스트 메뉴"""
         # 선택된 행이 있는지 확인
-        selected_rows = sorted(set(index.row() for index in self.table.selectedIndexes()))
-        if not selected_rows:
+        selected_ids = self._selected_job_ids()
+        if not selected_ids:
             return
 
         # 컨텍스트 메뉴 생성
@@ -388,25 +702,41 @@ class YoutubeDownloaderApp(QWidget):
 
         # 다운로드 폴더 열기 액션
         open_folder_action = QAction("다운로드 폴더 열기", self)
-        open_folder_action.triggered.connect(lambda: self._open_download_folder(selected_rows[0]))
+        open_folder_action.triggered.connect(lambda: self._open_download_folder(selected_ids[0]))
         menu.addAction(open_folder_action)
 
+        # 캐시된 영상 정보 삭제 액션 (다음 다운로드 시 새로 추출)
+        invalidate_action = QAction("캐시된 영상 정보 삭제", self)
+        invalidate_action.triggered.connect(lambda: self._invalidate_cached_info(selected_ids))
+        menu.addAction(invalidate_action)
+
         # 파일 재생 액션 (완료된 경우만)
-        if selected_rows:
-            row = selected_rows[0]
-            status = self.table.item(row, 5).text()  # 진행 상태는 5번 컬럼
-            if "완료" in status:
+        if selected_ids:
+            job_id = selected_ids[0]
+            if self.model.job(job_id).status == JobStatus.DONE:
                 play_action = QAction("파일 재생", self)
-                play_action.triggered.connect(lambda: self._play_file(row))
+                play_action.triggered.connect(lambda: self._play_file(job_id))
                 menu.addAction(play_action)
 
         # 메뉴 표시
         menu.exec(self.table.viewport().mapToGlobal(position))
 
-    def _open_download_folder(self, row: int):
+    def _invalidate_cached_info(self, job_ids):
+        """선택된 작업의 캐시된 영상 정보 삭제"""
+        cache = get_metadata_cache()
+        for job_id in job_ids:
+            job = self.model.job(job_id)
+            if job is None:
+                continue
+            self.video_infos.pop(job.url, None)
+            if cache:
+                cache.invalidate(extract_video_id(job.url))
+
+    def _open_download_folder(self, job_id: int):
         """다운로드 폴더 열기"""
-        if row < self.table.rowCount():
-            save_dir = self.table.item(row, 1).text()
+        job = self.model.job(job_id)
+        if job is not None:
+            save_dir = job.save_dir
 
             # 폴더가 없으면 생성
             if not os.path.exists(save_dir):
@@ -423,14 +753,12 @@ class YoutubeDownloaderApp(QWidget):
             except Exception as e:
                 QMessageBox.warning(self, "오류", f"폴더를 열 수 없습니다:\n{str(e)}")
 
-    def _play_file(self, row: int):
+    def _play_file(self, job_id: int):
         """파일 재생"""
-        if row in self.file_paths:
-            file_path = self.file_paths[row]
-        else:
-            save_dir = self.table.item(row, 1).text()
-            filename = self.table.item(row, 2).text()
-            file_path = os.path.join(save_dir, filename)
+        job = self.model.job(job_id)
+        if job is None:
+            return
+        file_path = job.file_path or os.path.join(job.save_dir, job.filename)
 
         # 파일 존재 확인
         if not os.path.exists(file_path):
@@ -450,267 +778,439 @@ class YoutubeDownloaderApp(QWidget):
 
     def _get_download_type_key(self, index: int) -> str:
         """콤보박스 인덱스를 다운로드 타입 키로 변환"""
-        types = {
-            0: 'audio',
-            1: 'video_best',
-            2: 'video_720p',
-            3: 'video_480p'
-        }
-        return types.get(index, 'audio')
+        types = list(FORMAT_LABELS)
+        return types[index] if 0 <= index < len(types) else 'audio'
 
     def _get_extension(self, download_type: str) -> str:
         """다운로드 타입에 따른 확장자 반환"""
-        if download_type == 'audio':
-            return '.m4a'
-        return '.mp4'
+        return get_extension(download_type)
 
     def _get_quality_info(self, download_type: str) -> str:
         """다운로드 타입에 따른 음질 정보 반환"""
-        quality_map = {
-            'audio': '320kbps M4A',
-            'video_best': '320kbps AAC',
-            'video_720p': '256kbps AAC',
-            'video_480p': '192kbps AAC'
-        }
-        return quality_map.get(download_type, 'N/A')
+        return QUALITY_LABELS.get(download_type, 'N/A')
 
     def _sanitize_filename(self, name: str) -> str:
         """파일명을 안전하게 정제"""
-        name = (name or "download").strip()
-
-        # 이모지 및 비ASCII 특수문자 제거 (한글, 일본어, 중국어는 유지)
-        # Unicode 범위: 이모지 제거, 한중일 문자 유지
-        import unicodedata
-        cleaned_name = ""
-        for char in name:
-            # 이모지 및 기타 심볼 제거
-            if unicodedata.category(char).startswith('So'):  # Symbol, Other
-                continue
-            # 이모지 modifier 제거
-            if '\U0001F000' <= char <= '\U0001FFFF':  # Emoji 범위
-                continue
-            cleaned_name += char
-
-        name = cleaned_name.strip()
-
-        # 경로 구분자 및 상위 디렉토리 참조 제거
-        name = name.replace(os.sep, "_").replace("/", "_").replace("\\", "_")
-        name = re.sub(r'\.\.+', '_', name)
-
-        # 파일명에 허용되지 않는 문자 제거 (Windows 호환)
-        name = re.sub(r'[<>:"|?*]', '_', name)
-
-        # 연속된 공백을 하나로
-        name = re.sub(r'\s+', ' ', name)
-
-        # 파일명 길이 제한 (너무 긴 경우 잘라냄)
-        if len(name) > 200:
-            name = name[:200]
-
-        return name.strip() or "download"
+        return sanitize_filename(name)
 
     def add_to_queue(self):
-        """다운로드 큐에 항목 추가"""
+        """다운로드 큐에 항목 추가 (공백/줄바꿈으로 구분된 여러 URL 지원)"""
         # Lazy import
         lazy_import_modules()
 
-        url = self.url_edit.text().strip()
-        if not url:
+        urls = self.url_edit.text().split()
+        if not urls:
             QMessageBox.warning(self, "입력 오류", "유튜브 URL을 입력해주세요.")
             return
 
-        # URL 정리
-        url = self._clean_url(url)
-
         save_dir = self.dir_edit.text().strip() or "downloads"
-        filename = self.filename_edit.text().strip()
+        filename = self.filename_edit.text().strip() if len(urls) == 1 else ""
         download_type_idx = self.type_combo.currentIndex()
         download_type = self._get_download_type_key(download_type_idx)
+        auto_download = self.auto_download_checkbox.isChecked()
+
+        # 플레이리스트/채널은 백그라운드에서 펼치며 항목이 나오는 대로 추가 (URL 정리 전에 판단)
+        if self.playlist_checkbox.isChecked():
+            for url in [url for url in urls if is_collection_url(url)]:
+                self._expand_playlist(url, save_dir, download_type, auto_download)
+            urls = [url for url in urls if not is_collection_url(url)]
+
+        # URL 정리 후 중복(같은 영상/형식이 이미 큐에 있거나 완료됨) 제외
+        added = set()
+        new_urls = []
+        for url in map(self._clean_url, urls):
+            key = (self._dedup_key(url), download_type)
+            if key not in added and not self._is_queued(key):
+                added.add(key)
+                new_urls.append(url)
+        skipped = len(urls) - len(new_urls)
+
+        # 작업 생성 후 한 번에 테이블에 추가
+        jobs = [self._create_job(url, save_dir, filename, download_type, auto_download) for url in new_urls]
+        for job in jobs:
+            job.connections = self.connections_spin.value()
+        self.model.append_jobs(jobs)
+        self._record_jobs(*jobs)
+
+        for job in jobs:
+            if job.status == JobStatus.RESOLVING:
+                # 제목은 백그라운드에서 조회 (완료 후 자동 다운로드 여부는 job.auto_start)
+                self.title_resolver.request(job.url)
+            elif auto_download:
+                # 자동 다운로드가 체크되어 있으면 다운로드 대기열에 등록
+                self._enqueue_job(job.job_id)
 
-        # 파일명이 없으면 자동으로 영상 제목 가져오기 시도
-        if not filename:
-            try:
-                # 간단하게 제목만 가져오기
-                ydl_opts = {
-                    'quiet': True,
-                    'no_warnings': True,
-                    'extract_flat': False,
-                    'noplaylist': True,
-                }
-                with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                    info = ydl.extract_info(url, download=False)
-                    video_title = info.get('title', 'download')
-                    filename = self._sanitize_filename(video_title)[:60]
-            except:
-                # 제목 가져오기 실패 시 기본값 사용
-                filename = "download"
-        else:
-            filename = self._sanitize_filename(filename)
-
-        # 확장자 추가
-        ext = self._get_extension(download_type)
-        if not filename.endswith(ext):
-            filename = os.path.splitext(filename)[0] + ext
-
-        # 테이블에 행 추가
-        row = self.table.rowCount()
-        self.table.insertRow(row)
+        # 입력 필드 초기화
+        self.url_edit.clear()
+        self.filename_edit.clear()
 
-        # 음질 정보 가져오기
-        quality_info = self._get_quality_info(download_type)
+        # 메시지 박스 제거 - 그리드에 추가된 것으로 충분 (중복으로 건너뛴 경우만 안내)
+        if skipped:
+            QMessageBox.information(self, "중복 건너뜀", f"이미 큐에 있는 영상 {skipped}개는 추가하지 않았습니다.")
+
+    def _is_queued(self, key: tuple) -> bool:
+        """(중복 판단 키, 형식)이 같은 작업이 큐에 있거나 완료되었는지 (실패/중지된 작업 제외)"""
+        return any(job.status not in (JobStatus.FAILED, JobStatus.STOPPED) for job in self.model.jobs_with_key(key))
+
+    def _expand_playlist(self, url: str, save_dir: str, download_type: str, auto_download: bool):
+        """플레이리스트/채널 목록 펼치기 시작 (항목은 페이지를 받는 대로 큐에 추가)"""
+        worker = PlaylistExpandWorker(url, skip=completed_filter(download_type))
+        connections = self.connections_spin.value()
+        worker.entries_found.connect(
+            lambda entries: self._on_playlist_entries(entries, save_dir, download_type, auto_download, connections))
+        worker.finished.connect(lambda count, error, w=worker: self._on_playlist_finished(w, count, error))
+        self.playlist_workers.append(worker)
+        worker.start()
+        print(f"플레이리스트 목록 가져오는 중: {url}")
+
+    def _on_playlist_entries(self, entries: list, save_dir: str, download_type: str, auto_download: bool,
+                             connections: int):
+        """펼친 목록 항목 묶음을 큐에 추가 (이미 큐에 있는 영상 제외, 제목이 있으면 조회 생략)"""
+        added = set()
+        jobs = []
+        for entry in entries:
+            key = (self._dedup_key(entry['url']), download_type)
+            if key in added or self._is_queued(key):
+                continue
+            added.add(key)
+            filename = self._sanitize_filename(entry['title'])[:60] if entry.get('title') else ''
+            job = self._create_job(entry['url'], save_dir, filename, download_type, auto_download)
+            job.connections = connections
+            jobs.append(job)
+        if not jobs:
+            return
 
-        # 데이터 입력
-        self.table.setItem(row, 0, QTableWidgetItem(url))
-        self.table.setItem(row, 1, QTableWidgetItem(save_dir))
-        self.table.setItem(row, 2, QTableWidgetItem(filename))
-        self.table.setItem(row, 3, QTableWidgetItem(self.type_combo.currentText()))
-        self.table.setItem(row, 4, QTableWidgetItem(quality_info))
-        self.table.setItem(row, 5, QTableWidgetItem("대기 중"))
+        self.model.append_jobs(jobs)
+        self._record_jobs(*jobs)
+        for job in jobs:
+            if job.status == JobStatus.RESOLVING:
+                self.title_resolver.request(job.url)
+            elif auto_download:
+                self._enqueue_job(job.job_id)
+
+    def _on_playlist_finished(self, worker, count: int, error: str):
+        """목록 펼치기 완료 (중간에 실패해도 이미 추가한 항목은 유지)"""
+        if worker in self.playlist_workers:
+            self.playlist_workers.remove(worker)
+        if error:
+            QMessageBox.warning(self, "플레이리스트 오류",
+                                f"목록을 끝까지 가져오지 못했습니다 ({count}개 추가됨):\n{error}")
+        else:
+            print(f"플레이리스트 목록 완료: {worker.url} ({count}개)")
 
-        # 파일 경로 저장
-        self.file_paths[row] = os.path.join(save_dir, filename)
+    def _dedup_key(self, url: str) -> str:
+        """중복 판단 키 (영상 ID, 알 수 없으면 정리된 URL)"""
+        return content_key(url) or url
 
-        # 입력 필드 초기화
-        self.url_edit.clear()
-        self.filename_edit.clear()
+    def _create_job(self, url: str, save_dir: str, filename: str, download_type: str,
+                    auto_download: bool) -> Job:
+        """작업 생성 (제목을 모르면 제목 확인 중 상태로 만들고 백그라운드 조회 대상이 됨)"""
+        ext = self._get_extension(download_type)
 
-        # 메시지 박스 제거 - 그리드에 추가된 것으로 충분
+        if filename:
+            filename = self._sanitize_filename(filename)
+        elif url in self.video_infos:
+            # 이미 조회한 영상이면 바로 제목 사용
+            video_title = self.video_infos[url].get('title') or 'download'
+            filename = self._sanitize_filename(video_title)[:60]
+        else:
+            # 파일명이 없으면 제목 확인 중 표시 후 백그라운드 조회
+            return Job(url, save_dir, '', download_type, JobStatus.RESOLVING, auto_start=auto_download)
 
-        # 자동 다운로드가 체크되어 있으면 자동으로 다운로드 시작
-        if self.auto_download_checkbox.isChecked():
-            self._start_download_for_row(row)
+        # 확장자 추가
+        if not filename.endswith(ext):
+            filename = os.path.splitext(filename)[0] + ext
 
-    def _start_download_for_row(self, row: int):
-        """특정 행의 다운로드 시작 (자동 다운로드용)"""
+        job = Job(url, save_dir, filename, download_type)
+        job.file_path = os.path.join(save_dir, filename)
+        return job
+
+    def _enqueue_job(self, job_id: int) -> bool:
+        """작업을 스케줄러 대기열에 등록 (빈 슬롯이 있으면 즉시 시작)"""
+        if job_id in self.workers:
+            return False
+
+        # 제목 확인 중이면 확인 후 대기열에 등록되도록 표시만 해둠
+        job = self.model.job(job_id)
+        if job.status == JobStatus.RESOLVING:
+            job.auto_start = True
+            self._record_jobs(job)
+            return True
+
+        job.status = JobStatus.QUEUED
+        job.message = ''
+        self.model.update_job(job_id)
+        self._record_jobs(job)
+        return self.scheduler.enqueue(job_id, job.url)
+
+    def _start_download(self, job_id: int):
+        """작업의 다운로드 시작 (스케줄러가 슬롯을 배정했을 때 호출)"""
         # 이미 실행 중인지 확인
-        if row in self.workers:
+        if job_id in self.workers:
             return
 
-        # 다운로드 시작
-        url = self.table.item(row, 0).text()
-        save_dir = self.table.item(row, 1).text()
-        filename = self.table.item(row, 2).text()
-        format_text = self.table.item(row, 3).text()
-
-        # 형식 텍스트에서 다운로드 타입 추출
-        if "오디오" in format_text:
-            download_type = 'audio'
-        elif "최고 화질" in format_text:
-            download_type = 'video_best'
-        elif "720p" in format_text:
-            download_type = 'video_720p'
-        elif "480p" in format_text:
-            download_type = 'video_480p'
-        else:
-            download_type = 'audio'
-
-        # 출력 경로
-        output_path = os.path.join(save_dir, filename)
+        # 대기 중에 제거된 작업이면 슬롯 반납
+        job = self.model.job(job_id)
+        if job is None:
+            get_disk_reservations().release(job_id)
+            self.scheduler.finish(job_id)
+            return
 
-        # 워커 생성 및 시작
-        worker = YoutubeDownloadWorker(url, output_path, download_type)
-        worker.progress.connect(lambda msg, r=row: self._update_progress(r, msg))
-        worker.title_resolved.connect(lambda title, r=row: self._update_title(r, title))
-        worker.file_path_resolved.connect(lambda path, r=row: self._update_file_path(r, path))
-        worker.finished.connect(lambda success, msg, r=row: self._on_finished(r, success, msg))
+        # 출력 경로 (복원된 작업은 처음 시작했던 경로를 그대로 써서 .part 파일에서 이어받음)
+        output_path = job.target_path or os.path.join(job.save_dir, job.filename)
+        job.target_path = output_path
 
-        self.workers[row] = worker
+        # 워커 생성 및 시작 (이미 추출된 정보가 있으면 넘겨서 재추출 방지)
+        kwargs = {}
+        if self.process_mode_checkbox.isChecked():
+            # 자식 프로세스는 다른 작업의 예약을 볼 수 없으므로 여기서 예약한 작업은 엔진 쪽 예약을 건너뜀
+            worker_class = ProcessDownloadWorker
+            kwargs['reserve_disk'] = not get_disk_reservations().has(job_id)
+        else:
+            worker_class = YoutubeDownloadWorker
+        worker = worker_class(job.url, output_path, job.download_type, info=self.video_infos.pop(job.url, None),
+                              connections=job.connections, temp_dir=self.temp_dir_edit.text().strip() or None,
+                              reservation_key=job_id, **kwargs)
+        worker.progress.connect(lambda msg, i=job_id: self._update_progress(i, msg))
+        worker.progress_event.connect(lambda event, i=job_id: self._queue_progress_event(i, event))
+        worker.title_resolved.connect(lambda title, i=job_id: self._update_title(i, title))
+        worker.file_path_resolved.connect(lambda path, i=job_id: self._update_file_path(i, path))
+        worker.network_done.connect(lambda i=job_id: self._on_network_done(i))
+        worker.retrying.connect(self._on_retrying)
+        worker.finished.connect(lambda success, msg, i=job_id: self._on_finished(i, success, msg))
+
+        self.workers[job_id] = worker
         worker.start()
 
-        self.table.item(row, 5).setText("시작 중...")
+        job.status = JobStatus.RUNNING
+        job.message = ''
+        self.model.update_job(job_id)
+        self._record_jobs(job)
+
+    def _admit_job(self, job_id: int) -> bool:
+        """
+        스케줄러가 작업을 시작하기 직전 확인 - 예상 크기만큼 디스크 공간 예약
+
+        공간이 모자라도 같은 디스크를 쓰는 다른 작업이 없으면 시작하며(엔진이 공간 부족 오류로
+        실패 처리), 다른 작업이 있으면 끝날 때까지 보류하고 그동안 작은 작업을 먼저 시작합니다.
+        """
+        job = self.model.job(job_id)
+        if job is None:
+            return True
+        info = self.video_infos.get(job.url)
+        if info is None:
+            cache = get_metadata_cache()
+            info = cache.get(extract_video_id(job.url)) if cache else None
+        estimate = estimate_download_size(info, job.download_type) if info else None
+        if not estimate:
+            return True
+
+        output_path = job.target_path or os.path.join(job.save_dir, job.filename)
+        save_dir = os.path.dirname(output_path) or '.'
+        needs = [(self.temp_dir_edit.text().strip() or save_dir, estimate), (save_dir, estimate)]
+        reservations = get_disk_reservations()
+        try:
+            if reservations.try_reserve(job_id, needs):
+                return True
+            if not any(reservations.has_others(path, exclude=job_id) for path, _ in needs):
+                return True
+        except OSError:
+            return True  # 경로를 확인할 수 없으면 엔진에 맡김
+
+        message = "디스크 공간 부족 - 대기 중"
+        if job.message != message:
+            job.message = message
+            self.model.update_job(job_id)
+        return False
 
     def start_selected(self):
         """선택된 항목 다운로드 시작"""
-        selected_rows = sorted(set(index.row() for index in self.table.selectedIndexes()))
+        selected_ids = self._selected_job_ids()
 
-        if not selected_rows:
+        if not selected_ids:
             QMessageBox.warning(self, "선택 없음", "다운로드할 항목을 선택해주세요.")
             return
 
         started_count = 0
-        for row in selected_rows:
-            # 이미 실행 중인지 확인
-            if row in self.workers:
+        for job_id in selected_ids:
+            # 이미 실행 중이거나 대기열에 있는지 확인
+            if job_id in self.workers or self.scheduler.is_queued(job_id):
                 continue
 
-            self._start_download_for_row(row)
-            started_count += 1
+            if self._enqueue_job(job_id):
+                started_count += 1
 
         # 메시지 박스 제거 - 진행 상태로 충분
         if started_count == 0:
             QMessageBox.warning(self, "이미 실행 중", "선택한 항목이 이미 다운로드 중입니다.")
 
-    def _update_progress(self, row: int, message: str):
+    def _update_progress(self, job_id: int, message: str):
         """진행 상태 업데이트"""
-        if row < self.table.rowCount():
-            self.table.item(row, 5).setText(message)
+        # 상태 메시지가 더 최신이므로 아직 반영되지 않은 진행 이벤트는 버림
+        self._pending_progress.pop(job_id, None)
+        job = self.model.job(job_id)
+        if job is not None:
+            job.message = message
+            self.model.update_job(job_id)
+
+    def _queue_progress_event(self, job_id: int, event: dict):
+        """진행 이벤트 보관 (작업마다 가장 최근 이벤트만 유지, 다음 갱신 주기에 반영)"""
+        self._pending_progress[job_id] = event
+        if not self._progress_timer.isActive():
+            self._progress_timer.start()
+
+    def _flush_progress(self):
+        """모인 진행 이벤트를 한 번에 화면에 반영"""
+        if not self._pending_progress:
+            self._progress_timer.stop()
+            return
 
-    def _update_title(self, row: int, title: str):
+        pending, self._pending_progress = self._pending_progress, {}
+        for job_id, event in pending.items():
+            job = self.model.job(job_id)
+            if job is not None:
+                job.message = format_progress_event(event)
+                self.model.update_job(job_id)
+
+                # 받은 만큼 예약에서 차감 (프로세스 모드에서는 엔진이 이 프로세스의 예약을 갱신하지 않음)
+                if event.get('downloaded'):
+                    get_disk_reservations().set_written(job_id, event['downloaded'])
+
+                # 처음 확인된 임시 파일 위치를 저널에 기록 (이어받기는 target_path 기준이라 한 번이면 충분,
+                # 비디오+오디오를 동시에 받으면 이벤트마다 포맷이 번갈아 오므로 매번 기록하지 않음)
+                part_path = event.get('tmpfilename')
+                if part_path and not job.part_path:
+                    job.part_path = part_path
+                    self._record_jobs(job)
+
+    def _update_title(self, job_id: int, title: str):
         """영상 제목으로 파일명 업데이트"""
-        if row < self.table.rowCount():
-            # 현재 파일명이 기본값인 경우에만 업데이트
-            current_filename = self.table.item(row, 2).text()
-            if current_filename.startswith("download"):
-                # 제목을 안전한 파일명으로 변환
-                safe_title = self._sanitize_filename(title)[:60]
-
-                # 현재 확장자 유지
-                _, ext = os.path.splitext(current_filename)
-                new_filename = safe_title + ext
-
-                self.table.item(row, 2).setText(new_filename)
-
-                # 파일 경로도 업데이트 (임시, 실제 경로는 file_path_resolved에서 업데이트)
-                save_dir = self.table.item(row, 1).text()
-                self.file_paths[row] = os.path.join(save_dir, new_filename)
-
-    def _update_file_path(self, row: int, file_path: str):
+        job = self.model.job(job_id)
+        # 현재 파일명이 기본값인 경우에만 업데이트
+        if job is not None and job.filename.startswith("download"):
+            # 제목을 안전한 파일명으로 변환
+            safe_title = self._sanitize_filename(title)[:60]
+
+            # 현재 확장자 유지
+            _, ext = os.path.splitext(job.filename)
+            job.filename = safe_title + ext
+
+            # 파일 경로도 업데이트 (임시, 실제 경로는 file_path_resolved에서 업데이트)
+            job.file_path = os.path.join(job.save_dir, job.filename)
+            self.model.update_job(job_id, QueueTableModel.COL_FILENAME)
+            self._record_jobs(job)
+
+    def _update_file_path(self, job_id: int, file_path: str):
         """실제 다운로드된 파일 경로 업데이트"""
-        if row < self.table.rowCount():
-            # 실제 파일 경로 저장
-            self.file_paths[row] = file_path
-
-            # 파일명도 업데이트 (실제 다운로드된 파일명으로)
-            filename = os.path.basename(file_path)
-            self.table.item(row, 2).setText(filename)
-
-    def _on_finished(self, row: int, success: bool, message: str):
+        job = self.model.job(job_id)
+        if job is not None:
+            # 실제 파일 경로 저장, 파일명도 업데이트 (실제 다운로드된 파일명으로)
+            job.file_path = file_path
+            job.filename = os.path.basename(file_path)
+            self.model.update_job(job_id, QueueTableModel.COL_FILENAME)
+
+    def _on_network_done(self, job_id: int):
+        """전송 완료 - 다운로드 슬롯을 반납하여 다음 작업 시작 (후처리는 후처리 풀에서 계속)"""
+        self._pending_progress.pop(job_id, None)
+        job = self.model.job(job_id)
+        if job is not None:
+            job.status = JobStatus.POSTPROCESSING
+            job.message = ''
+            self.model.update_job(job_id)
+            self._record_jobs(job)
+        self.scheduler.finish(job_id)
+
+    def _on_retrying(self, event: dict):
+        """작업이 실패 후 재시도 대기 - 서버 속도 제한이면 동시 다운로드 수 줄임"""
+        if event.get('kind') == ErrorKind.THROTTLED.value:
+            self.governor.throttled()
+
+    def _on_finished(self, job_id: int, success: bool, message: str):
         """다운로드 완료 처리"""
-        if row < self.table.rowCount():
-            if success:
-                self.table.item(row, 5).setText("✓ 완료")
-            else:
-                self.table.item(row, 5).setText(f"✗ 실패: {message}")
+        self._pending_progress.pop(job_id, None)
+        if success:
+            self.governor.succeeded()
+        job = self.model.job(job_id)
+        if job is not None:
+            job.status = JobStatus.DONE if success else JobStatus.FAILED
+            job.message = '' if success else message
+            self.model.update_job(job_id)
+            self._record_jobs(job)
+
+        get_disk_reservations().release(job_id)
 
         # 워커 정리
-        if row in self.workers:
-            self.workers[row].wait()
-            self.workers[row].deleteLater()
-            del self.workers[row]
+        worker = self.workers.pop(job_id, None)
+        if worker is not None:
+            worker.wait()
+            worker.deleteLater()
+
+        # 슬롯 반납 → 다음 대기 작업 자동 시작
+        self.scheduler.finish(job_id)
+
+    def _stop_worker(self, job_id: int):
+        """실행 중인 워커 중지 및 정리"""
+        worker = self.workers.pop(job_id)
+        worker.cancel()
+
+        # 타임아웃 설정하여 데드락 방지 (최대 2초 대기)
+        if not worker.wait(2000):
+            if isinstance(worker, ProcessDownloadWorker):
+                # 이벤트를 읽는 스레드를 강제 종료해도 자식 프로세스는 계속 받으므로, 시그널만 끊고
+                # 자식 프로세스가 취소 요청을 처리해 finished를 보낼 때까지 기다림
+                self._detach_worker(worker)
+            else:
+                # 2초 후에도 종료되지 않으면 강제 종료
+                worker.terminate()
+                worker.wait(1000)  # 종료 확인 (1초)
+                worker.deleteLater()
+        else:
+            worker.deleteLater()
+        self._pending_progress.pop(job_id, None)
+        get_disk_reservations().release(job_id)
+        self.scheduler.finish(job_id)
+
+    def _detach_worker(self, worker: QThread):
+        """작업과의 연결을 끊고 워커가 스스로 끝나면 정리 (같은 작업을 다시 시작해도 영향 없음)"""
+        for signal in (worker.progress, worker.progress_event, worker.title_resolved,
+                       worker.file_path_resolved, worker.network_done, worker.retrying, worker.finished):
+            signal.disconnect()
+        self._detached_workers.add(worker)
+        worker.finished.connect(lambda *_, w=worker: self._forget_detached_worker(w))
+
+    def _forget_detached_worker(self, worker: QThread):
+        if worker in self._detached_workers:
+            self._detached_workers.discard(worker)
+            worker.wait()
+            worker.deleteLater()
+
+    def _mark_stopped(self, job_id: int):
+        job = self.model.job(job_id)
+        job.status = JobStatus.STOPPED
+        job.message = ''
+        self.model.update_job(job_id)
+        self._record_jobs(job)
 
     def stop_selected(self):
         """선택된 항목 다운로드 중지"""
-        selected_rows = sorted(set(index.row() for index in self.table.selectedIndexes()))
+        selected_ids = self._selected_job_ids()
 
-        if not selected_rows:
+        if not selected_ids:
             QMessageBox.warning(self, "선택 없음", "중지할 항목을 선택해주세요.")
             return
 
         stopped_count = 0
-        for row in selected_rows:
-            if row in self.workers:
-                worker = self.workers[row]
-                worker.cancel()
-
-                # 타임아웃 설정하여 데드락 방지 (최대 2초 대기)
-                if not worker.wait(2000):
-                    # 2초 후에도 종료되지 않으면 강제 종료
-                    worker.terminate()
-                    worker.wait(1000)  # 종료 확인 (1초)
+        for job_id in selected_ids:
+            # 대기열에만 있는 항목은 대기열에서 제거
+            if self.scheduler.is_queued(job_id):
+                self.scheduler.remove(job_id)
+                self._mark_stopped(job_id)
+                stopped_count += 1
+                continue
 
-                worker.deleteLater()
-                del self.workers[row]
-                self.table.item(row, 5).setText("중지됨")
+            if job_id in self.workers:
+                self._stop_worker(job_id)
+                self._mark_stopped(job_id)
                 stopped_count += 1
 
         if stopped_count > 0:
@@ -720,77 +1220,84 @@ class YoutubeDownloaderApp(QWidget):
 
     def remove_selected(self):
         """선택된 항목 제거"""
-        selected_rows = sorted(set(index.row() for index in self.table.selectedIndexes()), reverse=True)
+        selected_ids = self._selected_job_ids()
 
-        if not selected_rows:
+        if not selected_ids:
             QMessageBox.warning(self, "선택 없음", "제거할 항목을 선택해주세요.")
             return
 
-        for row in selected_rows:
-            # 실행 중인 워커가 있으면 중지
-            if row in self.workers:
-                worker = self.workers[row]
-                worker.cancel()
-
-                # 타임아웃 설정하여 데드락 방지 (최대 2초 대기)
-                if not worker.wait(2000):
-                    # 2초 후에도 종료되지 않으면 강제 종료
-                    worker.terminate()
-                    worker.wait(1000)  # 종료 확인 (1초)
+        self._remove_jobs(selected_ids)
 
-                worker.deleteLater()
-                del self.workers[row]
-
-            # 파일 경로 정보 삭제
-            if row in self.file_paths:
-                del self.file_paths[row]
-
-            # 행 제거
-            self.table.removeRow(row)
-
-        QMessageBox.information(self, "제거 완료", f"{len(selected_rows)}개 항목을 제거했습니다.")
+        QMessageBox.information(self, "제거 완료", f"{len(selected_ids)}개 항목을 제거했습니다.")
 
     def clear_completed(self):
         """완료된 항목 정리"""
-        rows_to_remove = []
-        for row in range(self.table.rowCount()):
-            status = self.table.item(row, 5).text()
-            if "완료" in status or "실패" in status:
-                rows_to_remove.append(row)
-
-        # 뒤에서부터 제거
-        for row in reversed(rows_to_remove):
-            # 파일 경로 정보 삭제
-            if row in self.file_paths:
-                del self.file_paths[row]
-            self.table.removeRow(row)
-
-        if rows_to_remove:
-            QMessageBox.information(self, "정리 완료", f"{len(rows_to_remove)}개 항목을 정리했습니다.")
+        ids_to_remove = [job.job_id for job in self.model.jobs()
+                         if job.status in (JobStatus.DONE, JobStatus.FAILED)]
+        self._remove_jobs(ids_to_remove)
+
+        if ids_to_remove:
+            QMessageBox.information(self, "정리 완료", f"{len(ids_to_remove)}개 항목을 정리했습니다.")
         else:
             QMessageBox.information(self, "정리 완료", "정리할 항목이 없습니다.")
 
-    def _on_double_click(self, row: int, column: int):
+    def _remove_jobs(self, job_ids):
+        """작업 제거 (대기열에서 먼저 뺀 뒤 실행 중인 워커 중지)"""
+        # 워커 중지로 반납된 슬롯이 곧 제거될 대기 작업을 시작하지 않도록 대기열부터 정리
+        for job_id in job_ids:
+            if job_id not in self.workers:
+                self.scheduler.remove(job_id)
+        for job_id in job_ids:
+            if job_id in self.workers:
+                self._stop_worker(job_id)
+        self.model.remove_jobs(job_ids)
+        if self.journal:
+            self.journal.remove(job_ids)
+
+    def _on_double_click(self, index):
         """더블클릭 시 파일 재생"""
         # 완료된 파일만 재생
-        status = self.table.item(row, 5).text()
-        if "완료" not in status:
+        job = self.model.job_at(index.row())
+        if job.status != JobStatus.DONE:
             QMessageBox.information(self, "재생 불가", "다운로드가 완료된 파일만 재생할 수 있습니다.")
             return
 
         # 파일 재생
-        self._play_file(row)
+        self._play_file(job.job_id)
 
     def closeEvent(self, event):
-        """앱 종료 시 모든 워커 중지"""
+        """앱 종료 시 모든 워커 중지 (작업 상태는 저널에 남겨 다음 실행 시 이어받기)"""
+        # 취소로 인한 실패가 저널에 기록되지 않도록 먼저 닫음
+        if self.journal:
+            self.journal.close()
+            self.journal = None
+        self.scheduler.clear()
+        self.title_resolver.shutdown()
+        for worker in self.playlist_workers:
+            worker.cancel()
+            worker.wait(2000)
+        process_workers = list(self._detached_workers)
         for worker in self.workers.values():
             worker.cancel()
 
             # 타임아웃 설정하여 데드락 방지 (최대 2초 대기)
             if not worker.wait(2000):
-                # 2초 후에도 종료되지 않으면 강제 종료
-                worker.terminate()
-                worker.wait(1000)  # 종료 확인 (1초)
+                if isinstance(worker, ProcessDownloadWorker):
+                    # 자식 프로세스는 아래에서 풀을 종료할 때 함께 종료
+                    process_workers.append(worker)
+                else:
+                    # 2초 후에도 종료되지 않으면 강제 종료
+                    worker.terminate()
+                    worker.wait(1000)  # 종료 확인 (1초)
+
+        # 프로세스 모드를 사용했다면 자식 프로세스 종료 (이벤트를 읽던 워커는 풀이 닫히면 스스로 끝남)
+        from process_pool import shutdown_process_pool
+        shutdown_process_pool()
+        for worker in process_workers:
+            worker.wait(1000)
+
+        # 재사용하던 YoutubeDL 인스턴스의 쿠키 저장 및 연결 종료
+        get_ydl_pool().close()
 
         event.accept()
 
@@ -844,50 +1351,43 @@ def check_single_instance():
         lock_fd = open(lock_file, 'w')
         # 배타적 락 시도 (non-blocking)
         fcntl.flock(lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
-        log_timing("Single instance check passed")
         return True, lock_fd
     except IOError:
-        log_timing("App is already running!")
         return False, None
 
 
 def main():
-    log_timing("===== APP START =====")
-    log_timing("Python runtime loaded")
+    tracer = get_tracer()
+    # 시작부터 메인 창 표시까지 (메인 창을 띄우는 콜백에서 종료)
+    startup_span = tracer.start("startup")
 
     # 로그 설정
-    setup_logging()
-    log_timing("Logging system initialized")
+    with tracer.span("logging setup"):
+        setup_logging()
 
     # 중복 실행 체크
-    is_single, lock_fd = check_single_instance()
+    with tracer.span("single instance check") as span:
+        is_single, lock_fd = check_single_instance()
+        span.args['running'] = not is_single
     if not is_single:
-        log_timing("Exiting - another instance is running")
         # 이미 실행 중인 경우 메시지 박스 표시하고 종료
         app = QApplication(sys.argv)
         from PyQt6.QtWidgets import QMessageBox
         QMessageBox.warning(None, "이미 실행 중", "YouTube Downloader가 이미 실행 중입니다.")
         sys.exit(0)
 
-    log_timing("Creating QApplication")
-    app = QApplication(sys.argv)
-    log_timing("QApplication created")
+    with tracer.span("QApplication"):
+        app = QApplication(sys.argv)
 
     # 스플래시 스크린 표시
-    log_timing("Creating splash screen")
-    splash = create_splash_screen()
-    log_timing("Splash screen created")
-
-    log_timing("Showing splash screen")
-    splash.show()
-    log_timing("Splash screen shown")
-
-    app.processEvents()  # 스플래시 화면 즉시 표시
-    log_timing("Splash screen processed")
+    with tracer.span("splash screen"):
+        splash = create_splash_screen()
+        splash.show()
+        app.processEvents()  # 스플래시 화면 즉시 표시
 
     # 상태 메시지 표시 함수
     def show_message(message):
-        log_timing(f"Status: {message}")
+        tracer.instant("status", message=message)
         splash.showMessage(
             message,
             Qt.AlignmentFlag.AlignBottom | Qt.AlignmentFlag.AlignHCenter,
@@ -896,7 +1396,6 @@ def main():
         app.processEvents()
 
     # 초기화 시작 메시지
-    log_timing("Starting initialization")
     show_message("초기화 중...")
 
     # 메인 윈도우 생성 (아직 표시하지 않음)
@@ -905,7 +1404,7 @@ def main():
     def on_init_finished(success):
         """초기화 완료 시 호출"""
         nonlocal window
-        log_timing(f"Initialization finished (success={success})")
+        init_span.stop(success=success)
 
         if not success:
             show_message("경고: 일부 의존성 설치에 실패했습니다.")
@@ -913,28 +1412,27 @@ def main():
             time.sleep(1)
 
         # 메인 윈도우 생성 및 표시
-        log_timing("Creating main window")
         show_message("메인 화면 로딩 중...")
-        window = YoutubeDownloaderApp()
-        log_timing("Main window created")
+        with tracer.span("main window"):
+            window = YoutubeDownloaderApp()
 
-        # 스플래시 종료 및 메인 윈도우 표시
-        log_timing("Finishing splash and showing main window")
-        splash.finish(window)
-        window.show()
-        log_timing("Main window shown - Ready!")
+            # 스플래시 종료 및 메인 윈도우 표시
+            splash.finish(window)
+            window.show()
+        startup_span.stop()
+        finish_startup_trace()
 
-    # 백그라운드 초기화 워커 시작
-    log_timing("Starting background initialization worker")
+    # 백그라운드 초기화 워커 시작 (워커 스레드의 구간은 이 구간과 겹쳐서 표시됨)
+    init_span = tracer.start("background init")
     init_worker = InitWorker()
     init_worker.progress.connect(show_message)
     init_worker.finished.connect(on_init_finished)
     init_worker.start()
-    log_timing("Background worker started")
 
-    log_timing("Entering event loop")
     sys.exit(app.exec())
 
 
 if __name__ == "__main__":
+    # PyInstaller 빌드에서 프로세스 풀 자식 프로세스 지원
+    multiprocessing.freeze_support()
     main()
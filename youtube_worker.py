@@ -1,63 +1,19 @@
 """
 유튜브 다운로드를 위한 QThread 워커
+
+실제 다운로드 로직은 download_engine.DownloadEngine에 있으며,
+이 모듈은 엔진 콜백을 Qt 시그널로 전달하는 얇은 어댑터입니다.
 """
 
-import os
-import sys
-import shutil
-from pathlib import Path
+import time
+from typing import Callable, Hashable, Optional
 from PyQt6.QtCore import QThread, pyqtSignal
-import yt_dlp
-
-
-def _remove_quarantine_macos(file_path):
-    """macOS에서 파일의 quarantine 속성 제거"""
-    import subprocess
-    import platform
-
-    if platform.system() == 'Darwin' and os.path.exists(file_path):
-        try:
-            subprocess.run(['xattr', '-d', 'com.apple.quarantine', file_path],
-                         stderr=subprocess.DEVNULL, timeout=2)
-            subprocess.run(['xattr', '-d', 'com.apple.provenance', file_path],
-                         stderr=subprocess.DEVNULL, timeout=2)
-        except Exception:
-            pass
-
+from download_engine import DownloadEngine
+from playlist_expander import iter_playlist_entries
 
-def _find_ffmpeg_path():
-    """FFmpeg 경로 찾기 (시스템 또는 로컬 bin 디렉토리)"""
-    # 1. 로컬 bin 디렉토리 확인 (PyInstaller 앱 번들 내부)
-    if getattr(sys, 'frozen', False):
-        # PyInstaller로 빌드된 경우
-        base_dir = os.path.dirname(sys.executable)
-        local_ffmpeg = os.path.join(base_dir, 'bin', 'ffmpeg')
-        if os.path.exists(local_ffmpeg) and os.access(local_ffmpeg, os.X_OK):
-            # macOS에서 quarantine 속성 제거 시도
-            _remove_quarantine_macos(local_ffmpeg)
-
-            # AtomicParsley도 같은 디렉토리에 있을 수 있으므로 처리
-            atomicparsley_path = os.path.join(base_dir, 'bin', 'AtomicParsley')
-            if os.path.exists(atomicparsley_path):
-                _remove_quarantine_macos(atomicparsley_path)
-
-            return local_ffmpeg
-
-    # 2. 시스템 PATH에서 확인
-    ffmpeg_path = shutil.which('ffmpeg')
-    if ffmpeg_path:
-        return ffmpeg_path
-
-    # 3. macOS Homebrew 기본 경로 확인
-    homebrew_paths = [
-        '/opt/homebrew/bin/ffmpeg',  # Apple Silicon
-        '/usr/local/bin/ffmpeg'       # Intel Mac
-    ]
-    for path in homebrew_paths:
-        if os.path.exists(path):
-            return path
-
-    return None
+# 플레이리스트 항목을 GUI로 보내는 묶음 크기와 최대 지연 (첫 항목은 바로 다운로드를 시작하도록 짧게)
+PLAYLIST_BATCH_SIZE = 50
+PLAYLIST_BATCH_INTERVAL = 0.5
 
 
 class YoutubeDownloadWorker(QThread):
@@ -65,224 +21,165 @@ class YoutubeDownloadWorker(QThread):
 
     # 시그널 정의
     progress = pyqtSignal(str)  # 진행 상태 텍스트
+    progress_event = pyqtSignal(dict)  # 다운로드 진행 이벤트 (downloaded/total/speed/eta)
     title_resolved = pyqtSignal(str)  # 영상 제목 확인됨
     file_path_resolved = pyqtSignal(str)  # 실제 다운로드된 파일 경로
+    network_done = pyqtSignal()  # 전송 완료, 후처리 단계 진입 (다운로드 슬롯 반납 시점)
+    retrying = pyqtSignal(dict)  # 실패 후 재시도 대기 시작 ({'attempt', 'delay', 'kind', 'message'})
     finished = pyqtSignal(bool, str)  # (성공여부, 메시지)
 
-    def __init__(self, url: str, output_path: str, download_type: str = 'audio'):
+    def __init__(self, url: str, output_path: str, download_type: str = 'audio',
+                 info: Optional[dict] = None, connections: int = 1, temp_dir: Optional[str] = None,
+                 reservation_key: Optional[Hashable] = None):
         """
         Args:
             url: 유튜브 URL
             output_path: 저장 경로
             download_type: 'audio' (M4A), 'video_best' (최고화질 비디오), 'video_720p', 'video_480p'
+            info: 이미 추출된 영상 정보 (extract_info(process=False) 결과, 없으면 워커에서 추출)
+            connections: 포맷당 동시 연결 수 (2 이상이면 구간 다운로드)
+            temp_dir: 임시/중간 파일을 둘 폴더 (None이면 저장 폴더)
+            reservation_key: 디스크 공간 예약 키 (GUI가 시작 전에 예약한 작업 ID)
         """
         super().__init__()
-        self.url = url
-        self.output_path = output_path
-        self.download_type = download_type
-        self._is_cancelled = False
+        self.engine = DownloadEngine(
+            url, output_path, download_type, info=info, connections=connections, temp_dir=temp_dir,
+            reservation_key=reservation_key,
+            on_progress=self.progress.emit,
+            on_title=self.title_resolved.emit,
+            on_file_path=self.file_path_resolved.emit,
+            on_progress_event=self.progress_event.emit,
+            on_network_done=self.network_done.emit,
+            on_retry=self.retrying.emit,
+        )
 
     def cancel(self):
         """다운로드 취소"""
-        self._is_cancelled = True
+        self.engine.cancel()
 
     def run(self):
         """다운로드 실행"""
-        try:
-            # 저장 폴더 생성
-            Path(self.output_path).parent.mkdir(parents=True, exist_ok=True)
-
-            # 파일명에서 확장자 제거 (yt-dlp가 자동으로 추가)
-            base_path = os.path.splitext(self.output_path)[0]
+        success, message = self.engine.run()
+        self.finished.emit(success, message)
 
-            # FFmpeg 경로 찾기
-            ffmpeg_location = _find_ffmpeg_path()
-            if not ffmpeg_location:
-                self.finished.emit(False, "FFmpeg를 찾을 수 없습니다. FFmpeg를 설치해주세요.")
-                return
 
-            # 다운로드 타입에 따른 옵션 설정
-            if self.download_type == 'audio':
-                ydl_opts = {
-                    # 최고 음질 오디오 선택 (유튜브의 경우 일반적으로 Opus ~160kbps 또는 AAC ~256kbps)
-                    'format': 'bestaudio/best',
-                    'outtmpl': base_path + '.%(ext)s',
-                    'noplaylist': True,  # 플레이리스트 무시, 단일 비디오만
-                    'writethumbnail': True,  # 썸네일 다운로드
-                    'ffmpeg_location': ffmpeg_location,  # FFmpeg 경로 명시
-                    'postprocessors': [
-                        {
-                            'key': 'FFmpegExtractAudio',
-                            'preferredcodec': 'm4a',
-                            'preferredquality': '320',  # 320kbps로 변환 (원본이 더 낮으면 원본 유지)
-                        },
-                        {
-                            'key': 'EmbedThumbnail',  # 썸네일을 앨범 아트로 임베드
-                        },
-                    ],
-                    # 추가 오디오 품질 옵션
-                    'postprocessor_args': [
-                        '-ar', '48000',  # 샘플링 레이트 48kHz (고음질)
-                    ],
-                    'prefer_ffmpeg': True,
-                    'keepvideo': False,
-                    'quiet': True,
-                    'no_warnings': True,
-                    'progress_hooks': [self._progress_hook],
-                }
-            elif self.download_type == 'video_best':
-                ydl_opts = {
-                    # 최고 화질 비디오 + 최고 음질 오디오
-                    'format': 'bestvideo[ext=mp4]+bestaudio/best[ext=mp4]/best',
-                    'outtmpl': base_path + '.%(ext)s',
-                    'noplaylist': True,  # 플레이리스트 무시
-                    'writethumbnail': True,  # 썸네일 다운로드
-                    'ffmpeg_location': ffmpeg_location,  # FFmpeg 경로 명시
-                    'merge_output_format': 'mp4',
-                    'postprocessors': [
-                        {
-                            'key': 'EmbedThumbnail',  # 썸네일을 비디오에 임베드
-                        },
-                    ],
-                    'postprocessor_args': [
-                        '-c:a', 'aac',  # AAC 오디오 코덱
-                        '-b:a', '320k',  # 오디오 비트레이트 320kbps
-                        '-ar', '48000',  # 샘플링 레이트 48kHz
-                    ],
-                    'quiet': True,
-                    'no_warnings': True,
-                    'progress_hooks': [self._progress_hook],
-                }
-            elif self.download_type == 'video_720p':
-                ydl_opts = {
-                    # 720p 비디오 + 최고 음질 오디오
-                    'format': 'bestvideo[height<=720][ext=mp4]+bestaudio/best[height<=720][ext=mp4]/best',
-                    'outtmpl': base_path + '.%(ext)s',
-                    'noplaylist': True,  # 플레이리스트 무시
-                    'writethumbnail': True,  # 썸네일 다운로드
-                    'ffmpeg_location': ffmpeg_location,  # FFmpeg 경로 명시
-                    'merge_output_format': 'mp4',
-                    'postprocessors': [
-                        {
-                            'key': 'EmbedThumbnail',  # 썸네일을 비디오에 임베드
-                        },
-                    ],
-                    'postprocessor_args': [
-                        '-c:a', 'aac',
-                        '-b:a', '256k',  # 720p는 256kbps
-                        '-ar', '48000',
-                    ],
-                    'quiet': True,
-                    'no_warnings': True,
-                    'progress_hooks': [self._progress_hook],
-                }
-            elif self.download_type == 'video_480p':
-                ydl_opts = {
-                    # 480p 비디오 + 고음질 오디오
-                    'format': 'bestvideo[height<=480][ext=mp4]+bestaudio/best[height<=480][ext=mp4]/best',
-                    'outtmpl': base_path + '.%(ext)s',
-                    'noplaylist': True,  # 플레이리스트 무시
-                    'writethumbnail': True,  # 썸네일 다운로드
-                    'ffmpeg_location': ffmpeg_location,  # FFmpeg 경로 명시
-                    'merge_output_format': 'mp4',
-                    'postprocessors': [
-                        {
-                            'key': 'EmbedThumbnail',  # 썸네일을 비디오에 임베드
-                        },
-                    ],
-                    'postprocessor_args': [
-                        '-c:a', 'aac',
-                        '-b:a', '192k',  # 480p는 192kbps
-                        '-ar', '48000',
-                    ],
-                    'quiet': True,
-                    'no_warnings': True,
-                    'progress_hooks': [self._progress_hook],
-                }
-            else:
-                ydl_opts = {
-                    'format': 'best[ext=mp4]/best',
-                    'outtmpl': base_path + '.%(ext)s',
-                    'ffmpeg_location': ffmpeg_location,  # FFmpeg 경로 명시
-                    'quiet': True,
-                    'no_warnings': True,
-                    'progress_hooks': [self._progress_hook],
-                }
+class ProcessDownloadWorker(QThread):
+    """
+    프로세스 풀에서 다운로드를 실행하는 워커 (YoutubeDownloadWorker와 같은 시그널)
 
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                # 취소 확인
-                if self._is_cancelled:
-                    self.finished.emit(False, "취소됨")
-                    return
+    QThread는 자식 프로세스의 이벤트 큐를 읽어 시그널로 전달하는 역할만 하므로
+    yt-dlp의 CPU 작업이 GUI 프로세스의 GIL을 점유하지 않습니다.
+    """
 
-                # 영상 정보 가져오기
-                self.progress.emit("정보 수집 중...")
-                info = ydl.extract_info(self.url, download=False)
-                video_title = info.get('title', 'Unknown')
-                duration = info.get('duration', 0)
+    progress = pyqtSignal(str)
+    progress_event = pyqtSignal(dict)
+    title_resolved = pyqtSignal(str)
+    file_path_resolved = pyqtSignal(str)
+    network_done = pyqtSignal()
+    retrying = pyqtSignal(dict)
+    finished = pyqtSignal(bool, str)
 
-                # 제목 시그널 발생
-                self.title_resolved.emit(video_title)
+    def __init__(self, url: str, output_path: str, download_type: str = 'audio',
+                 info: Optional[dict] = None, connections: int = 1, temp_dir: Optional[str] = None,
+                 reservation_key: Optional[Hashable] = None, reserve_disk: bool = True):
+        super().__init__()
+        self.url = url
+        self.output_path = output_path
+        self.download_type = download_type
+        self.info = info
+        self.connections = connections
+        self.temp_dir = temp_dir
+        self.reservation_key = reservation_key
+        self.reserve_disk = reserve_disk
+        self._job = None
+        self._is_cancelled = False
 
-                # 취소 확인
-                if self._is_cancelled:
-                    self.finished.emit(False, "취소됨")
-                    return
+    def cancel(self):
+        """다운로드 취소"""
+        self._is_cancelled = True
+        if self._job is not None:
+            self._job.cancel()
 
-                # 다운로드 시작
-                self.progress.emit(f"다운로드 시작... ({duration // 60}분 {duration % 60}초)")
+    def run(self):
+        """프로세스 풀에 작업을 제출하고 이벤트 전달"""
+        from process_pool import get_process_pool
 
-                # 다운로드 실행 및 결과 받기
-                result = ydl.extract_info(self.url, download=True)
+        self._job = get_process_pool().submit(self.url, self.output_path, self.download_type, self.info,
+                                              connections=self.connections, temp_dir=self.temp_dir,
+                                              reservation_key=self.reservation_key,
+                                              reserve_disk=self.reserve_disk)
+        if self._is_cancelled:
+            self._job.cancel()
+
+        signals = {
+            'progress': self.progress,
+            'progress_event': self.progress_event,
+            'title': self.title_resolved,
+            'file_path': self.file_path_resolved,
+            'retry': self.retrying,
+        }
+        while True:
+            event = self._job.get_event(timeout=0.5)
+            if event is None:
+                continue
+            kind, value = event
+            if kind == 'finished':
+                self.finished.emit(*value)
+                return
+            if kind == 'network_done':
+                self.network_done.emit()
+                continue
+            signals[kind].emit(value)
 
-                # 취소 확인
-                if self._is_cancelled:
-                    self.finished.emit(False, "취소됨")
-                    return
 
-                # 실제 다운로드된 파일 경로 찾기
-                downloaded_file = ydl.prepare_filename(result)
+class PlaylistExpandWorker(QThread):
+    """
+    플레이리스트/채널 목록을 백그라운드에서 펼쳐 항목을 묶음 단위로 전달하는 워커
 
-                # 오디오 전용인 경우 확장자가 변경됨
-                if self.download_type == 'audio':
-                    # m4a 확장자로 변경
-                    downloaded_file = os.path.splitext(downloaded_file)[0] + '.m4a'
+    목록 페이지를 받는 동안에도 이미 받은 항목이 entries_found로 전달되므로 GUI는 앞 항목의
+    다운로드를 먼저 시작할 수 있습니다.
+    """
 
-                # 실제 파일이 존재하는지 확인하고 경로 전송
-                if os.path.exists(downloaded_file):
-                    self.file_path_resolved.emit(downloaded_file)
-                else:
-                    # 파일을 찾을 수 없으면 디렉토리에서 검색
-                    base_dir = os.path.dirname(downloaded_file)
-                    base_name = os.path.splitext(os.path.basename(downloaded_file))[0]
-                    ext = '.m4a' if self.download_type == 'audio' else '.mp4'
+    entries_found = pyqtSignal(list)  # [{'url', 'id', 'title', 'duration'}, ...]
+    finished = pyqtSignal(int, str)  # (전달한 항목 수, 오류 메시지 - 성공이면 빈 문자열)
 
-                    # 디렉토리에서 유사한 파일 찾기
-                    if os.path.exists(base_dir):
-                        for file in os.listdir(base_dir):
-                            if file.endswith(ext) and base_name[:30] in file:
-                                downloaded_file = os.path.join(base_dir, file)
-                                self.file_path_resolved.emit(downloaded_file)
-                                break
+    def __init__(self, url: str, skip: Optional[Callable[[str], bool]] = None):
+        """
+        Args:
+            url: 플레이리스트/채널 URL
+            skip: 영상 URL을 받아 True를 반환하면 건너뜀 (워커 스레드에서 호출됨)
+        """
+        super().__init__()
+        self.url = url
+        self.skip = skip
+        self._is_cancelled = False
 
-                self.progress.emit("완료!")
-                self.finished.emit(True, f"다운로드 완료: {video_title}")
+    def cancel(self):
+        """목록 조회 중지 (다음 항목에서 멈춤)"""
+        self._is_cancelled = True
 
+    def run(self):
+        """목록을 펼치며 항목 전달"""
+        count = 0
+        batch = []
+        flushed = time.monotonic()
+        error = ''
+        entries = iter_playlist_entries(self.url, skip=self.skip)
+        try:
+            for entry in entries:
+                if self._is_cancelled:
+                    break
+                batch.append(entry)
+                if len(batch) >= PLAYLIST_BATCH_SIZE or time.monotonic() - flushed >= PLAYLIST_BATCH_INTERVAL:
+                    self.entries_found.emit(batch)
+                    count += len(batch)
+                    batch = []
+                    flushed = time.monotonic()
         except Exception as e:
-            self.progress.emit(f"오류: {str(e)}")
-            self.finished.emit(False, f"오류: {str(e)}")
-
-    def _progress_hook(self, d):
-        """yt-dlp 진행 상태 후크"""
-        if self._is_cancelled:
-            raise Exception("Download cancelled by user")
-
-        if d['status'] == 'downloading':
-            # 다운로드 중
-            percent = d.get('_percent_str', '0%')
-            speed = d.get('_speed_str', 'N/A')
-            eta = d.get('_eta_str', 'N/A')
-            self.progress.emit(f"다운로드 중: {percent} (속도: {speed}, ETA: {eta})")
-        elif d['status'] == 'finished':
-            # 다운로드 완료, 후처리 중
-            self.progress.emit("후처리 중...")
+            error = str(e)
+        finally:
+            entries.close()
+        if batch:
+            self.entries_found.emit(batch)
+            count += len(batch)
+        self.finished.emit(count, error)